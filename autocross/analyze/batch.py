@@ -0,0 +1,265 @@
+"""Batch schedule analysis
+
+This module compares many crossing schedules for the same fleet. The
+fleet's cost and wait functions are loaded once, and the schedules are
+evaluated together with one call per vehicle cost function.
+"""
+# Standard library imports
+import concurrent.futures
+import csv
+import json
+import os
+from typing import Final, NamedTuple, Optional, Sequence
+
+# Third party imports
+import numpy as np
+
+# Local application imports
+from autocross import fileio
+from autocross import tracing
+from autocross.analyze import metrics
+from autocross.analyze import streaming
+from autocross.schedule import conflicts
+
+
+TABLE_COLUMNS: Final[tuple] = ('schedule', 'schedule_cost', 'wait_cost',
+                               'crossing_cost', 'clearing_time')
+DEFAULT_CHUNK_SIZE: Final[int] = 64
+SCHEDULE_PREFIX: Final[str] = 'schedule.'
+
+# Fleet loaded once per worker process by `_init_worker`
+_worker_fleet = None
+
+
+class Fleet(NamedTuple):
+    """Cost and wait functions of a fleet, indexed by vehicle ID
+
+    """
+    cost_funcs: list
+    """Crossing cost functions"""
+    cost_bounds: list
+    """Crossing cost function bounds"""
+    wait_funcs: list
+    """Waiting cost functions"""
+    wait_bounds: list
+    """Waiting cost function bounds"""
+
+
+def load_fleet(cost_filepaths: Sequence, wait_filepaths: Sequence) -> Fleet:
+    """Load the cost and wait functions of a fleet
+
+    :param cost_filepaths: list of crossing cost file paths
+    :param wait_filepaths: list of waiting cost file paths
+    :return: fleet with the loaded functions
+    """
+    with tracing.span('load fleet', num_vehicles=len(cost_filepaths)):
+        cost_data = [fileio.parse_cost_data(fileio.read_cost_file(filepath))
+                     for filepath in cost_filepaths]
+        wait_data = [fileio.parse_cost_data(fileio.read_cost_file(filepath))
+                     for filepath in wait_filepaths]
+
+    return Fleet([func for func, _ in cost_data],
+                 [bounds for _, bounds in cost_data],
+                 [func for func, _ in wait_data],
+                 [bounds for _, bounds in wait_data])
+
+
+def find_schedule_files(paths: Sequence) -> list:
+    """Expand schedule paths
+
+    Directories are replaced by the schedule files they contain, in
+    sorted order. Only regular files named like the schedule command
+    output, 'schedule.<type>', are picked up so cost files and tables
+    written next to them are skipped. Other paths are kept as they
+    are.
+
+    :param paths: list of schedule file or directory paths
+    :return: list of schedule file paths
+    """
+    filepaths = []
+
+    for path in paths:
+        if os.path.isdir(path):
+            filepaths += [os.path.join(path, name)
+                          for name in sorted(os.listdir(path))
+                          if name.startswith(SCHEDULE_PREFIX)
+                          and os.path.isfile(os.path.join(path, name))]
+        else:
+            filepaths.append(path)
+
+    return filepaths
+
+
+def evaluate_schedules(schedules: Sequence, cost_funcs: Sequence,
+                       wait_funcs: Sequence,
+                       movements: Optional[Sequence] = None,
+                       conflict_graph: Optional[dict] = None,
+                       stats: Optional[streaming.DistributionMetrics] = None,
+                       optimal_costs: Optional[Sequence] = None) -> list:
+    """Evaluate crossing schedules of the same fleet
+
+    Start and crossing times of all schedules are stacked into arrays
+    with one row per schedule, so every vehicle's cost and wait
+    functions are called once for the whole batch.
+
+    :param schedules: list of `Schedule` objects
+    :param cost_funcs: list of crossing cost functions
+    :param wait_funcs: list of waiting cost functions
+    :param movements: (optional) list of (lane, direction) tuples. If
+    given, start times are recalculated allowing concurrent crossings.
+    :param conflict_graph: (optional) conflict graph for `movements`
+    :param stats: (optional) distribution metrics updated with every
+    vehicle's delay and cost
+    :param optimal_costs: (optional) unconstrained optimal crossing
+    costs indexed by vehicle ID. Required if `stats` is given.
+    :return: list of dicts with the schedule, wait and crossing costs
+    and the clearing time of each schedule
+    """
+    if not schedules:
+        return []
+
+    if movements:
+        schedules = [schedule.with_start_times(
+            conflicts.start_times_concurrent(schedule.crossing_order,
+                                             schedule.crossing_times,
+                                             movements, conflict_graph))
+            for schedule in schedules]
+
+    start_times = np.stack([schedule.start_times for schedule in schedules])
+    crossing_times = np.stack([schedule.crossing_times
+                               for schedule in schedules])
+
+    with tracing.span('evaluate', num_schedules=len(schedules)):
+        vehicle_wait_costs = metrics.evaluate_cost_matrix(wait_funcs,
+                                                          start_times)
+        vehicle_cross_costs = metrics.evaluate_cost_matrix(cost_funcs,
+                                                           crossing_times)
+
+    if stats is not None:
+        stats.update(start_times, vehicle_wait_costs + vehicle_cross_costs,
+                     optimal_costs)
+
+    wait_costs = vehicle_wait_costs.sum(axis=1)
+    cross_costs = vehicle_cross_costs.sum(axis=1)
+    clearing_times = np.max(start_times + crossing_times, axis=1)
+
+    return [{
+        'schedule_cost': float(wait_cost + cross_cost),
+        'wait_cost': float(wait_cost),
+        'crossing_cost': float(cross_cost),
+        'clearing_time': float(clearing_time)
+    } for wait_cost, cross_cost, clearing_time
+        in zip(wait_costs, cross_costs, clearing_times)]
+
+
+def evaluate_schedule_files(filepaths: Sequence, cost_filepaths: Sequence,
+                            wait_filepaths: Sequence,
+                            movements: Optional[Sequence] = None,
+                            conflict_file: Optional[str] = None,
+                            workers: int = 1,
+                            chunk_size: int = DEFAULT_CHUNK_SIZE,
+                            distribution: bool = False) -> tuple:
+    """Evaluate schedule files, optionally on a process pool
+
+    With more than one worker, schedule files are split into chunks
+    and every worker process loads the fleet once before evaluating
+    its chunks. Distribution metrics of the chunks are merged.
+
+    :param filepaths: list of schedule file paths
+    :param cost_filepaths: list of crossing cost file paths
+    :param wait_filepaths: list of waiting cost file paths
+    :param movements: (optional) list of (lane, direction) tuples
+    :param conflict_file: (optional) path to a conflict file
+    :param workers: number of worker processes
+    :param chunk_size: number of schedules per chunk
+    :param distribution: collect per-vehicle distribution metrics
+    :return: tuple formatted as (table rows in input order,
+    distribution metrics or None)
+    """
+    fleet_args = (cost_filepaths, wait_filepaths, movements, conflict_file,
+                  distribution)
+    chunks = [filepaths[index:index + chunk_size]
+              for index in range(0, len(filepaths), chunk_size)]
+
+    if workers > 1 and len(chunks) > 1:
+        with concurrent.futures.ProcessPoolExecutor(
+                max_workers=workers, initializer=_init_worker,
+                initargs=fleet_args) as executor:
+            results = list(executor.map(_evaluate_chunk, chunks))
+    else:
+        _init_worker(*fleet_args)
+        results = [_evaluate_chunk(chunk) for chunk in chunks]
+
+    rows = [row for chunk_rows, _ in results for row in chunk_rows]
+    stats = None
+
+    if distribution:
+        stats = streaming.DistributionMetrics()
+        for _, chunk_stats in results:
+            stats.merge(chunk_stats)
+
+    return rows, stats
+
+
+def write_table(filepath: str, rows: Sequence) -> None:
+    """Write a schedule comparison table
+
+    The format is chosen by file extension: '.json' writes a list of
+    objects, anything else writes CSV.
+
+    :param filepath: path of the table file
+    :param rows: list of table rows
+    :return: None
+    """
+    if fileio.get_file_extension(filepath) == '.json':
+        with open(filepath, 'w') as file:
+            json.dump(list(rows), file, indent=2)
+    else:
+        with open(filepath, 'w', newline='') as file:
+            writer = csv.DictWriter(file, fieldnames=TABLE_COLUMNS)
+            writer.writeheader()
+            writer.writerows(rows)
+
+
+def _init_worker(cost_filepaths: Sequence, wait_filepaths: Sequence,
+                 movements: Optional[Sequence],
+                 conflict_file: Optional[str], distribution: bool) -> None:
+    """Load the fleet for the current process
+
+    :param cost_filepaths: list of crossing cost file paths
+    :param wait_filepaths: list of waiting cost file paths
+    :param movements: (optional) list of (lane, direction) tuples
+    :param conflict_file: (optional) path to a conflict file
+    :param distribution: collect per-vehicle distribution metrics
+    :return: None
+    """
+    global _worker_fleet  # pylint: disable=W0603
+
+    fleet = load_fleet(cost_filepaths, wait_filepaths)
+    conflict_graph = conflicts.load_conflict_graph(conflict_file) \
+        if movements else None
+    optimal_costs = metrics.optimal_costs(fleet.cost_funcs,
+                                          fleet.cost_bounds) \
+        if distribution else None
+
+    _worker_fleet = (fleet, movements, conflict_graph, optimal_costs)
+
+
+def _evaluate_chunk(filepaths: Sequence) -> tuple:
+    """Evaluate a chunk of schedule files with the loaded fleet
+
+    :param filepaths: list of schedule file paths
+    :return: tuple formatted as (table rows, distribution metrics or
+    None)
+    """
+    fleet, movements, conflict_graph, optimal_costs = _worker_fleet
+
+    schedules = [fileio.read_schedule(filepath) for filepath in filepaths]
+    stats = streaming.DistributionMetrics() \
+        if optimal_costs is not None else None
+    rows = evaluate_schedules(schedules, fleet.cost_funcs, fleet.wait_funcs,
+                              movements, conflict_graph, stats,
+                              optimal_costs)
+
+    return [{'schedule': filepath, **row}
+            for filepath, row in zip(filepaths, rows)], stats
@@ -1,37 +1,112 @@
+# Standard library imports
+import os
+
 # Local application imports
 from autocross import fileio
+from autocross.analyze import batch
 from autocross.analyze import metrics
-from autocross.analyze import utils
+from autocross.analyze import streaming
+from autocross.schedule import conflicts
 
 
 def analyze_main(args):
-    schedule_data = fileio.read_schedule_file(args.schedule_file)
-    crossing_order, crossing_times = fileio.parse_schedule_data(schedule_data)
-
-    cross_cost_funcs = []
-    wait_cost_funcs = []
-
-    for cost_filepath in args.cost_filepaths:
-        cost_data = fileio.read_cost_file(cost_filepath)
-        cross_cost_func, _ = fileio.parse_cost_data(cost_data)
+    movements = [conflicts.parse_movement(movement)
+                 for movement in args.movements or []]
 
-        cross_cost_funcs.append(cross_cost_func)
+    if len(args.schedule_files) > 1 or os.path.isdir(args.schedule_files[0]):
+        return _batch_main(args, movements)
 
-    for wait_filepath in args.wait_filepaths:
-        wait_data = fileio.read_cost_file(wait_filepath)
-        wait_cost_func, _ = fileio.parse_cost_data(wait_data)
+    schedule = fileio.read_schedule(args.schedule_files[0])
+    fleet = batch.load_fleet(args.cost_filepaths, args.wait_filepaths)
 
-        wait_cost_funcs.append(wait_cost_func)
+    if movements:
+        conflict_graph = conflicts.load_conflict_graph(args.conflict_file)
+        start_times = conflicts.start_times_concurrent(
+            schedule.crossing_order, schedule.crossing_times, movements,
+            conflict_graph)
+        schedule = schedule.with_start_times(start_times)
 
-    start_times = utils.start_times_from_schedule(crossing_order,
-                                                  crossing_times)
-
-    wait_cost = metrics.sum_waiting_costs(wait_cost_funcs, start_times)
-    cross_cost = metrics.sum_crossing_costs(cross_cost_funcs, crossing_times)
-    clearing_time = metrics.calc_intersection_clearing_time(crossing_times)
+    wait_cost = metrics.sum_waiting_costs(fleet.wait_funcs,
+                                          schedule.start_times)
+    cross_cost = metrics.sum_crossing_costs(fleet.cost_funcs,
+                                            schedule.crossing_times)
+    clearing_time = schedule.clearing_time
     schedule_cost = wait_cost + cross_cost
 
+    if args.output:
+        batch.write_table(args.output, [{
+            'schedule': args.schedule_files[0],
+            'schedule_cost': float(schedule_cost),
+            'wait_cost': float(wait_cost),
+            'crossing_cost': float(cross_cost),
+            'clearing_time': float(clearing_time)
+        }])
+
     print(f'Schedule cost: {schedule_cost}')
     print(f'Clearing time: {clearing_time}')
 
+    if _wants_distribution(args):
+        stats = streaming.DistributionMetrics()
+        batch.evaluate_schedules([schedule], fleet.cost_funcs,
+                                 fleet.wait_funcs, stats=stats,
+                                 optimal_costs=metrics.optimal_costs(
+                                     fleet.cost_funcs, fleet.cost_bounds))
+        _distribution_main(args, stats)
+
+    return 0
+
+
+def _batch_main(args, movements: list) -> int:
+    """Compare many schedules of the same fleet
+
+    :param args: analyze command arguments
+    :param movements: list of (lane, direction) tuples, may be empty
+    :return: exit code
+    """
+    filepaths = batch.find_schedule_files(args.schedule_files)
+    rows, stats = batch.evaluate_schedule_files(
+        filepaths, args.cost_filepaths, args.wait_filepaths, movements,
+        args.conflict_file, args.workers,
+        distribution=_wants_distribution(args))
+
+    if args.output:
+        batch.write_table(args.output, rows)
+
+    for row in rows:
+        print(f"{row['schedule']}: "
+              f"schedule cost {row['schedule_cost']}, "
+              f"clearing time {row['clearing_time']}")
+
+    if stats is not None:
+        _distribution_main(args, stats)
+
     return 0
+
+
+def _wants_distribution(args) -> bool:
+    """Check whether distribution metrics were requested
+
+    :param args: analyze command arguments
+    :return: True if distribution metrics should be collected
+    """
+    return args.distribution or bool(args.stats_file) \
+        or bool(args.merge_stats)
+
+
+def _distribution_main(args, stats: streaming.DistributionMetrics) -> None:
+    """Merge, save and print distribution metrics
+
+    :param args: analyze command arguments
+    :param stats: distribution metrics of this run
+    :return: None
+    """
+    for filepath in args.merge_stats or []:
+        stats.merge(fileio.read_stats_file(filepath))
+
+    if args.stats_file:
+        fileio.write_stats_file(args.stats_file, stats)
+
+    for name, summary in stats.summary().items():
+        values = ', '.join(f'{key} {value:.6g}'
+                           for key, value in summary.items())
+        print(f'{name}: {values}')
@@ -1,3 +1,7 @@
+# Third party imports
+import numpy as np
+
+
 def sum_waiting_costs(cost_funcs: list, start_times: list) -> float:
     """Sum all of the waiting costs
 
@@ -47,15 +51,79 @@ def _sum_costs(cost_funcs: list, func_inputs: list) -> float:
     return sum([func(input_) for func, input_ in zip(cost_funcs, func_inputs)])
 
 
+def evaluate_cost_matrix(cost_funcs: list,
+                         func_inputs: np.ndarray) -> np.ndarray:
+    """Evaluate each vehicle's cost function on a column of inputs
+
+    Rows of the input array are independent cases (for example
+    schedules or samples) and columns are vehicles. Every function is
+    called once with its whole column, which is much faster than
+    calling it once per case.
+
+    :param cost_funcs: list of cost functions indexed by vehicle ID
+    :param func_inputs: array of shape (num_cases, num_vehicles)
+    :return: array of costs with the same shape as `func_inputs`
+    """
+    assert len(cost_funcs) == func_inputs.shape[1]
+
+    costs = np.empty(func_inputs.shape)
+
+    for vid, func in enumerate(cost_funcs):
+        costs[:, vid] = np.ravel(np.asarray(func(func_inputs[:, vid])))
+
+    return costs
+
+
+def optimal_costs(cost_funcs: list, cost_bounds: list,
+                  num_points: int = 1000) -> np.ndarray:
+    """Find each vehicle's unconstrained optimal crossing cost
+
+    The optimum is the lowest cost on a grid of `num_points` times
+    spanning the vehicle's cost bounds.
+
+    :param cost_funcs: list of crossing cost functions
+    :param cost_bounds: list of crossing cost function bounds
+    :param num_points: number of grid points per vehicle
+    :return: array of optimal crossing costs indexed by vehicle ID
+    """
+    assert len(cost_funcs) == len(cost_bounds)
+
+    return np.array([
+        np.min(np.asarray(func(np.linspace(bounds[0], bounds[1],
+                                           num_points))))
+        for func, bounds in zip(cost_funcs, cost_bounds)])
+
+
 def calc_intersection_clearing_time(crossing_times: list) -> float:
     """Calculate total time needed to clear intersection
 
-    Clearing intersection means all vehicles currently stopped and
-    ready to go through the intersection have gone through. In other
-    words, all vehicles that are first in line for their lane.
+    Clearing intersection means all vehicles in the schedule have gone
+    through, including vehicles queued behind the first vehicle in
+    their lane. Vehicles are assumed to cross one at a time.
 
     :param crossing_times: list of crossing times (how long each
     vehicle has to cross the intersection)
-    :return: total time needed for all lead vehicles to cross
+    :return: total time needed for all scheduled vehicles to cross
     """
-    return sum(crossing_times)
\ No newline at end of file
+    return sum(crossing_times)
+
+
+def calc_clearing_time_from_starts(start_times: list,
+                                   crossing_times: list) -> float:
+    """Calculate total time needed to clear intersection from start times
+
+    Unlike `calc_intersection_clearing_time`, vehicles are not assumed
+    to cross one at a time. The intersection is cleared once the last
+    vehicle to finish has crossed.
+
+    :param start_times: list of start times where the first vehicle to
+    cross has a start time of 0
+    :param crossing_times: list of crossing times (how long each
+    vehicle has to cross the intersection)
+    :return: time at which the last vehicle finishes crossing
+    """
+    assert len(start_times) == len(crossing_times)
+
+    return max([start + time
+                for start, time in zip(start_times, crossing_times)],
+               default=0)
@@ -0,0 +1,326 @@
+"""Streaming distribution metrics
+
+This module contains constant-memory estimators for per-vehicle delay
+and cost distributions. Values are added in batches as they are
+produced, and estimators built on separate shards of a run can be
+merged into one.
+"""
+# Standard library imports
+import math
+from typing import Final, Sequence
+
+# Third party imports
+import numpy as np
+
+
+DEFAULT_RELATIVE_ACCURACY: Final[float] = 0.01
+DEFAULT_MAX_BUCKETS: Final[int] = 2048
+DEFAULT_PERCENTILES: Final[tuple] = (50, 90, 95, 99)
+MIN_INDEXED_VALUE: Final[float] = 1e-9
+
+
+class RunningStats:
+    """Running count, mean, variance, extremes and fairness
+
+    Batches are combined with the parallel variance update, so adding
+    a batch and merging two estimators are the same operation.
+    """
+    def __init__(self) -> None:
+        """Init function
+
+        :return: None
+        """
+        self.count = 0
+        self.mean = 0.0
+        self.sum_sq_dev = 0.0
+        self.sum_sq = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, values: Sequence) -> None:
+        """Add a batch of values
+
+        :param values: values to add
+        :return: None
+        """
+        values = np.ravel(np.asarray(values, dtype=float))
+
+        if values.size == 0:
+            return
+
+        batch = RunningStats()
+        batch.count = values.size
+        batch.mean = float(np.mean(values))
+        batch.sum_sq_dev = float(np.sum((values - batch.mean) ** 2))
+        batch.sum_sq = float(np.sum(values ** 2))
+        batch.min = float(np.min(values))
+        batch.max = float(np.max(values))
+
+        self.merge(batch)
+
+    def merge(self, other: 'RunningStats') -> None:
+        """Merge another estimator into this one
+
+        :param other: estimator to merge
+        :return: None
+        """
+        if other.count == 0:
+            return
+
+        count = self.count + other.count
+        delta = other.mean - self.mean
+
+        self.sum_sq_dev += other.sum_sq_dev \
+            + delta ** 2 * self.count * other.count / count
+        self.mean += delta * other.count / count
+        self.count = count
+        self.sum_sq += other.sum_sq
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    @property
+    def std(self) -> float:
+        """Get population standard deviation
+
+        :return: standard deviation of the added values
+        """
+        return math.sqrt(self.sum_sq_dev / self.count) if self.count else 0.0
+
+    @property
+    def jain_index(self) -> float:
+        """Get Jain's fairness index
+
+        The index is (sum x)^2 / (n sum x^2). It is 1 when all values
+        are equal and approaches 1/n when one value dominates.
+
+        :return: fairness index in (0, 1], or 1 if all values are zero
+        """
+        if self.sum_sq == 0:
+            return 1.0
+
+        return (self.mean * self.count) ** 2 / (self.count * self.sum_sq)
+
+
+class QuantileSketch:
+    """Mergeable quantile sketch with relative accuracy
+
+    Values are counted in logarithmically sized buckets, so every
+    quantile estimate is within the relative accuracy of the true
+    value. Memory depends on the range of the values, not their
+    number, and is capped by collapsing the lowest buckets. Values
+    smaller in magnitude than `MIN_INDEXED_VALUE` are counted as zero.
+    """
+    def __init__(self, relative_accuracy: float = DEFAULT_RELATIVE_ACCURACY,
+                 max_buckets: int = DEFAULT_MAX_BUCKETS) -> None:
+        """Init function
+
+        :param relative_accuracy: relative accuracy of quantile estimates
+        :param max_buckets: maximum number of buckets per sign
+        :return: None
+        """
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+        self._max_buckets = max_buckets
+        self._positive = {}
+        self._negative = {}
+        self._zero_count = 0
+
+    @property
+    def count(self) -> int:
+        """Get number of added values
+
+        :return: number of added values
+        """
+        return self._zero_count + sum(self._positive.values()) \
+            + sum(self._negative.values())
+
+    def add(self, values: Sequence) -> None:
+        """Add a batch of values
+
+        :param values: values to add
+        :return: None
+        """
+        values = np.ravel(np.asarray(values, dtype=float))
+        magnitudes = np.abs(values)
+
+        self._zero_count += int(np.sum(magnitudes < MIN_INDEXED_VALUE))
+        self._add_magnitudes(self._positive,
+                             values[values >= MIN_INDEXED_VALUE])
+        self._add_magnitudes(self._negative,
+                             -values[values <= -MIN_INDEXED_VALUE])
+
+    def merge(self, other: 'QuantileSketch') -> None:
+        """Merge another sketch into this one
+
+        Both sketches must have the same relative accuracy.
+
+        :param other: sketch to merge
+        :return: None
+        """
+        assert math.isclose(self._gamma, other._gamma), \
+            'Cannot merge sketches with different accuracy'
+
+        for buckets, other_buckets in ((self._positive, other._positive),
+                                       (self._negative, other._negative)):
+            for index, count in other_buckets.items():
+                buckets[index] = buckets.get(index, 0) + count
+            self._collapse(buckets)
+
+        self._zero_count += other._zero_count
+
+    def quantile(self, quantile: float) -> float:
+        """Estimate a quantile
+
+        :param quantile: quantile in [0, 1]
+        :return: estimated value, or NaN if the sketch is empty
+        """
+        count = self.count
+
+        if count == 0:
+            return math.nan
+
+        rank = quantile * (count - 1)
+        seen = 0
+
+        for index in sorted(self._negative, reverse=True):
+            seen += self._negative[index]
+            if seen > rank:
+                return -self._bucket_value(index)
+
+        seen += self._zero_count
+        if seen > rank:
+            return 0.0
+
+        for index in sorted(self._positive):
+            seen += self._positive[index]
+            if seen > rank:
+                return self._bucket_value(index)
+
+        return self._bucket_value(max(self._positive))
+
+    def _add_magnitudes(self, buckets: dict, magnitudes: np.ndarray) -> None:
+        """Count positive magnitudes into buckets
+
+        :param buckets: dict mapping bucket index to count
+        :param magnitudes: positive values to count
+        :return: None
+        """
+        if magnitudes.size == 0:
+            return
+
+        indices = np.ceil(np.log(magnitudes) / self._log_gamma)
+        for index, count in zip(*np.unique(indices.astype(np.int64),
+                                           return_counts=True)):
+            buckets[int(index)] = buckets.get(int(index), 0) + int(count)
+
+        self._collapse(buckets)
+
+    def _collapse(self, buckets: dict) -> None:
+        """Merge the lowest buckets until the bucket limit is met
+
+        :param buckets: dict mapping bucket index to count
+        :return: None
+        """
+        if len(buckets) <= self._max_buckets:
+            return
+
+        indices = sorted(buckets)
+        excess = indices[:len(indices) - self._max_buckets + 1]
+        target = excess[-1]
+
+        buckets[target] = sum(buckets.pop(index) for index in excess)
+
+    def _bucket_value(self, index: int) -> float:
+        """Return the representative value of a bucket
+
+        :param index: bucket index
+        :return: value with the smallest relative error in the bucket
+        """
+        return 2 * self._gamma ** index / (self._gamma + 1)
+
+
+class DistributionMetrics:
+    """Per-vehicle delay and cost distribution metrics
+
+    Tracks the start time (delay) of every vehicle, its schedule cost
+    (waiting plus crossing cost) and the ratio of that cost to the
+    vehicle's unconstrained optimal crossing cost.
+    """
+    METRICS: Final[tuple] = ('delay', 'cost', 'cost_ratio')
+
+    def __init__(self,
+                 relative_accuracy: float = DEFAULT_RELATIVE_ACCURACY) -> None:
+        """Init function
+
+        :param relative_accuracy: relative accuracy of percentiles
+        :return: None
+        """
+        self._stats = {name: RunningStats() for name in self.METRICS}
+        self._sketches = {name: QuantileSketch(relative_accuracy)
+                          for name in self.METRICS}
+
+    def update(self, delays: Sequence, costs: Sequence,
+               optimal_costs: Sequence) -> None:
+        """Add a batch of vehicles
+
+        Inputs may be arrays of any shape as long as they match, for
+        example one row per schedule and one column per vehicle.
+
+        :param delays: vehicle start times
+        :param costs: vehicle schedule costs
+        :param optimal_costs: vehicle unconstrained optimal crossing
+        costs, broadcast against `costs`
+        :return: None
+        """
+        costs = np.asarray(costs, dtype=float)
+        optimal_costs = np.broadcast_to(np.asarray(optimal_costs,
+                                                   dtype=float), costs.shape)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            ratios = np.where(optimal_costs != 0, costs / optimal_costs,
+                              np.nan)
+
+        batches = {
+            'delay': delays,
+            'cost': costs,
+            'cost_ratio': ratios[np.isfinite(ratios)]
+        }
+
+        for name, values in batches.items():
+            self._stats[name].add(values)
+            self._sketches[name].add(values)
+
+    def merge(self, other: 'DistributionMetrics') -> None:
+        """Merge metrics from another shard
+
+        :param other: metrics to merge
+        :return: None
+        """
+        for name in self.METRICS:
+            self._stats[name].merge(other._stats[name])
+            self._sketches[name].merge(other._sketches[name])
+
+    def summary(self, percentiles: Sequence = DEFAULT_PERCENTILES) -> dict:
+        """Summarize the distributions
+
+        :param percentiles: percentiles to report
+        :return: dict mapping each metric name to a dict of statistics
+        """
+        summary = {}
+
+        for name in self.METRICS:
+            stats = self._stats[name]
+            summary[name] = {
+                'count': stats.count,
+                'mean': stats.mean,
+                'std': stats.std,
+                'min': stats.min,
+                'max': stats.max,
+                'jain_index': stats.jain_index
+            }
+
+            for percentile in percentiles:
+                summary[name][f'p{percentile}'] = \
+                    self._sketches[name].quantile(percentile / 100)
+
+        return summary
@@ -1,3 +1,7 @@
+# Local application imports
+from autocross import crossing_schedule
+
+
 def start_times_from_schedule(crossing_order: list,
                               crossing_times: list) -> list:
     """Generate a list of starting times from crossing schedule
@@ -14,19 +18,6 @@ def start_times_from_schedule(crossing_order: list,
     """
     assert len(crossing_order) == len(crossing_times)
 
-    triple_list = [(slot, vid, time)
-                   for vid, (slot, time)
-                   in enumerate(zip(crossing_order, crossing_times))]
-
-    triple_list.sort()
-
-    start = 0
-    start_times = [-1] * len(crossing_order)
-
-    for _, vid, time in triple_list:
-        start_times[vid] = start
-        start += time
-
-    assert -1 not in start_times, "At least one vehicle without start time"
+    schedule = crossing_schedule.Schedule(crossing_order, crossing_times)
 
-    return start_times
+    return schedule.start_times.tolist()
@@ -0,0 +1 @@
+from .cmd_main import atlas_main
@@ -0,0 +1,51 @@
+# Standard library imports
+import argparse
+import time
+
+# Third party imports
+import numpy as np
+
+# Local application imports
+from autocross import fileio
+from autocross.atlas import cost_atlas
+
+
+def atlas_main(args: argparse.Namespace) -> int:
+    if args.action == 'build':
+        assert len(args.vehicle_files) == 1, \
+            'An atlas is built from one vehicle file'
+
+        axes = [cost_atlas.Axis(name, np.linspace(float(low), float(high),
+                                                  int(count)))
+                for name, low, high, count in args.axis or []]
+        times = np.arange(args.time_min, args.time_max + 1, args.time_step)
+
+        atlas = cost_atlas.build_atlas(
+            fileio.read_vehicle_file(args.vehicle_files[0]), axes, times,
+            args.directions or cost_atlas.DIRECTIONS, workers=args.workers)
+        cost_atlas.write_atlas(args.atlas_file, atlas)
+
+        num_solved = int(np.count_nonzero(np.isfinite(atlas.costs)))
+        print(f'Solved {num_solved} of {atlas.costs.size} crossing costs')
+    else:
+        atlas = cost_atlas.read_atlas(args.atlas_file)
+
+        for vehicle_file in args.vehicle_files:
+            start = time.perf_counter()
+            curve = cost_atlas.query_atlas(
+                atlas, fileio.read_vehicle_file(vehicle_file),
+                args.direction, args.max_error)
+            elapsed = (time.perf_counter() - start) * 1000
+
+            file_name = fileio.get_file_name(vehicle_file)
+            file_dir = fileio.get_file_directory(vehicle_file)
+            fileio.write_cost_file(f'{file_dir}/{file_name}.cost',
+                                   curve.cost_func, curve.cost_bounds)
+            fileio.write_cost_file(f'{file_dir}/{file_name}.wait',
+                                   curve.wait_func, curve.wait_bounds)
+
+            method = 'exact solve' if curve.exact else \
+                f'interpolated, error estimate {curve.error:.4g}'
+            print(f'{file_name}: {method}, {elapsed:.1f} ms')
+
+    return 0
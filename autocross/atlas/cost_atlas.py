@@ -0,0 +1,332 @@
+"""Preference-space cost atlas
+
+Vehicles of one type share their model and bounds, and differ by their
+preferences, wait factor and position. An atlas solves the crossing
+costs of a vehicle type offline, on a grid over some of its preference
+weights, once per direction. A new vehicle of that type then gets its
+cost function by interpolating the atlas instead of solving.
+
+Two parts of a vehicle need no grid. The time weight only adds the
+time cost, which does not change the trajectory, so the atlas stores
+costs without it and adds each vehicle's own. Positions and wait
+factors do not change the crossing costs at all, see
+`calculate.canonical`.
+
+Costs are interpolated multilinearly between grid points. The error is
+estimated from the second differences of the atlas along each axis,
+which bound the error of linear interpolation. A vehicle of another
+type, with preferences outside the grid, or with an estimated error
+above the maximum is solved exactly instead.
+"""
+# Standard library imports
+import concurrent.futures
+import copy
+import itertools
+import json
+from typing import Final, NamedTuple, Optional, Sequence
+
+# Third party imports
+import casadi
+import numpy as np
+
+# Local application imports
+from autocross import fileio
+from autocross.calculate import canonical
+from autocross.calculate import curves
+from autocross.calculate import vehicle
+
+
+AXIS_GROUPS: Final[tuple] = ('state', 'input')
+DIRECTIONS: Final[tuple] = ('straight', 'left', 'right')
+MIN_TIMES: Final[int] = 4
+
+
+class Axis(NamedTuple):
+    """Grid axis over one preference weight
+
+    """
+    name: str
+    """Preference weight formatted as 'group.index', for example
+    'input.1'"""
+    values: np.ndarray
+    """Increasing grid values"""
+
+
+class CostAtlas(NamedTuple):
+    """Crossing costs of a vehicle type on a preference grid
+
+    """
+    vehicle: dict
+    """Vehicle data of the type, moved to the origin"""
+    axes: list
+    """Grid axes"""
+    directions: list
+    """Solved directions"""
+    times: np.ndarray
+    """Solved crossing times"""
+    costs: np.ndarray
+    """Crossing costs without the time cost, indexed by direction, grid
+    point and time. NaN where there is no solution."""
+
+
+class AtlasCurve(NamedTuple):
+    """Cost functions of a vehicle from an atlas
+
+    """
+    cost_func: object
+    """Crossing cost function"""
+    cost_bounds: tuple
+    """Crossing cost function bounds"""
+    wait_func: object
+    """Waiting cost function"""
+    wait_bounds: tuple
+    """Waiting cost function bounds"""
+    error: float
+    """Estimated largest interpolation error, 0 if solved exactly"""
+    exact: bool
+    """Whether the costs were solved instead of interpolated"""
+
+
+def parse_axis_name(name: str) -> tuple:
+    """Split a preference weight name
+
+    :param name: preference weight formatted as 'group.index'
+    :return: tuple formatted as (group, index)
+    """
+    group, _, index = name.partition('.')
+
+    assert group in AXIS_GROUPS and index.isdigit(), \
+        f'Unknown preference weight {name}'
+
+    return group, int(index)
+
+
+def with_preferences(vehicle_data: dict, axes: Sequence,
+                     point: Sequence) -> dict:
+    """Set the preference weights of a vehicle
+
+    :param vehicle_data: vehicle data as read from a vehicle file
+    :param axes: grid axes
+    :param point: weight per axis
+    :return: copy of the vehicle data with the weights set
+    """
+    data = copy.deepcopy(vehicle_data)
+
+    for axis, value in zip(axes, point):
+        group, index = parse_axis_name(axis.name)
+        data['preferences'][group] = list(data['preferences'][group])
+        data['preferences'][group][index] = float(value)
+
+    return data
+
+
+def type_key(vehicle_data: dict, axes: Sequence) -> str:
+    """Get a key that is equal for vehicles of one type
+
+    The gridded weights and the time weight are left out.
+
+    :param vehicle_data: vehicle data as read from a vehicle file
+    :param axes: grid axes
+    :return: key string
+    """
+    data = with_preferences(vehicle_data, axes, [0.0] * len(axes))
+    data['preferences']['time'] = 0.0
+
+    return canonical.canonical_key(data)
+
+
+def build_atlas(vehicle_data: dict, axes: Sequence, times: Sequence,
+                directions: Sequence = DIRECTIONS,
+                delta_t: float = curves.DELTA_T,
+                workers: int = 1) -> CostAtlas:
+    """Solve the crossing costs of a vehicle type on a preference grid
+
+    :param vehicle_data: vehicle data of the type. Weights that are not
+    gridded are kept for every grid point.
+    :param axes: grid axes
+    :param times: crossing times to solve for
+    :param directions: directions to solve for
+    :param delta_t: time delta between samples
+    :param workers: number of worker processes
+    :return: cost atlas
+    """
+    base, _ = canonical.canonicalize(vehicle_data)
+    directions = [curves.normalize_direction(direction)
+                  for direction in directions]
+    times = np.asarray(times, dtype=float)
+    shape = tuple(axis.values.size for axis in axes)
+
+    tasks = [(with_preferences(base, axes, point), times, direction,
+              delta_t)
+             for direction in directions
+             for point in itertools.product(*[axis.values for axis in axes])]
+
+    if workers > 1 and len(tasks) > 1:
+        with concurrent.futures.ProcessPoolExecutor(
+                max_workers=workers) as executor:
+            rows = list(executor.map(_solve_costs, tasks))
+    else:
+        rows = [_solve_costs(task) for task in tasks]
+
+    return CostAtlas(base, list(axes), directions, times,
+                     np.asarray(rows).reshape(len(directions), *shape,
+                                              times.size))
+
+
+def write_atlas(filepath: str, atlas: CostAtlas) -> None:
+    """Write an atlas to file
+
+    :param filepath: path to the npz file to write
+    :param atlas: cost atlas
+    :return: None
+    """
+    fileio.write_atlas_file(filepath, json.dumps(atlas.vehicle),
+                            [axis.name for axis in atlas.axes],
+                            [axis.values for axis in atlas.axes],
+                            atlas.directions, atlas.times, atlas.costs)
+
+
+def read_atlas(filepath: str) -> CostAtlas:
+    """Read an atlas from file
+
+    :param filepath: path to the npz file containing the atlas
+    :return: cost atlas
+    """
+    data = fileio.read_atlas_file(filepath)
+    axes = [Axis(name, values)
+            for name, values in zip(data['axis_names'], data['axis_values'])]
+
+    return CostAtlas(json.loads(data['vehicle']), axes, data['directions'],
+                     data['times'], data['costs'].astype(float))
+
+
+def interpolate(atlas: CostAtlas, vehicle_data: dict,
+                direction: Optional[str] = None) -> Optional[tuple]:
+    """Interpolate a vehicle's crossing costs in an atlas
+
+    :param atlas: cost atlas
+    :param vehicle_data: vehicle data as read from a vehicle file
+    :param direction: 'left', 'right', or anything else for straight
+    :return: tuple formatted as (costs at the atlas times, NaN where
+    unsolved, estimated error per time), or None if the vehicle is of
+    another type, its direction was not solved or its weights are
+    outside the grid
+    """
+    direction = curves.normalize_direction(direction)
+
+    if direction not in atlas.directions or \
+            type_key(vehicle_data, atlas.axes) \
+            != type_key(atlas.vehicle, atlas.axes):
+        return None
+
+    cells = []
+    for axis in atlas.axes:
+        group, index = parse_axis_name(axis.name)
+        value = float(vehicle_data['preferences'][group][index])
+
+        if not axis.values[0] <= value <= axis.values[-1]:
+            return None
+
+        lower = min(int(np.searchsorted(axis.values, value, 'right')) - 1,
+                    axis.values.size - 2)
+        fraction = (value - axis.values[lower]) \
+            / (axis.values[lower + 1] - axis.values[lower])
+        cells.append((lower, fraction))
+
+    grid = atlas.costs[atlas.directions.index(direction)]
+    costs = np.zeros(atlas.times.size)
+
+    for corner in itertools.product((0, 1), repeat=len(cells)):
+        weight = np.prod([fraction if upper else 1 - fraction
+                          for upper, (_, fraction) in zip(corner, cells)])
+        costs += weight * grid[tuple(lower + upper for upper, (lower, _)
+                                     in zip(corner, cells))]
+
+    errors = np.zeros(atlas.times.size)
+    nearest = [lower + round(fraction) for lower, fraction in cells]
+
+    for axis_index, (lower, fraction) in enumerate(cells):
+        size = atlas.axes[axis_index].values.size
+        if size < 3:
+            errors += np.inf
+            continue
+
+        # Second difference around the cell, with the other axes at the
+        # nearest grid point
+        center = min(max(lower + round(fraction), 1), size - 2)
+        index = list(nearest)
+        samples = []
+        for offset in (-1, 0, 1):
+            index[axis_index] = center + offset
+            samples.append(grid[tuple(index)])
+
+        errors += fraction * (1 - fraction) / 2 \
+            * np.abs(samples[0] - 2 * samples[1] + samples[2])
+
+    # Unsolved neighbours leave the error unknown
+    return costs, np.where(np.isnan(errors), np.inf, errors)
+
+
+def query_atlas(atlas: CostAtlas, vehicle_data: dict,
+                direction: Optional[str] = None,
+                max_error: Optional[float] = None,
+                delta_t: float = curves.DELTA_T) -> AtlasCurve:
+    """Get a vehicle's cost functions from an atlas
+
+    The vehicle is solved exactly at the atlas times if it cannot be
+    interpolated or its estimated error exceeds the maximum.
+
+    :param atlas: cost atlas
+    :param vehicle_data: vehicle data as read from a vehicle file
+    :param direction: 'left', 'right', or anything else for straight
+    :param max_error: (optional) maximum estimated error. Defaults to
+    always interpolating if possible.
+    :param delta_t: time delta between samples of exact solves
+    :return: cost functions of the vehicle
+    """
+    result = interpolate(atlas, vehicle_data, direction)
+
+    if result is not None:
+        costs, errors = result
+        solved = np.isfinite(costs)
+        times = atlas.times[solved]
+        error = float(np.max(errors[solved], initial=0.0))
+
+        if times.size >= MIN_TIMES and \
+                (max_error is None or error <= max_error):
+            time_costs = vehicle_data['preferences']['time'] * times
+            cost_func = casadi.interpolant('cost_func', 'bspline',
+                                           [list(times)],
+                                           list(costs[solved] + time_costs))
+            cost_bounds = (float(times[0]), float(times[-1]))
+
+            return AtlasCurve(cost_func, cost_bounds,
+                              *curves.wait_curve(cost_bounds,
+                                                 vehicle_data['wait_factor']),
+                              error, False)
+
+    exact = curves.calculate_cost_curves(vehicle_data, atlas.times,
+                                         direction, delta_t)
+
+    return AtlasCurve(*exact[:4], 0.0, True)
+
+
+def _solve_costs(task: tuple) -> list:
+    """Solve the crossing costs of one grid point
+
+    :param task: tuple formatted as (vehicle data, times, direction,
+    time delta between samples)
+    :return: list of costs without the time cost, NaN where there is no
+    solution
+    """
+    vehicle_data, times, direction, delta_t = task
+    veh = vehicle.build_vehicle(vehicle_data)
+    costs = []
+
+    for time in times:
+        cost = curves.solve_crossing_time(veh, time, direction,
+                                          delta_t)['cost']
+        costs.append(np.nan if cost is None
+                     else cost - veh.preferences.time * time)
+
+    return costs
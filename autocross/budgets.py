@@ -0,0 +1,110 @@
+"""Solve budgets
+
+Most IPOPT solves finish in well under a second, but a pathological
+one can run for minutes. A budget bounds every solve by wall time and
+by iterations, and can bound a whole run by a deadline. A solve that
+runs out of budget raises `BudgetExceeded`, so callers can tell it
+apart from a problem without a solution and fill in the result or fall
+back to a heuristic instead.
+"""
+# Standard library imports
+import time
+from typing import Final, NamedTuple, Optional
+
+
+TIMEOUT_STATUSES: Final[tuple] = ('Maximum_WallTime_Exceeded',
+                                  'Maximum_CpuTime_Exceeded',
+                                  'Maximum_Iterations_Exceeded')
+"""IPOPT return statuses of solves that ran out of budget"""
+
+
+class BudgetExceeded(Exception):
+    """Raised when a solve runs out of its budget
+
+    """
+
+
+class Budget(NamedTuple):
+    """Wall time and iteration limits of solves
+
+    """
+    max_time: Optional[float] = None
+    """Wall time in seconds per solve"""
+    max_iter: Optional[int] = None
+    """IPOPT iterations per solve"""
+    deadline: Optional[float] = None
+    """Value of `time.monotonic` at which the run must end"""
+
+    def remaining(self) -> Optional[float]:
+        """Get the wall time left for a solve
+
+        :return: smaller of the per-solve time and the time to the
+        deadline in seconds, or None if unlimited
+        """
+        limits = [limit for limit in (
+            self.max_time,
+            None if self.deadline is None
+            else self.deadline - time.monotonic())
+                  if limit is not None]
+
+        return min(limits) if limits else None
+
+    def solver_options(self) -> dict:
+        """Get the IPOPT options enforcing the budget
+
+        :return: dict of CasADi solver options
+        """
+        remaining = self.remaining()
+
+        if remaining is not None and remaining <= 0:
+            raise BudgetExceeded('Run deadline passed')
+
+        options = {}
+        if remaining is not None:
+            options['ipopt.max_wall_time'] = remaining
+        if self.max_iter is not None:
+            options['ipopt.max_iter'] = self.max_iter
+
+        return options
+
+
+def create_budget(max_time: Optional[float] = None,
+                  max_iter: Optional[int] = None,
+                  run_time: Optional[float] = None) -> Optional[Budget]:
+    """Create a budget starting now
+
+    :param max_time: (optional) wall time in seconds per solve
+    :param max_iter: (optional) IPOPT iterations per solve
+    :param run_time: (optional) wall time in seconds of the whole run
+    :return: budget, or None if nothing is limited
+    """
+    if max_time is None and max_iter is None and run_time is None:
+        return None
+
+    return Budget(max_time, max_iter,
+                  None if run_time is None else time.monotonic() + run_time)
+
+
+def solver_options(budget: Optional[Budget], options: dict) -> dict:
+    """Add the options of a budget to solver options
+
+    :param budget: (optional) budget of the solve
+    :param options: dict of CasADi solver options
+    :return: dict of solver options including the budget's
+    """
+    if budget is None:
+        return options
+
+    return {**options, **budget.solver_options()}
+
+
+def check_status(stats: dict) -> None:
+    """Raise if a failed solve ran out of budget
+
+    :param stats: solver statistics of the failed solve
+    :return: None
+    """
+    status = stats.get('return_status')
+
+    if status in TIMEOUT_STATUSES:
+        raise BudgetExceeded(status)
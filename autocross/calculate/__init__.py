@@ -1 +1 @@
-from .cmd_main import calculate_main
+from .cmd_main import calculate_main, compress_main, queue_main
@@ -0,0 +1,216 @@
+"""Position-normalised vehicles
+
+The crossing problem of a vehicle tracks a reference path that starts
+at the vehicle's initial position, and nothing else in the problem
+depends on where the vehicle is. Vehicles that differ only by their
+position therefore have the same cost functions, with trajectories
+that are translated copies of each other.
+
+This module moves each vehicle to the origin, so that such vehicles
+become equal. A fleet's cost functions are then solved once per
+distinct vehicle and shared, and the trajectories are translated back
+to each vehicle's position. Wait factors only affect waiting costs, so
+they do not keep vehicles apart.
+"""
+# Standard library imports
+import copy
+import json
+from typing import Final, Optional, Sequence
+
+# Local application imports
+from autocross import budgets
+from autocross.calculate import curves
+from autocross.calculate import problem
+
+
+POSITION_STATES: Final[int] = 2
+"""Number of leading states that are positions"""
+KEY_DECIMALS: Final[int] = 9
+"""Decimals kept when comparing vehicles, so rounding errors from the
+translation do not keep equal vehicles apart"""
+
+
+def canonicalize(vehicle_data: dict) -> tuple:
+    """Move a vehicle to the origin
+
+    Initial, final and path bounds on the positions are translated by
+    the initial position.
+
+    :param vehicle_data: vehicle data as read from a vehicle file
+    :return: tuple formatted as (vehicle data starting at the origin,
+    initial position)
+    """
+    canonical = copy.deepcopy(vehicle_data)
+    state_bounds = canonical['state_bounds']
+    offset = tuple(state_bounds['initial'][:POSITION_STATES])
+
+    for bound in ('initial', 'final', 'upper', 'lower'):
+        state_bounds[bound] = list(state_bounds[bound])
+        for index, position in enumerate(offset):
+            if state_bounds[bound][index] is not None:
+                state_bounds[bound][index] -= position
+
+    return canonical, offset
+
+
+def canonical_key(vehicle_data: dict, direction: Optional[str] = None) -> str:
+    """Get a key that is equal for vehicles with equal cost functions
+
+    :param vehicle_data: vehicle data as read from a vehicle file
+    :param direction: 'left', 'right', or anything else for straight
+    :return: key string
+    """
+    canonical, _ = canonicalize(vehicle_data)
+    canonical.pop('wait_factor', None)
+
+    return json.dumps([_rounded(canonical),
+                       curves.normalize_direction(direction)],
+                      sort_keys=True)
+
+
+def representatives(vehicle_data: Sequence,
+                    directions: Optional[Sequence] = None) -> list:
+    """Find the first vehicle equal to each vehicle of a fleet
+
+    :param vehicle_data: list of vehicle data dicts
+    :param directions: (optional) list of directions indexed by vehicle
+    ID. Defaults to straight.
+    :return: list of representative vehicle IDs indexed by vehicle ID
+    """
+    directions = directions or [None] * len(vehicle_data)
+    first = {}
+
+    return [first.setdefault(canonical_key(data, direction), vid)
+            for vid, (data, direction) in enumerate(zip(vehicle_data,
+                                                        directions))]
+
+
+def translate_results(results: dict, offset: Sequence) -> dict:
+    """Translate solved trajectories to a position
+
+    :param results: solution per crossing time as returned by
+    `curves.calculate_cost_curves`
+    :param offset: position to translate to
+    :return: solution per crossing time with translated states
+    """
+    translated = {}
+
+    for time, result in results.items():
+        result = dict(result)
+
+        if result.get('states') is not None:
+            result['states'] = result['states'].copy()
+            for index, position in enumerate(offset):
+                result['states'][index, :] += position
+
+        translated[time] = result
+
+    return translated
+
+
+def calculate_fleet_curves(vehicle_data: Sequence, times: Sequence,
+                           directions: Optional[Sequence] = None,
+                           delta_t: float = curves.DELTA_T,
+                           sensitivity: bool = False,
+                           library=None,
+                           budget: Optional[budgets.Budget] = None,
+                           fill: bool = False) -> list:
+    """Calculate the cost functions of a fleet, once per distinct vehicle
+
+    :param vehicle_data: list of vehicle data dicts
+    :param times: crossing times to solve for
+    :param directions: (optional) list of directions indexed by vehicle
+    ID. Defaults to straight.
+    :param delta_t: time delta between samples
+    :param sensitivity: build cubic Hermite cost functions, see
+    `curves.calculate_cost_curves`
+    :param library: (optional) warm-start library, see
+    `curves.solve_crossing_time`
+    :param budget: (optional) budget of every solve
+    :param fill: fill in timed-out costs, see `curves.fill_timed_out`
+    :return: list of cost curves indexed by vehicle ID
+    """
+    directions = directions or [None] * len(vehicle_data)
+    solved = {}
+    fleet_curves = []
+
+    for data, direction, representative in zip(
+            vehicle_data, directions,
+            representatives(vehicle_data, directions)):
+        canonical, offset = canonicalize(data)
+
+        if representative not in solved:
+            solved[representative] = curves.calculate_cost_curves(
+                canonical, times, direction, delta_t, sensitivity,
+                library, budget, fill)
+
+        shared = solved[representative]
+        fleet_curves.append(curves.CostCurves(
+            shared.cost_func, shared.cost_bounds,
+            *curves.wait_curve(shared.cost_bounds, data['wait_factor']),
+            translate_results(shared.results, offset)))
+
+    return fleet_curves
+
+
+def calculate_fleet_direction_curves(vehicle_data: Sequence, times: Sequence,
+                                     directions: Sequence = problem.DIRECTIONS,
+                                     delta_t: float = curves.DELTA_T,
+                                     sensitivity: bool = False,
+                                     library=None,
+                                     budget: Optional[budgets.Budget] = None,
+                                     fill: bool = False) -> list:
+    """Calculate a fleet's cost functions for several directions
+
+    Every distinct vehicle is solved once, with one problem per
+    crossing time shared between the directions, see
+    `problem.calculate_direction_curves`.
+
+    :param vehicle_data: list of vehicle data dicts
+    :param times: crossing times to solve for
+    :param directions: directions to solve for
+    :param delta_t: time delta between samples
+    :param sensitivity: build cubic Hermite cost functions
+    :param library: (optional) warm-start library
+    :param budget: (optional) budget of every solve
+    :param fill: fill in timed-out costs
+    :return: list of dicts of cost curves indexed by direction, indexed
+    by vehicle ID
+    """
+    solved = {}
+    fleet_curves = []
+
+    for data, representative in zip(vehicle_data,
+                                    representatives(vehicle_data)):
+        canonical, offset = canonicalize(data)
+
+        if representative not in solved:
+            solved[representative] = problem.calculate_direction_curves(
+                canonical, times, directions, delta_t, sensitivity, library,
+                budget, fill)
+
+        fleet_curves.append({
+            direction: curves.CostCurves(
+                shared.cost_func, shared.cost_bounds,
+                *curves.wait_curve(shared.cost_bounds, data['wait_factor']),
+                translate_results(shared.results, offset))
+            for direction, shared in solved[representative].items()})
+
+    return fleet_curves
+
+
+def _rounded(value):
+    """Round every float in nested data
+
+    :param value: nested dicts, lists and numbers
+    :return: copy with rounded floats
+    """
+    if isinstance(value, dict):
+        return {key: _rounded(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_rounded(item) for item in value]
+    if isinstance(value, float):
+        # Adding zero turns negative zero into zero
+        return round(value, KEY_DECIMALS) + 0.0
+
+    return value
@@ -1,89 +1,87 @@
 # Standard library imports
 import argparse
+import concurrent.futures
+import os
+from typing import Optional
 
 # Third party imports
-import sys
-
 import numpy as np
 
 # Local application imports
+from autocross import budgets
 from autocross import fileio
-from autocross.calculate import costs
-from autocross.calculate import vehicle
-from autocross.calculate import reference
+from autocross import tracing
+from autocross.calculate import canonical
+from autocross.calculate import compression
+from autocross.calculate import curves
+from autocross.calculate import warmstart
+from autocross.calculate import workqueue
 
 
 def calculate_main(args: argparse.Namespace) -> int:
-    vehicle_data = fileio.read_vehicle_file(args.vehicle_file)
-    veh = vehicle.build_vehicle(vehicle_data)
+    vehicle_files = [args.vehicle_file] + (args.fleet or [])
+    vehicle_data = [fileio.read_vehicle_file(vehicle_file)
+                    for vehicle_file in vehicle_files]
 
     times = np.arange(args.time_min, args.time_max + 1, args.time_step)
-
-    results = dict()
-    for time in times:
-        delta_t = 0.1
-        num_samples = costs.get_horizon(time, delta_t=delta_t)
-
-        if args.direction == 'left':
-            ref = reference.left_turn(num_samples + 1, 10)
-
-            shifted_x = ref[0] + veh.state_bounds.initial[0]
-            shifted_y = ref[1] + veh.state_bounds.initial[1]
-            shifted_ref = np.stack((shifted_x, shifted_y))
-
-            return_data = costs.calculate_with_reference(veh, time,
-                                                         num_samples, delta_t,
-                                                         shifted_ref)
-        elif args.direction == 'right':
-            ref = reference.right_turn(num_samples + 1, 5)
-
-            shifted_x = ref[0] + veh.state_bounds.initial[0]
-            shifted_y = ref[1] + veh.state_bounds.initial[1]
-            shifted_ref = np.stack((shifted_x, shifted_y))
-
-            return_data = costs.calculate_with_reference(veh, time,
-                                                         num_samples, delta_t,
-                                                         shifted_ref)
-        else:
-            # ref = None
-            # return_data = costs.calculate(veh, time, num_samples, delta_t)
-            ref = reference.straight_turn(num_samples + 1, 10)
-
-            shifted_x = ref[0] + veh.state_bounds.initial[0]
-            shifted_y = ref[1] + veh.state_bounds.initial[1]
-            shifted_ref = np.stack((shifted_x, shifted_y))
-
-            return_data = costs.calculate_with_reference(veh, time,
-                                                         num_samples, delta_t,
-                                                         shifted_ref)
-
-        if return_data is not None:
-            cost, states, inputs = return_data
-            results[time] = {
-                'cost': cost,
-                'states': states,
-                'inputs': inputs,
-                'ref': ref,
-            }
-        else:
-            results[time] = {'cost': None}
-            print(f'No solution for time: {time}', file=sys.stderr)
-
-    cost_list = [results['cost'] for results in results.values()]
-    cost_func, cost_bounds = costs.costs_list_to_spline(times, cost_list)
-
-    wait_factor = vehicle_data['wait_factor']
-    wait_times = [time for time in np.arange(cost_bounds[0], cost_bounds[1])]
-    wait_costs = [wait_factor * time for time in wait_times]
-    wait_func, wait_bounds = costs.wait_costs_to_spline(wait_times, wait_costs)
-
+    directions = [args.direction] * len(vehicle_data)
+
+    library = None
+    if args.warm_start_library:
+        library = warmstart.WarmStartLibrary(args.warm_start_size)
+        library.read(args.warm_start_library)
+
+    budget = budgets.create_budget(args.max_solve_time, args.max_iter,
+                                   args.deadline)
+
+    if args.all_directions:
+        fleet_direction_curves = canonical.calculate_fleet_direction_curves(
+            vehicle_data, times, sensitivity=args.hermite, library=library,
+            budget=budget, fill=args.fill_timeouts)
+        fleet_curves = [direction_curves.get(args.direction,
+                                             direction_curves['straight'])
+                        for direction_curves in fleet_direction_curves]
+    else:
+        fleet_curves = canonical.calculate_fleet_curves(
+            vehicle_data, times, directions, sensitivity=args.hermite,
+            library=library, budget=budget, fill=args.fill_timeouts)
+
+    if library is not None:
+        library.write(args.warm_start_library)
+        print(f'warm starts: {library.hits} of '
+              f'{library.hits + library.misses}')
+
+    if budget is not None:
+        solved_curves = [cost_curves
+                         for direction_curves in fleet_direction_curves
+                         for cost_curves in direction_curves.values()] \
+            if args.all_directions else fleet_curves
+        results = [result for cost_curves in solved_curves
+                   for result in cost_curves.results.values()]
+        num_timed_out = sum(bool(result.get('timed_out'))
+                            for result in results)
+        num_filled = sum(bool(result.get('filled')) for result in results)
+        print(f'timed out: {num_timed_out} of {len(results)} solves, '
+              f'filled: {num_filled}')
+
+    if args.fleet:
+        num_distinct = len(set(canonical.representatives(vehicle_data,
+                                                         directions)))
+        print(f'distinct vehicles: {num_distinct} of {len(vehicle_data)}')
+
+    if args.all_directions:
+        for vehicle_file, direction_curves in zip(vehicle_files,
+                                                  fleet_direction_curves):
+            for direction, cost_curves in direction_curves.items():
+                _write_cost_curves(vehicle_file, cost_curves, args.max_error,
+                                   suffix=f'_{direction}')
+    else:
+        for vehicle_file, cost_curves in zip(vehicle_files, fleet_curves):
+            _write_cost_curves(vehicle_file, cost_curves, args.max_error)
+
+    results = fleet_curves[0].results
     file_name = fileio.get_file_name(args.vehicle_file)
     file_dir = fileio.get_file_directory(args.vehicle_file)
-    fileio.write_cost_file(f'{file_dir}/{file_name}.cost',
-                           cost_func, cost_bounds)
-
-    fileio.write_cost_file(f'{file_dir}/{file_name}.wait',
-                           wait_func, wait_bounds)
 
     try:
         import matplotlib.pyplot as plt
@@ -111,3 +109,104 @@ def calculate_main(args: argparse.Namespace) -> int:
         pass
 
     return 0
+
+
+def _write_cost_curves(vehicle_file: str, cost_curves: curves.CostCurves,
+                       max_error: Optional[float] = None,
+                       suffix: str = '') -> None:
+    """Write a vehicle's cost and wait files next to its vehicle file
+
+    :param vehicle_file: path to the vehicle file
+    :param cost_curves: cost curves of the vehicle
+    :param max_error: (optional) compress the functions within this
+    maximum error
+    :param suffix: (optional) appended to the vehicle's file name, for
+    example to tell directions apart
+    :return: None
+    """
+    cost_func, cost_bounds, wait_func, wait_bounds, _ = cost_curves
+
+    file_name = fileio.get_file_name(vehicle_file) + suffix
+    file_dir = fileio.get_file_directory(vehicle_file)
+
+    if max_error is not None:
+        with tracing.span('compress'):
+            cost = compression.compress_curve(cost_func, cost_bounds,
+                                              max_error)
+            wait = compression.compress_curve(wait_func, wait_bounds,
+                                              max_error, name='wait_func')
+        print(compression.format_report(f'{file_name}.cost', cost))
+        print(compression.format_report(f'{file_name}.wait', wait))
+        cost_func, wait_func = cost.func, wait.func
+
+    with tracing.span('write'):
+        fileio.write_cost_file(f'{file_dir}/{file_name}.cost',
+                               cost_func, cost_bounds)
+        fileio.write_cost_file(f'{file_dir}/{file_name}.wait',
+                               wait_func, wait_bounds)
+
+
+def queue_main(args: argparse.Namespace) -> int:
+    if args.action == 'create':
+        vehicle_data = [fileio.read_vehicle_file(filepath)
+                        for filepath in args.vehicle_files]
+        names = [fileio.get_file_name(filepath)
+                 for filepath in args.vehicle_files]
+        times = np.arange(args.time_min, args.time_max + 1, args.time_step)
+
+        num_tasks = workqueue.create_queue(args.queue_dir, vehicle_data,
+                                           names, times, args.directions,
+                                           lease_timeout=args.lease_timeout)
+        print(f'Created {num_tasks} tasks')
+    elif args.action == 'work':
+        kwargs = dict(max_tasks=args.max_tasks,
+                      poll_interval=args.poll_interval, wait=args.wait)
+
+        if args.workers > 1:
+            with concurrent.futures.ProcessPoolExecutor(
+                    max_workers=args.workers) as executor:
+                solved = sum(executor.map(
+                    _run_worker, [(args.queue_dir, kwargs)] * args.workers))
+        else:
+            solved = workqueue.run_worker(args.queue_dir, args.worker_id,
+                                          **kwargs)
+        print(f'Solved {solved} tasks')
+    elif args.action == 'status':
+        for state, count in workqueue.queue_status(args.queue_dir).items():
+            print(f'{state}: {count}')
+    else:
+        output_dir = args.output_dir or args.queue_dir
+        paths = workqueue.reduce_queue(args.queue_dir, output_dir,
+                                       args.max_error)
+        print(f'Wrote {len(paths)} files to {output_dir}')
+
+    return 0
+
+
+def compress_main(args: argparse.Namespace) -> int:
+    for filepath in args.cost_files:
+        func, bounds = fileio.parse_cost_data(fileio.read_cost_file(filepath))
+        curve = compression.compress_curve(func, bounds, args.max_error,
+                                           args.num_samples)
+
+        output_path = filepath
+        if args.output_dir:
+            os.makedirs(args.output_dir, exist_ok=True)
+            output_path = os.path.join(args.output_dir,
+                                       os.path.basename(filepath))
+
+        fileio.write_cost_file(output_path, curve.func, curve.bounds)
+        print(compression.format_report(filepath, curve))
+
+    return 0
+
+
+def _run_worker(task: tuple) -> int:
+    """Run a queue worker in a worker process
+
+    :param task: tuple formatted as (queue directory, worker arguments)
+    :return: number of solved tasks
+    """
+    queue_dir, kwargs = task
+
+    return workqueue.run_worker(queue_dir, **kwargs)
@@ -0,0 +1,136 @@
+"""Cost curve compression
+
+This module refits cost and wait functions with fewer knots. A cost
+function from `calculate` has one knot per solved crossing time, and
+the scheduler evaluates it, with its derivatives, in every solver
+iteration. Compressed functions are smaller on disk and cheaper to
+build into scheduling problems.
+
+A curve is compressed by sampling it densely on its bounds and
+greedily inserting knots: starting from the fewest knots a cubic
+B-spline needs, the sample with the largest error is added as a knot
+until the refit stays within the maximum error at every sample. The
+result is not guaranteed to have the fewest possible knots, but every
+knot is one that was needed when it was added.
+"""
+# Standard library imports
+import pickle
+from typing import Final, NamedTuple, Sequence
+
+# Third party imports
+import casadi
+import numpy as np
+
+
+DEFAULT_NUM_SAMPLES: Final[int] = 400
+MIN_KNOTS: Final[int] = 4
+
+
+class CompressedCurve(NamedTuple):
+    """Compressed cost function and its compression report
+
+    """
+    func: object
+    """Compressed cost function"""
+    bounds: tuple
+    """Cost function bounds, unchanged by compression"""
+    knots: np.ndarray
+    """Knot positions of the compressed function, empty if the original
+    function was kept"""
+    max_error: float
+    """Largest absolute error at the samples"""
+    ratio: float
+    """Pickled size of the original function divided by the pickled
+    size of the compressed function"""
+
+
+def fit_knots(knots: Sequence, values: Sequence, name: str = 'cost_func'):
+    """Fit a cubic B-spline through knots
+
+    :param knots: increasing knot positions, at least four
+    :param values: function values at the knots
+    :param name: function name
+    :return: CasADi interpolant
+    """
+    return casadi.interpolant(name, 'bspline', [list(knots)], list(values))
+
+
+def select_knots(samples: np.ndarray, values: np.ndarray,
+                 max_error: float) -> np.ndarray:
+    """Greedily select the knots of an error-bounded refit
+
+    :param samples: increasing sample positions
+    :param values: function values at the samples
+    :param max_error: maximum absolute error at any sample
+    :return: array of selected sample indices in increasing order.
+    Contains every index if the error bound cannot be met with fewer.
+    """
+    num_samples = samples.size
+
+    if num_samples <= MIN_KNOTS:
+        return np.arange(num_samples)
+
+    selected = np.unique(np.linspace(0, num_samples - 1,
+                                     MIN_KNOTS).astype(np.int64))
+
+    while selected.size < num_samples:
+        func = fit_knots(samples[selected], values[selected])
+        errors = np.abs(np.ravel(np.asarray(func(samples))) - values)
+        errors[selected] = 0
+        worst = int(np.argmax(errors))
+
+        if errors[worst] <= max_error:
+            break
+
+        selected = np.insert(selected, np.searchsorted(selected, worst),
+                             worst)
+
+    return selected
+
+
+def compress_curve(func, bounds: Sequence, max_error: float,
+                   num_samples: int = DEFAULT_NUM_SAMPLES,
+                   name: str = 'cost_func') -> CompressedCurve:
+    """Refit a cost function with as few knots as the error bound allows
+
+    If the refit is not smaller than the original function, the
+    original function is kept.
+
+    :param func: cost function to compress
+    :param bounds: cost function bounds formatted as (lower, upper)
+    :param max_error: maximum absolute error at any sample
+    :param num_samples: number of samples the error is checked at
+    :param name: name of the compressed function
+    :return: compressed cost function and its compression report
+    """
+    samples = np.linspace(float(bounds[0]), float(bounds[1]), num_samples)
+    values = np.ravel(np.asarray(func(samples)))
+
+    selected = select_knots(samples, values, max_error)
+    compressed = fit_knots(samples[selected], values[selected], name)
+
+    original_size = len(pickle.dumps(func))
+    compressed_size = len(pickle.dumps(compressed))
+
+    if compressed_size >= original_size:
+        return CompressedCurve(func, tuple(bounds), np.empty(0), 0.0, 1.0)
+
+    errors = np.abs(np.ravel(np.asarray(compressed(samples))) - values)
+
+    return CompressedCurve(compressed, tuple(bounds), samples[selected],
+                           float(np.max(errors)),
+                           original_size / compressed_size)
+
+
+def format_report(name: str, curve: CompressedCurve) -> str:
+    """Format the compression report of a curve
+
+    :param name: curve name, for example its file name
+    :param curve: compressed curve
+    :return: one line report
+    """
+    if curve.knots.size == 0:
+        return f'{name}: kept original'
+
+    return f'{name}: {curve.knots.size} knots, max error ' \
+           f'{curve.max_error:.3g}, {curve.ratio:.1f}x smaller'
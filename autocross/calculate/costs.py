@@ -1,9 +1,19 @@
 # Standard library imports
 import math
+from typing import Final
 
 # Third party imports
 import casadi
 
+# Local application imports
+from autocross import budgets
+from autocross import tracing
+
+
+# Initial barrier parameter of warm-started solves. Starting the
+# barrier small keeps IPOPT near the initial guess.
+WARM_START_MU_INIT: Final[float] = 1e-4
+
 
 def calculate(vehicle, crossing_time, num_samples, delta_t):
     """Calculate the cost for a vehicle to cross in given time
@@ -45,7 +55,7 @@ def calculate(vehicle, crossing_time, num_samples, delta_t):
 
 
 def calculate_with_reference(vehicle, crossing_time, num_samples, delta_t,
-                             ref):
+                             ref, initial=None, budget=None):
     """Calculate the cost for a vehicle to cross in given time
 
     This function solves a nonlinear optimization problem to determine
@@ -57,6 +67,10 @@ def calculate_with_reference(vehicle, crossing_time, num_samples, delta_t,
     :param num_samples: number of samples in control horizon
     :param delta_t: time delta between samples
     :param ref: reference trajectory to track
+    :param initial: (optional) initial guess formatted as (states,
+    inputs). Defaults to the reference trajectory.
+    :param budget: (optional) budget of the solve. Raises
+    `budgets.BudgetExceeded` if the solve runs out of it.
     :return:
     """
     opti = casadi.Opti()
@@ -78,18 +92,111 @@ def calculate_with_reference(vehicle, crossing_time, num_samples, delta_t,
         'ipopt.sb': 'yes'  # Silence banner header
     }
 
-    opti.set_initial(states[0, :], ref[0, :])
-    opti.set_initial(states[1, :], ref[1, :])
+    set_initial(opti, states, inputs, ref, initial)
+    if initial is not None:
+        options['ipopt.mu_init'] = WARM_START_MU_INIT
 
-    opti.solver('ipopt', options)
+    opti.solver('ipopt', budgets.solver_options(budget, options))
     try:
-        solution = opti.solve()
+        with tracing.span('solve', crossing_time=float(crossing_time)):
+            solution = opti.solve()
         return (solution.value(cost), solution.value(states),
                 solution.value(inputs))
     except RuntimeError:
+        budgets.check_status(opti.stats())
         return None
 
 
+def calculate_with_sensitivity(vehicle, crossing_time, num_samples, ref,
+                               initial=None, budget=None):
+    """Calculate the cost to cross in given time and its time derivative
+
+    The crossing time is a parameter of the problem and the horizon is
+    divided into `num_samples` equal sample periods. The derivative of
+    the Lagrangian with respect to the crossing time at the solution is
+    the cost's derivative for a fixed number of samples, which needs no
+    further solves.
+
+    Along a sweep the sample period is fixed instead, and a longer
+    horizon has proportionally more samples. The path and input costs
+    are sums over the samples, so the per-sample part of the cost,
+    (cost - time cost) / crossing time, is added to get the derivative
+    along the sweep.
+
+    :param vehicle: vehicle object that will be crossing
+    :param crossing_time: time vehicle has to cross the intersection
+    :param num_samples: number of samples in control horizon
+    :param ref: reference trajectory to track
+    :param initial: (optional) initial guess formatted as (states,
+    inputs). Defaults to the reference trajectory.
+    :param budget: (optional) budget of the solve. Raises
+    `budgets.BudgetExceeded` if the solve runs out of it.
+    :return: tuple formatted as (cost, derivative of the cost along
+    the sweep, states, inputs), or None if there is no solution
+    """
+    opti = casadi.Opti()
+
+    time = opti.parameter()
+    opti.set_value(time, crossing_time)
+
+    states = opti.variable(vehicle.num_states, num_samples + 1)
+    inputs = opti.variable(vehicle.num_inputs, num_samples)
+
+    cost = set_objective_with_ref(opti, vehicle, states, inputs, time, ref)
+
+    discretize_rk4(opti, vehicle, states, inputs, num_samples,
+                   time / num_samples)
+
+    set_bounds(opti, states, vehicle.state_bounds)
+    set_bounds(opti, inputs, vehicle.input_bounds)
+
+    options = {
+        'ipopt.print_level': 0,  # Minimal printing
+        'ipopt.sb': 'yes'  # Silence banner header
+    }
+
+    set_initial(opti, states, inputs, ref, initial)
+    if initial is not None:
+        options['ipopt.mu_init'] = WARM_START_MU_INIT
+
+    opti.solver('ipopt', budgets.solver_options(budget, options))
+    try:
+        with tracing.span('solve', crossing_time=float(crossing_time)):
+            solution = opti.solve()
+    except RuntimeError:
+        budgets.check_status(opti.stats())
+        return None
+
+    lagrangian = opti.f + casadi.dot(opti.lam_g, opti.g)
+    sample_cost = solution.value(cost) \
+        - vehicle.preferences.time * crossing_time
+    slope = solution.value(casadi.jacobian(lagrangian, time)) \
+        + sample_cost / crossing_time
+
+    return (solution.value(cost), slope, solution.value(states),
+            solution.value(inputs))
+
+
+def set_initial(opti, states, inputs, ref, initial=None) -> None:
+    """Set the initial guess of a crossing problem
+
+    :param opti: CasADi optimization problem
+    :param states: state variables
+    :param inputs: input variables
+    :param ref: reference trajectory, whose positions are the default
+    initial states
+    :param initial: (optional) initial guess formatted as (states,
+    inputs)
+    :return: None
+    """
+    if initial is None:
+        opti.set_initial(states[0, :], ref[0, :])
+        opti.set_initial(states[1, :], ref[1, :])
+    else:
+        opti.set_initial(states, initial[0])
+        opti.set_initial(inputs, initial[1])
+
+
 def set_objective(opti, vehicle, states, inputs, crossing_time):
     """Sets the objective for the optimization problem
 
@@ -266,3 +373,29 @@ def wait_costs_to_spline(times, costs):
     cost_bounds = (times[0], times[-1])
 
     return cost_func, cost_bounds
+
+
+def cost_table_to_splines(times, costs, cost_bounds, wait_factors):
+    """Create cost and wait functions from a cost table
+
+    A cost table holds the crossing costs of many vehicles evaluated on
+    a shared time grid, one row per vehicle. Waiting costs grow
+    linearly with each vehicle's wait factor.
+
+    :param times: array of grid times
+    :param costs: array of crossing costs with one row per vehicle
+    :param cost_bounds: array of (lower, upper) cost bounds per vehicle
+    :param wait_factors: array of waiting costs per unit of time
+    :return: tuple formatted as (cost functions, cost bounds, wait
+    functions), each a list indexed by vehicle ID
+    """
+    times = list(times)
+
+    cost_funcs = [casadi.interpolant('cost_func', 'bspline', [times],
+                                     list(row)) for row in costs]
+    wait_funcs = [casadi.interpolant('wait_func', 'bspline', [times],
+                                     [factor * time for time in times])
+                  for factor in wait_factors]
+    bounds = [(float(lower), float(upper)) for lower, upper in cost_bounds]
+
+    return cost_funcs, bounds, wait_funcs
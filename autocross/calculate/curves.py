@@ -0,0 +1,310 @@
+"""Crossing cost curves
+
+This module turns a vehicle description into its crossing and waiting
+cost functions by solving one optimal control problem per crossing
+time. It is shared by the `calculate` and `pipeline` commands.
+"""
+# Standard library imports
+import sys
+from typing import Final, NamedTuple, Optional, Sequence
+
+# Third party imports
+import numpy as np
+
+# Local application imports
+from autocross import budgets
+from autocross import tracing
+from autocross.calculate import costs
+from autocross.calculate import hermite
+from autocross.calculate import reference
+from autocross.calculate import vehicle
+
+
+DELTA_T: Final[float] = 0.1
+
+
+class CostCurves(NamedTuple):
+    """Crossing and waiting cost functions of a vehicle
+
+    """
+    cost_func: object
+    """Crossing cost function"""
+    cost_bounds: tuple
+    """Crossing cost function bounds"""
+    wait_func: object
+    """Waiting cost function"""
+    wait_bounds: tuple
+    """Waiting cost function bounds"""
+    results: dict
+    """Solution per crossing time with the keys 'cost', 'states',
+    'inputs' and 'ref'"""
+
+
+def normalize_direction(direction: Optional[str]) -> str:
+    """Get the name of the reference path a direction follows
+
+    :param direction: 'left', 'right', or anything else for straight
+    :return: 'left', 'right' or 'straight'
+    """
+    return direction if direction in ('left', 'right') else 'straight'
+
+
+def reference_path(direction: Optional[str], num_samples: int,
+                   initial_state: Sequence) -> tuple:
+    """Create the reference path for a direction
+
+    :param direction: 'left', 'right', or anything else for straight
+    :param num_samples: number of samples in the control horizon
+    :param initial_state: vehicle initial state, whose position the
+    path is shifted to
+    :return: tuple formatted as (reference path starting at the origin,
+    reference path starting at the vehicle)
+    """
+    if direction == 'left':
+        ref = reference.left_turn(num_samples + 1, 10)
+    elif direction == 'right':
+        ref = reference.right_turn(num_samples + 1, 5)
+    else:
+        ref = reference.straight_turn(num_samples + 1, 10)
+
+    shifted_x = ref[0] + initial_state[0]
+    shifted_y = ref[1] + initial_state[1]
+
+    return ref, np.stack((shifted_x, shifted_y))
+
+
+def solve_crossing_time(veh, time: float, direction: Optional[str] = None,
+                        delta_t: float = DELTA_T,
+                        sensitivity: bool = False,
+                        library=None,
+                        budget: Optional[budgets.Budget] = None) -> dict:
+    """Solve a vehicle's crossing problem for one crossing time
+
+    :param veh: vehicle object that will be crossing
+    :param time: crossing time
+    :param direction: 'left', 'right', or anything else for straight
+    :param delta_t: time delta between samples
+    :param sensitivity: also find the derivative of the cost with
+    respect to the crossing time. The horizon then spans exactly the
+    crossing time, with a sample period of at most `delta_t`.
+    :param library: (optional) warm-start library, see
+    `calculate.warmstart`. The solve starts from the library's nearest
+    trajectory, and the solution is added to it.
+    :param budget: (optional) budget of the solve
+    :return: dict with the keys 'cost', 'states', 'inputs' and 'ref',
+    and 'slope' with `sensitivity`, or only 'cost' set to None if there
+    is no solution, with 'timed_out' set if the budget ran out
+    """
+    num_samples = costs.get_horizon(time, delta_t=delta_t)
+    ref, shifted_ref = reference_path(direction, num_samples,
+                                      veh.state_bounds.initial)
+
+    return collect_solution(
+        lambda initial: _solve(veh, time, num_samples, delta_t, shifted_ref,
+                               sensitivity, initial, budget),
+        veh, time, direction, num_samples, ref, library)
+
+
+def collect_solution(solve, veh, time: float, direction: Optional[str],
+                     num_samples: int, ref, library=None) -> dict:
+    """Solve a crossing problem and collect its result
+
+    The solve starts from the library's nearest trajectory and is
+    retried from the reference path if that finds no solution. Solves
+    that run out of budget or have no solution are reported on
+    stderr.
+
+    :param solve: callable taking an initial guess formatted as
+    (states, inputs), or None for the reference path, and returning
+    (cost, states, inputs), (cost, slope, states, inputs) or None if
+    there is no solution. It may raise `budgets.BudgetExceeded`.
+    :param veh: vehicle object that will be crossing
+    :param time: crossing time
+    :param direction: 'left', 'right', or anything else for straight
+    :param num_samples: number of samples in the control horizon
+    :param ref: reference path starting at the origin
+    :param library: (optional) warm-start library, see
+    `calculate.warmstart`. The solution is added to it.
+    :return: result dict formatted like `solve_crossing_time`
+    """
+    initial = library.initial_guess(veh, direction, num_samples) \
+        if library is not None else None
+
+    try:
+        with tracing.span('calculate', crossing_time=float(time),
+                          direction=direction):
+            return_data = solve(initial)
+
+            # A poor initial guess must not lose a solution
+            if return_data is None and initial is not None:
+                return_data = solve(None)
+    except budgets.BudgetExceeded as error:
+        print(f'Solve timed out for time: {time} ({error})', file=sys.stderr)
+        return {'cost': None, 'timed_out': True}
+
+    if return_data is None:
+        print(f'No solution for time: {time}', file=sys.stderr)
+        return {'cost': None}
+
+    cost, *slope, states, inputs = return_data
+
+    if library is not None:
+        library.add(veh, direction, states, inputs)
+
+    result = {
+        'cost': cost,
+        'states': states,
+        'inputs': inputs,
+        'ref': ref,
+    }
+
+    if slope:
+        result['slope'] = slope[0]
+
+    return result
+
+
+def _solve(veh, time: float, num_samples: int, delta_t: float, ref,
+           sensitivity: bool, initial: Optional[tuple] = None,
+           budget: Optional[budgets.Budget] = None):
+    """Solve a crossing problem
+
+    :param veh: vehicle object that will be crossing
+    :param time: crossing time
+    :param num_samples: number of samples in the control horizon
+    :param delta_t: time delta between samples
+    :param ref: reference path starting at the vehicle
+    :param sensitivity: also find the derivative of the cost
+    :param initial: (optional) initial guess formatted as (states,
+    inputs)
+    :param budget: (optional) budget of the solve
+    :return: solution as returned by `costs.calculate_with_reference`
+    or `costs.calculate_with_sensitivity`, or None
+    """
+    if sensitivity:
+        return costs.calculate_with_sensitivity(veh, time, num_samples, ref,
+                                                initial, budget)
+
+    return costs.calculate_with_reference(veh, time, num_samples, delta_t,
+                                          ref, initial, budget)
+
+
+def curves_from_costs(times: Sequence, cost_list: Sequence,
+                      wait_factor: float,
+                      slope_list: Optional[Sequence] = None) -> tuple:
+    """Create a vehicle's cost functions from its solved costs
+
+    :param times: crossing times that were solved for
+    :param cost_list: cost per crossing time, None where there is no
+    solution
+    :param wait_factor: waiting cost per unit of time
+    :param slope_list: (optional) derivative of the cost per crossing
+    time. If given, the cost function is a cubic Hermite spline instead
+    of a B-spline.
+    :return: tuple formatted as (cost function, cost bounds, wait
+    function, wait bounds)
+    """
+    assert any(cost is not None for cost in cost_list), \
+        'No crossing time has a solution'
+
+    if slope_list is None:
+        cost_func, cost_bounds = costs.costs_list_to_spline(
+            np.asarray(times), list(cost_list))
+    else:
+        lower, upper = costs.get_cost_domain_indices(cost_list)
+        solved = [index for index in range(lower, upper + 1)
+                  if cost_list[index] is not None]
+        cost_func = hermite.hermite_interpolant(
+            [times[index] for index in solved],
+            [cost_list[index] for index in solved],
+            [slope_list[index] for index in solved])
+        cost_bounds = (times[lower], times[upper])
+
+    return (cost_func, cost_bounds, *wait_curve(cost_bounds, wait_factor))
+
+
+def wait_curve(cost_bounds: Sequence, wait_factor: float) -> tuple:
+    """Create a vehicle's waiting cost function
+
+    :param cost_bounds: crossing cost function bounds
+    :param wait_factor: waiting cost per unit of time
+    :return: tuple formatted as (wait function, wait bounds)
+    """
+    wait_times = [time for time in np.arange(cost_bounds[0], cost_bounds[1])]
+    wait_costs = [wait_factor * time for time in wait_times]
+
+    return costs.wait_costs_to_spline(wait_times, wait_costs)
+
+
+def fill_timed_out(times: Sequence, results: dict) -> int:
+    """Fill in timed-out costs from the neighbouring solved costs
+
+    Costs are interpolated linearly between the nearest solved times on
+    either side, and slopes are set to the secant between them.
+    Timed-out times outside the solved times stay without a solution.
+
+    :param times: crossing times that were solved for
+    :param results: solution per crossing time, updated in place
+    :return: number of filled crossing times
+    """
+    solved = [time for time in times if results[time]['cost'] is not None]
+    num_filled = 0
+
+    for time in times:
+        result = results[time]
+        if not result.get('timed_out') or not solved or \
+                not solved[0] < time < solved[-1]:
+            continue
+
+        upper = next(other for other in solved if other > time)
+        lower = max(other for other in solved if other < time)
+        secant = (results[upper]['cost'] - results[lower]['cost']) \
+            / (upper - lower)
+
+        result['cost'] = results[lower]['cost'] + secant * (time - lower)
+        result['slope'] = secant
+        result['filled'] = True
+        num_filled += 1
+
+    return num_filled
+
+
+def calculate_cost_curves(vehicle_data: dict, times: Sequence,
+                          direction: Optional[str] = None,
+                          delta_t: float = DELTA_T,
+                          sensitivity: bool = False,
+                          library=None,
+                          budget: Optional[budgets.Budget] = None,
+                          fill: bool = False) -> CostCurves:
+    """Calculate a vehicle's crossing and waiting cost functions
+
+    :param vehicle_data: vehicle data as read from a vehicle file
+    :param times: crossing times to solve for
+    :param direction: 'left', 'right', or anything else for straight
+    :param delta_t: time delta between samples
+    :param sensitivity: also solve for the derivatives of the costs and
+    build a cubic Hermite cost function, which is as accurate with a
+    coarser time step
+    :param library: (optional) warm-start library, see
+    `solve_crossing_time`
+    :param budget: (optional) budget of every solve
+    :param fill: fill in timed-out costs, see `fill_timed_out`
+    :return: cost curves of the vehicle
+    """
+    veh = vehicle.build_vehicle(vehicle_data)
+
+    results = {time: solve_crossing_time(veh, time, direction, delta_t,
+                                         sensitivity, library, budget)
+               for time in times}
+
+    if fill:
+        fill_timed_out(times, results)
+
+    cost_list = [result['cost'] for result in results.values()]
+    slope_list = [result.get('slope') for result in results.values()] \
+        if sensitivity else None
+
+    return CostCurves(*curves_from_costs(times, cost_list,
+                                         vehicle_data['wait_factor'],
+                                         slope_list),
+                      results)
@@ -0,0 +1,79 @@
+"""Cubic Hermite cost functions
+
+This module builds cost functions from costs and their derivatives
+with respect to the crossing time. A cubic Hermite spline matches the
+value and the slope at every solved time, so it follows a smooth cost
+curve as closely as a B-spline through about twice as many values.
+
+CasADi has no Hermite interpolant, so the spline is built as a CasADi
+function: the interval of the input is looked up among the solved
+times and the interval's cubic polynomial is evaluated. Like the
+B-spline interpolants, the function can be differentiated, used in
+optimization problems and written to cost files.
+"""
+# Standard library imports
+from typing import Sequence
+
+# Third party imports
+import casadi
+import numpy as np
+
+
+def hermite_coefficients(times: Sequence, values: Sequence,
+                         slopes: Sequence) -> np.ndarray:
+    """Get the polynomial coefficients of a cubic Hermite spline
+
+    Interval i is evaluated as
+    c[0, i] + s * (c[1, i] + s * (c[2, i] + s * c[3, i])),
+    where s is the time since times[i].
+
+    :param times: strictly increasing times, at least two
+    :param values: function values at the times
+    :param slopes: function derivatives at the times
+    :return: array of coefficients with one column per interval
+    """
+    times = np.asarray(times, dtype=float)
+    values = np.asarray(values, dtype=float)
+    slopes = np.asarray(slopes, dtype=float)
+
+    assert times.size >= 2, 'A Hermite spline needs two points'
+    assert np.all(np.diff(times) > 0), 'Times must be strictly increasing'
+
+    widths = np.diff(times)
+    secants = np.diff(values) / widths
+
+    return np.stack((
+        values[:-1],
+        slopes[:-1],
+        (3 * secants - 2 * slopes[:-1] - slopes[1:]) / widths,
+        (slopes[:-1] + slopes[1:] - 2 * secants) / widths ** 2
+    ))
+
+
+def hermite_interpolant(times: Sequence, values: Sequence,
+                        slopes: Sequence, name: str = 'cost_func'):
+    """Create a cubic Hermite spline function
+
+    Inputs outside the times are extrapolated with the first or last
+    interval's polynomial.
+
+    :param times: strictly increasing times, at least two
+    :param values: function values at the times
+    :param slopes: function derivatives at the times
+    :param name: function name
+    :return: CasADi function
+    """
+    coefficients = hermite_coefficients(times, values, slopes)
+    num_intervals = coefficients.shape[1]
+
+    time = casadi.MX.sym('time')
+    interval = casadi.fmin(casadi.fmax(
+        casadi.low(casadi.DM(list(times)), time), 0), num_intervals - 1)
+
+    start = casadi.MX(casadi.DM(list(times[:-1])))[interval]
+    c_0, c_1, c_2, c_3 = [casadi.MX(casadi.DM(list(row)))[interval]
+                          for row in coefficients]
+    offset = time - start
+
+    return casadi.Function(name, [time], [
+        c_0 + offset * (c_1 + offset * (c_2 + offset * c_3))])
@@ -0,0 +1,279 @@
+"""Lazy cost curves
+
+This module builds a vehicle's crossing cost function on demand. A
+`calculate` sweep solves every crossing time in the range, but the
+scheduler only evaluates each cost function near the vehicle's optimal
+crossing time. A lazy curve starts from a few coarse solves and
+interpolates them with a cubic B-spline. Whenever the curve is
+evaluated inside an interval of solved times that is not resolved yet,
+the interval's midpoint is solved and compared with the spline. The
+interval is resolved once the spline predicted the midpoint within the
+tolerance, or once it is no wider than the resolution. Every solved
+point is kept, so repeated evaluations cost only the interpolation.
+
+The curve is exposed as a CasADi callback, so it can be used wherever
+a cost function is expected. Its derivatives are found by finite
+differences, which evaluate the curve close to the point being
+differentiated and so refine the same interval.
+"""
+# Standard library imports
+import bisect
+from typing import Final, Optional, Sequence
+
+# Third party imports
+import casadi
+import numpy as np
+
+# Local application imports
+from autocross import budgets
+from autocross.calculate import curves
+
+
+INITIAL_POINTS: Final[int] = 5
+TOLERANCE: Final[float] = 0.01
+RESOLUTION: Final[float] = 1.0
+
+
+class LazyCostCurve:
+    """Crossing cost function solved on demand
+
+    """
+    def __init__(self, veh, time_min: float, time_max: float,
+                 direction: Optional[str] = None,
+                 delta_t: float = curves.DELTA_T,
+                 initial_points: int = INITIAL_POINTS,
+                 tolerance: float = TOLERANCE,
+                 resolution: float = RESOLUTION,
+                 budget: Optional[budgets.Budget] = None) -> None:
+        """Init function
+
+        The coarse points are solved immediately. Where a coarse point
+        next to the first or last one with a solution has none, the
+        bound is bisected between the two down to the resolution, so
+        it lies within one resolution of the feasible range.
+
+        :param veh: vehicle object that will be crossing
+        :param time_min: lowest crossing time
+        :param time_max: highest crossing time
+        :param direction: 'left', 'right', or anything else for straight
+        :param delta_t: time delta between samples
+        :param initial_points: number of coarse points, at least four
+        :param tolerance: largest absolute difference between a solved
+        midpoint and the spline's prediction for an interval to be
+        resolved
+        :param resolution: width below which an interval is resolved
+        :param budget: (optional) budget of every solve, including the
+        refinements. A solve that runs out of budget counts as one
+        without a solution.
+        :return: None
+        :raises: ValueError if fewer than four coarse points have a
+        solution
+        """
+        assert initial_points >= 4, 'A cubic B-spline needs four points'
+
+        self._veh = veh
+        self._direction = direction
+        self._delta_t = delta_t
+        self._tolerance = tolerance
+        self._resolution = resolution
+        self._budget = budget
+        self._times = []
+        self._costs = []
+        self._resolved = set()
+        self._spline = None
+        self.num_solves = 0
+
+        coarse_times = [float(time) for time in
+                        np.linspace(time_min, time_max, initial_points)]
+        feasible = [self._solve(time) is not None for time in coarse_times]
+
+        if sum(feasible) < 4:
+            raise ValueError(f'Only {sum(feasible)} of {initial_points} '
+                             f'coarse points have a solution')
+
+        first = feasible.index(True)
+        last = len(feasible) - 1 - feasible[::-1].index(True)
+        if first > 0:
+            self._bisect_bound(coarse_times[first - 1], coarse_times[first])
+        if last < len(feasible) - 1:
+            self._bisect_bound(coarse_times[last + 1], coarse_times[last])
+
+        self.bounds = (self._times[0], self._times[-1])
+        self._fit()
+        self.func = _CurveCallback(self)
+
+    @property
+    def solved_times(self) -> list:
+        """Get the crossing times solved so far
+
+        :return: list of increasing crossing times
+        """
+        return list(self._times)
+
+    @property
+    def spline(self):
+        """Get the spline through the points solved so far
+
+        :return: CasADi interpolant
+        """
+        return self._spline
+
+    def __call__(self, time: float) -> float:
+        """Evaluate the cost, refining around the time if needed
+
+        Times outside the bounds are evaluated at the nearest bound.
+
+        :param time: crossing time
+        :return: crossing cost
+        """
+        time = min(max(float(time), self.bounds[0]), self.bounds[1])
+        self.refine(time)
+
+        return float(self._spline(time))
+
+    def refine(self, time: float) -> None:
+        """Solve midpoints until the interval around a time is resolved
+
+        :param time: crossing time within the bounds
+        :return: None
+        """
+        while True:
+            index = min(bisect.bisect_right(self._times, time),
+                        len(self._times) - 1)
+            interval = (self._times[index - 1], self._times[index])
+
+            if interval in self._resolved \
+                    or interval[1] - interval[0] <= self._resolution:
+                return
+
+            midpoint = sum(interval) / 2
+            predicted = float(self._spline(midpoint))
+
+            if self._solve(midpoint) is None:
+                # Keep the interval as is rather than retrying it
+                self._resolved.add(interval)
+                return
+
+            self._fit()
+
+            if abs(self._costs[index] - predicted) <= self._tolerance:
+                self._resolved.add((interval[0], midpoint))
+                self._resolved.add((midpoint, interval[1]))
+
+    def _bisect_bound(self, infeasible: float, feasible: float) -> None:
+        """Move a bound towards the edge of the feasible range
+
+        Every solved time is stored, so the bound is the solved time
+        closest to the infeasible one afterwards.
+
+        :param infeasible: crossing time without a solution
+        :param feasible: crossing time with a solution
+        :return: None
+        """
+        while abs(feasible - infeasible) > self._resolution:
+            midpoint = (infeasible + feasible) / 2
+
+            if self._solve(midpoint) is None:
+                infeasible = midpoint
+            else:
+                feasible = midpoint
+
+    def _solve(self, time: float) -> Optional[float]:
+        """Solve and store the cost of one crossing time
+
+        :param time: crossing time
+        :return: crossing cost, or None if there is no solution
+        """
+        self.num_solves += 1
+        cost = self._solve_cost(time)
+
+        if cost is not None:
+            index = bisect.bisect(self._times, time)
+            self._times.insert(index, time)
+            self._costs.insert(index, float(cost))
+
+        return cost
+
+    def _solve_cost(self, time: float) -> Optional[float]:
+        """Solve the crossing problem of one crossing time
+
+        :param time: crossing time
+        :return: crossing cost, or None if there is no solution
+        """
+        return curves.solve_crossing_time(self._veh, time, self._direction,
+                                          self._delta_t,
+                                          budget=self._budget)['cost']
+
+    def _fit(self) -> None:
+        """Refit the spline through the solved points
+
+        :return: None
+        """
+        self._spline = casadi.interpolant('cost_func', 'bspline',
+                                          [self._times], self._costs)
+
+
+def lazy_cost_curves(vehicles: Sequence, time_min: float, time_max: float,
+                     directions: Optional[Sequence] = None,
+                     **kwargs) -> list:
+    """Create lazy cost curves for a fleet
+
+    :param vehicles: list of vehicle objects
+    :param time_min: lowest crossing time
+    :param time_max: highest crossing time
+    :param directions: (optional) list of directions indexed by vehicle
+    ID. Defaults to straight.
+    :param kwargs: (optional) keyword arguments of `LazyCostCurve`
+    :return: list of lazy cost curves indexed by vehicle ID
+    """
+    directions = directions or [None] * len(vehicles)
+
+    return [LazyCostCurve(veh, time_min, time_max, direction, **kwargs)
+            for veh, direction in zip(vehicles, directions)]
+
+
+class _CurveCallback(casadi.Callback):
+    """CasADi function evaluating a lazy cost curve
+
+    """
+    def __init__(self, curve: LazyCostCurve) -> None:
+        """Init function
+
+        :param curve: lazy cost curve to evaluate
+        :return: None
+        """
+        casadi.Callback.__init__(self)
+        self._curve = curve
+        self.construct('cost_func', {'enable_fd': True})
+
+    def get_n_in(self) -> int:
+        """Get the number of inputs
+
+        :return: 1
+        """
+        return 1
+
+    def get_n_out(self) -> int:
+        """Get the number of outputs
+
+        :return: 1
+        """
+        return 1
+
+    def eval(self, arg: list) -> list:
+        """Evaluate the curve
+
+        :param arg: list with the crossing time
+        :return: list with the crossing cost
+        """
+        return [self._curve(float(arg[0]))]
+
+    @property
+    def spline(self):
+        """Get the spline through the points solved so far
+
+        Evaluating it never solves, unlike evaluating the callback.
+
+        :return: CasADi interpolant
+        """
+        return self._curve.spline
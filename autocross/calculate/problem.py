@@ -0,0 +1,214 @@
+"""Crossing problems shared between directions
+
+A vehicle's crossing problems for the left, right and straight
+movements differ only by the reference path they track. This module
+builds the problem of one horizon once, with the reference path and
+the crossing time as parameters, and solves every direction with the
+same dynamics, bounds and solver instance. Solving all movements of a
+vehicle then builds one problem per crossing time instead of one per
+crossing time and direction.
+"""
+# Standard library imports
+from typing import Final, Optional, Sequence
+
+# Third party imports
+import casadi
+
+# Local application imports
+from autocross import budgets
+from autocross import tracing
+from autocross.calculate import costs
+from autocross.calculate import curves
+from autocross.calculate import vehicle
+
+
+DIRECTIONS: Final[tuple] = ('straight', 'left', 'right')
+
+
+class CrossingProblem:
+    """Crossing problem of one horizon with a parametric reference path
+
+    """
+    def __init__(self, veh, num_samples: int,
+                 delta_t: float = curves.DELTA_T,
+                 sensitivity: bool = False,
+                 budget: Optional[budgets.Budget] = None,
+                 warm_start: bool = False) -> None:
+        """Init function
+
+        :param veh: vehicle object that will be crossing
+        :param num_samples: number of samples in the control horizon
+        :param delta_t: time delta between samples
+        :param sensitivity: also find the derivative of the cost with
+        respect to the crossing time, see
+        `costs.calculate_with_sensitivity`. The horizon then spans
+        exactly the crossing time.
+        :param budget: (optional) budget of every solve. The wall time
+        per solve is fixed when the problem is built, and the run
+        deadline is checked before every solve.
+        :param warm_start: solves start from library trajectories, so
+        start the barrier small like a warm-started standalone solve,
+        see `costs.calculate_with_reference`
+        :return: None
+        """
+        opti = casadi.Opti()
+
+        self._time = opti.parameter()
+        self._ref = opti.parameter(2, num_samples + 1)
+
+        self._states = opti.variable(veh.num_states, num_samples + 1)
+        self._inputs = opti.variable(veh.num_inputs, num_samples)
+
+        self._cost = costs.set_objective_with_ref(
+            opti, veh, self._states, self._inputs, self._time, self._ref)
+
+        sample_period = self._time / num_samples if sensitivity else delta_t
+        costs.discretize_rk4(opti, veh, self._states, self._inputs,
+                             num_samples, sample_period)
+
+        costs.set_bounds(opti, self._states, veh.state_bounds)
+        costs.set_bounds(opti, self._inputs, veh.input_bounds)
+
+        options = {
+            'ipopt.print_level': 0,  # Minimal printing
+            'ipopt.sb': 'yes'  # Silence banner header
+        }
+        if warm_start:
+            options['ipopt.mu_init'] = costs.WARM_START_MU_INIT
+        try:
+            options = budgets.solver_options(budget, options)
+        except budgets.BudgetExceeded:
+            # Past the deadline, every solve times out before starting
+            pass
+        opti.solver('ipopt', options)
+
+        self._slope = casadi.jacobian(
+            opti.f + casadi.dot(opti.lam_g, opti.g), self._time) \
+            if sensitivity else None
+
+        self._opti = opti
+        self._time_weight = veh.preferences.time
+        self._budget = budget
+
+    def solve(self, crossing_time: float, ref,
+              initial: Optional[tuple] = None) -> Optional[tuple]:
+        """Solve the problem for a crossing time and reference path
+
+        :param crossing_time: time vehicle has to cross the intersection
+        :param ref: reference path starting at the vehicle, with one
+        column per sample
+        :param initial: (optional) initial guess formatted as (states,
+        inputs). Defaults to the reference path.
+        :return: tuple formatted as (cost, states, inputs), or as (cost,
+        derivative of the cost along the sweep, states, inputs) with
+        sensitivity, or None if there is no solution. Raises
+        `budgets.BudgetExceeded` if the solve runs out of budget.
+        """
+        if self._budget is not None:
+            # Raises once the run deadline has passed
+            self._budget.solver_options()
+
+        opti = self._opti
+        opti.set_value(self._time, crossing_time)
+        opti.set_value(self._ref, ref)
+
+        # Earlier solves must not leak into the initial guess
+        opti.set_initial(self._states, 0)
+        opti.set_initial(self._inputs, 0)
+        costs.set_initial(opti, self._states, self._inputs, ref, initial)
+
+        try:
+            with tracing.span('solve', crossing_time=float(crossing_time)):
+                solution = opti.solve()
+        except RuntimeError:
+            budgets.check_status(opti.stats())
+            return None
+
+        cost = solution.value(self._cost)
+        states = solution.value(self._states)
+        inputs = solution.value(self._inputs)
+
+        if self._slope is None:
+            return cost, states, inputs
+
+        sample_cost = cost - self._time_weight * crossing_time
+        slope = solution.value(self._slope) + sample_cost / crossing_time
+
+        return cost, slope, states, inputs
+
+
+def calculate_direction_curves(vehicle_data: dict, times: Sequence,
+                               directions: Sequence = DIRECTIONS,
+                               delta_t: float = curves.DELTA_T,
+                               sensitivity: bool = False,
+                               library=None,
+                               budget: Optional[budgets.Budget] = None,
+                               fill: bool = False) -> dict:
+    """Calculate a vehicle's cost functions for several directions
+
+    One problem is built per crossing time and solved for every
+    direction.
+
+    :param vehicle_data: vehicle data as read from a vehicle file
+    :param times: crossing times to solve for
+    :param directions: directions to solve for
+    :param delta_t: time delta between samples
+    :param sensitivity: build cubic Hermite cost functions, see
+    `curves.calculate_cost_curves`
+    :param library: (optional) warm-start library, see
+    `curves.solve_crossing_time`
+    :param budget: (optional) budget of every solve
+    :param fill: fill in timed-out costs, see `curves.fill_timed_out`
+    :return: dict of cost curves indexed by direction
+    """
+    veh = vehicle.build_vehicle(vehicle_data)
+    results = {direction: {} for direction in directions}
+
+    for time in times:
+        num_samples = costs.get_horizon(time, delta_t=delta_t)
+
+        with tracing.span('build', crossing_time=float(time)):
+            problem = CrossingProblem(veh, num_samples, delta_t, sensitivity,
+                                      budget, library is not None)
+
+        for direction in directions:
+            results[direction][time] = _solve_direction(
+                problem, veh, time, num_samples, direction, library)
+
+    direction_curves = {}
+    for direction, direction_results in results.items():
+        if fill:
+            curves.fill_timed_out(times, direction_results)
+
+        cost_list = [result['cost'] for result in direction_results.values()]
+        slope_list = [result.get('slope')
+                      for result in direction_results.values()] \
+            if sensitivity else None
+
+        direction_curves[direction] = curves.CostCurves(
+            *curves.curves_from_costs(times, cost_list,
+                                      vehicle_data['wait_factor'],
+                                      slope_list),
+            direction_results)
+
+    return direction_curves
+
+
+def _solve_direction(problem: CrossingProblem, veh, time: float,
+                     num_samples: int, direction: str, library=None) -> dict:
+    """Solve a shared problem for one direction
+
+    :param problem: crossing problem of the horizon
+    :param veh: vehicle object that will be crossing
+    :param time: crossing time
+    :param num_samples: number of samples in the control horizon
+    :param direction: 'left', 'right', or anything else for straight
+    :param library: (optional) warm-start library
+    :return: solution formatted like `curves.solve_crossing_time`
+    """
+    ref, shifted_ref = curves.reference_path(direction, num_samples,
+                                             veh.state_bounds.initial)
+
+    return curves.collect_solution(
+        lambda initial: problem.solve(time, shifted_ref, initial),
+        veh, time, direction, num_samples, ref, library)
@@ -0,0 +1,237 @@
+"""Warm-start library of solved trajectories
+
+Every crossing problem starts IPOPT from the reference path, however
+often the same vehicle was solved before. This module keeps solved
+trajectories across runs, indexed by direction, horizon length and a
+feature vector of the vehicle, and starts each new solve from the
+nearest stored trajectory, resampled to the new horizon.
+
+Trajectories are stored relative to the vehicle's initial position,
+like in `calculate.canonical`, so they are shared between vehicles
+that differ only by position. The library holds a bounded number of
+trajectories and evicts the one that was used longest ago.
+"""
+# Standard library imports
+import collections
+import os
+from typing import Final, Optional
+
+# Third party imports
+import numpy as np
+
+# Local application imports
+from autocross import fileio
+from autocross.calculate import canonical
+from autocross.calculate import curves
+
+
+DEFAULT_MAX_ENTRIES: Final[int] = 512
+
+
+class WarmStartLibrary:
+    """Bounded library of solved trajectories
+
+    """
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES) -> None:
+        """Init function
+
+        :param max_entries: maximum number of stored trajectories, at
+        least 1
+        :return: None
+        """
+        assert max_entries >= 1, 'Library size must be at least 1'
+
+        self._entries = collections.OrderedDict()
+        self._max_entries = max_entries
+        self._hits = 0
+        self._misses = 0
+
+    @property
+    def hits(self) -> int:
+        """Get the number of solves that were warm-started
+
+        :return: number of warm-started solves
+        """
+        return self._hits
+
+    @property
+    def misses(self) -> int:
+        """Get the number of solves without a stored trajectory
+
+        :return: number of solves started from the reference path
+        """
+        return self._misses
+
+    def initial_guess(self, veh, direction: Optional[str],
+                      num_samples: int) -> Optional[tuple]:
+        """Get the initial trajectory for a solve
+
+        The nearest vehicle by features is chosen, and among its
+        trajectories the one with the nearest horizon.
+
+        :param veh: vehicle object that will be crossing
+        :param direction: 'left', 'right', or anything else for straight
+        :param num_samples: number of samples in the control horizon
+        :return: tuple formatted as (states, inputs) resampled to the
+        horizon and moved to the vehicle, or None if the library has no
+        trajectory for the direction
+        """
+        direction = curves.normalize_direction(direction)
+        features = vehicle_features(veh)
+
+        candidates = [key for key in self._entries
+                      if key[0] == direction
+                      and len(key[2]) == features.size]
+        if not candidates:
+            self._misses += 1
+            return None
+
+        key = min(candidates, key=lambda candidate: (
+            float(np.linalg.norm(np.asarray(candidate[2]) - features)),
+            abs(candidate[1] - num_samples)))
+        self._entries.move_to_end(key)
+        self._hits += 1
+
+        states, inputs = self._entries[key]
+        states = resample(states, num_samples + 1)
+        for index, position in enumerate(_position(veh)):
+            states[index, :] += position
+
+        return states, resample(inputs, num_samples)
+
+    def add(self, veh, direction: Optional[str], states: np.ndarray,
+            inputs: np.ndarray) -> None:
+        """Store a solved trajectory
+
+        A trajectory of the same vehicle, direction and horizon is
+        replaced.
+
+        :param veh: vehicle object that was solved
+        :param direction: 'left', 'right', or anything else for straight
+        :param states: solved states with one column per sample
+        :param inputs: solved inputs with one column per sample
+        :return: None
+        """
+        states = np.array(states, dtype=float, ndmin=2)
+        for index, position in enumerate(_position(veh)):
+            states[index, :] -= position
+
+        key = (curves.normalize_direction(direction), states.shape[1] - 1,
+               tuple(vehicle_features(veh)))
+        self._insert(key, states, np.array(inputs, dtype=float, ndmin=2))
+
+    def read(self, filepath: str) -> None:
+        """Add the trajectories of a library file
+
+        :param filepath: path to the library file. Nothing is read if
+        it does not exist.
+        :return: None
+        """
+        if not os.path.exists(filepath):
+            return
+
+        data = fileio.read_warm_start_file(filepath)
+        for direction, num_samples, features, states, inputs in zip(
+                data['directions'], data['num_samples'], data['features'],
+                data['states'], data['inputs']):
+            self._insert((direction, int(num_samples),
+                          tuple(float(value) for value in features)),
+                         states, inputs)
+
+    def write(self, filepath: str) -> None:
+        """Write the library to file, least recently used first
+
+        :param filepath: path to the library file to write
+        :return: None
+        """
+        keys = list(self._entries)
+
+        fileio.write_warm_start_file(
+            filepath, [key[0] for key in keys], [key[1] for key in keys],
+            [np.asarray(key[2]) for key in keys],
+            [self._entries[key][0] for key in keys],
+            [self._entries[key][1] for key in keys])
+
+    def _insert(self, key: tuple, states: np.ndarray,
+                inputs: np.ndarray) -> None:
+        """Store a trajectory as the most recently used
+
+        :param key: tuple formatted as (direction, number of samples,
+        features)
+        :param states: states relative to the initial position
+        :param inputs: inputs
+        :return: None
+        """
+        self._entries.pop(key, None)
+        self._entries[key] = (states, inputs)
+
+        if len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        """Get the number of stored trajectories
+
+        :return: number of stored trajectories
+        """
+        return len(self._entries)
+
+
+def vehicle_features(veh) -> np.ndarray:
+    """Get the feature vector of a vehicle
+
+    The features are the bounds, with positions relative to the initial
+    position, and the preference weights. Unbounded values count as 0.
+
+    :param veh: vehicle object
+    :return: array of features
+    """
+    position = _position(veh)
+    features = []
+
+    for bound in ('initial', 'final', 'upper', 'lower'):
+        values = list(getattr(veh.state_bounds, bound))
+        for index, offset in enumerate(position):
+            if values[index] is not None:
+                values[index] -= offset
+        features.extend(values)
+        features.extend(getattr(veh.input_bounds, bound))
+
+    features.extend(veh.preferences.state)
+    features.extend(veh.preferences.input)
+    features.append(veh.preferences.time)
+
+    return np.array([0.0 if value is None else float(value)
+                     for value in features])
+
+
+def resample(trajectory: np.ndarray, num_columns: int) -> np.ndarray:
+    """Resample a trajectory to another number of samples
+
+    Samples are spread evenly over the horizon and interpolated
+    linearly.
+
+    :param trajectory: array with one column per sample
+    :param num_columns: number of samples to resample to
+    :return: resampled array
+    """
+    trajectory = np.array(trajectory, dtype=float, ndmin=2)
+
+    if trajectory.shape[1] == num_columns:
+        return trajectory
+    if trajectory.shape[1] == 1:
+        return np.repeat(trajectory, num_columns, axis=1)
+
+    old = np.linspace(0, 1, trajectory.shape[1])
+    new = np.linspace(0, 1, num_columns)
+
+    return np.stack([np.interp(new, old, row) for row in trajectory])
+
+
+def _position(veh) -> tuple:
+    """Get the initial position of a vehicle
+
+    :param veh: vehicle object
+    :return: initial position, with None as 0
+    """
+    return tuple(value or 0.0 for value in
+                 veh.state_bounds.initial[:canonical.POSITION_STATES])
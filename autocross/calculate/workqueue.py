@@ -0,0 +1,413 @@
+"""File-based work queue
+
+This module distributes the per-time solves of `calculate` over any
+number of worker processes on any number of nodes that share a
+filesystem. No queue service is needed; all coordination is done with
+atomic renames.
+
+A queue directory contains a manifest and four task directories. The
+coordinator writes one task file per (vehicle, crossing time) into
+'pending'. A worker claims a task by renaming it into 'claimed' under
+its own worker ID, which only one worker can do. While it solves, the
+worker refreshes its lease by touching the claimed file. The result is
+written to a temporary file and renamed into 'results', so results
+appear complete or not at all. Claims whose lease has not been
+refreshed within the lease timeout are renamed back into 'pending' by
+any worker, so tasks of dead workers are retried. Finally, the reducer
+assembles every vehicle's cost functions from the results.
+
+Solving the same task twice yields the same result, so a task that is
+retried while its first worker is still alive is harmless.
+"""
+# Standard library imports
+import json
+import os
+import random
+import socket
+import threading
+import time
+import uuid
+from typing import Final, Optional, Sequence
+
+# Local application imports
+from autocross import fileio
+from autocross import tracing
+from autocross.calculate import canonical
+from autocross.calculate import compression
+from autocross.calculate import curves
+from autocross.calculate import vehicle
+
+
+MANIFEST_FILE: Final[str] = 'manifest.json'
+PENDING_DIR: Final[str] = 'pending'
+CLAIMED_DIR: Final[str] = 'claimed'
+RESULTS_DIR: Final[str] = 'results'
+TEMP_DIR: Final[str] = 'tmp'
+TASK_EXTENSION: Final[str] = '.task'
+LEASE_TIMEOUT: Final[float] = 60.0
+POLL_INTERVAL: Final[float] = 1.0
+
+
+def task_name(vid: int, time_index: int) -> str:
+    """Get the file name of a task
+
+    :param vid: vehicle ID
+    :param time_index: index of the crossing time
+    :return: task file name
+    """
+    return f'{vid:06d}_{time_index:04d}{TASK_EXTENSION}'
+
+
+def create_queue(queue_dir: str, vehicle_data: Sequence, names: Sequence,
+                 times: Sequence, directions: Optional[Sequence] = None,
+                 delta_t: float = curves.DELTA_T,
+                 lease_timeout: float = LEASE_TIMEOUT) -> int:
+    """Create a queue with one task per vehicle and crossing time
+
+    Vehicle data is stored in the manifest, so workers do not need
+    access to the vehicle files. Vehicles that differ only by their
+    position share cost functions, so tasks are only created for the
+    first of them.
+
+    :param queue_dir: queue directory, created if needed. Raises
+    ValueError if it exists and is not empty, so results of an earlier
+    queue are never reduced together with this one.
+    :param vehicle_data: list of vehicle data dicts
+    :param names: file names of the vehicles, indexed by vehicle ID
+    :param times: crossing times to solve for
+    :param directions: (optional) list of directions indexed by vehicle
+    ID. Defaults to straight.
+    :param delta_t: time delta between samples
+    :param lease_timeout: seconds after which an unrefreshed claim is
+    retried. Must be longer than a single solve.
+    :return: number of tasks
+    """
+    assert directions is None or len(directions) == len(vehicle_data), \
+        'Need one direction per vehicle'
+
+    if os.path.isdir(queue_dir) and os.listdir(queue_dir):
+        raise ValueError(f'Queue directory {queue_dir} is not empty')
+
+    for directory in (PENDING_DIR, CLAIMED_DIR, RESULTS_DIR, TEMP_DIR):
+        os.makedirs(os.path.join(queue_dir, directory), exist_ok=True)
+
+    directions = directions or [None] * len(vehicle_data)
+    times = [float(time) for time in times]
+    representatives = canonical.representatives(vehicle_data, directions)
+    unique = sorted(set(representatives))
+
+    _write_json(os.path.join(queue_dir, MANIFEST_FILE), {
+        'vehicles': list(vehicle_data),
+        'names': list(names),
+        'directions': list(directions),
+        'representatives': representatives,
+        'times': times,
+        'delta_t': delta_t,
+        'lease_timeout': lease_timeout
+    }, queue_dir)
+
+    for vid in unique:
+        for time_index in range(len(times)):
+            _write_json(os.path.join(queue_dir, PENDING_DIR,
+                                     task_name(vid, time_index)),
+                        {'vid': vid, 'time_index': time_index}, queue_dir)
+
+    return len(unique) * len(times)
+
+
+def read_manifest(queue_dir: str) -> dict:
+    """Read the manifest of a queue
+
+    :param queue_dir: queue directory
+    :return: dict of queue parameters
+    """
+    with open(os.path.join(queue_dir, MANIFEST_FILE)) as file:
+        return json.load(file)
+
+
+def queue_status(queue_dir: str) -> dict:
+    """Count the tasks of a queue by state
+
+    :param queue_dir: queue directory
+    :return: dict with the number of 'pending', 'claimed' and 'done'
+    tasks and their 'total'
+    """
+    manifest = read_manifest(queue_dir)
+
+    return {
+        'pending': len(os.listdir(os.path.join(queue_dir, PENDING_DIR))),
+        'claimed': len(os.listdir(os.path.join(queue_dir, CLAIMED_DIR))),
+        'done': len(os.listdir(os.path.join(queue_dir, RESULTS_DIR))),
+        'total': len(set(_representatives(manifest)))
+        * len(manifest['times'])
+    }
+
+
+def requeue_expired(queue_dir: str,
+                    lease_timeout: Optional[float] = None) -> int:
+    """Return claims with expired leases to the pending tasks
+
+    :param queue_dir: queue directory
+    :param lease_timeout: (optional) lease timeout in seconds. Defaults
+    to the queue's lease timeout.
+    :return: number of requeued tasks
+    """
+    if lease_timeout is None:
+        lease_timeout = read_manifest(queue_dir)['lease_timeout']
+
+    claimed_dir = os.path.join(queue_dir, CLAIMED_DIR)
+    now = time.time()
+    requeued = 0
+
+    for claim in os.listdir(claimed_dir):
+        claim_path = os.path.join(claimed_dir, claim)
+
+        try:
+            status = os.stat(claim_path)
+            # Renaming updates the change time, so a claim is fresh
+            # even before its worker touched it
+            if now - max(status.st_mtime, status.st_ctime) < lease_timeout:
+                continue
+
+            task = claim[:claim.index(TASK_EXTENSION)
+                         + len(TASK_EXTENSION)]
+            os.rename(claim_path, os.path.join(queue_dir, PENDING_DIR, task))
+            requeued += 1
+        except FileNotFoundError:
+            # Finished, or requeued by another worker
+            continue
+
+    return requeued
+
+
+def claim_task(queue_dir: str, worker_id: str) -> Optional[str]:
+    """Claim a pending task
+
+    Pending tasks are tried in random order to spread workers over the
+    queue.
+
+    :param queue_dir: queue directory
+    :param worker_id: ID of the claiming worker
+    :return: path of the claimed task file, or None if no task could be
+    claimed
+    """
+    pending_dir = os.path.join(queue_dir, PENDING_DIR)
+    tasks = os.listdir(pending_dir)
+    random.shuffle(tasks)
+
+    for task in tasks:
+        claim_path = os.path.join(queue_dir, CLAIMED_DIR,
+                                  f'{task}.{worker_id}')
+        try:
+            os.rename(os.path.join(pending_dir, task), claim_path)
+        except FileNotFoundError:
+            # Claimed by another worker first
+            continue
+
+        os.utime(claim_path)
+
+        return claim_path
+
+    return None
+
+
+def run_worker(queue_dir: str, worker_id: Optional[str] = None,
+               max_tasks: Optional[int] = None,
+               poll_interval: float = POLL_INTERVAL,
+               wait: bool = False) -> int:
+    """Solve tasks until the queue is exhausted
+
+    :param queue_dir: queue directory
+    :param worker_id: (optional) unique worker ID. Defaults to the host
+    name, process ID and a random suffix.
+    :param max_tasks: (optional) maximum number of tasks to solve
+    :param poll_interval: seconds to wait before polling again while
+    other workers hold claims
+    :param wait: keep polling until every task has a result, so that
+    tasks of workers that die are retried. Otherwise, stop as soon as
+    no task is pending.
+    :return: number of solved tasks
+    """
+    if worker_id is None:
+        worker_id = f'{socket.gethostname()}-{os.getpid()}-' \
+                    f'{uuid.uuid4().hex[:8]}'
+
+    manifest = read_manifest(queue_dir)
+    vehicles = {}
+    solved = 0
+
+    while max_tasks is None or solved < max_tasks:
+        requeue_expired(queue_dir, manifest['lease_timeout'])
+        claim_path = claim_task(queue_dir, worker_id)
+
+        if claim_path is None:
+            status = queue_status(queue_dir)
+
+            if not wait or status['done'] >= status['total']:
+                break
+
+            time.sleep(poll_interval)
+            continue
+
+        with open(claim_path) as file:
+            task = json.load(file)
+
+        result_path = os.path.join(queue_dir, RESULTS_DIR,
+                                   task_name(task['vid'], task['time_index']))
+
+        if not os.path.exists(result_path):
+            vid = task['vid']
+            if vid not in vehicles:
+                vehicles[vid] = vehicle.build_vehicle(
+                    manifest['vehicles'][vid])
+
+            with _Lease(claim_path, manifest['lease_timeout'] / 3):
+                result = curves.solve_crossing_time(
+                    vehicles[vid], manifest['times'][task['time_index']],
+                    manifest['directions'][vid], manifest['delta_t'])
+
+            _write_json(result_path, {**task, 'cost': result['cost']},
+                        queue_dir)
+            solved += 1
+
+        try:
+            os.remove(claim_path)
+        except FileNotFoundError:
+            # Lease expired and the task was requeued meanwhile
+            pass
+
+    return solved
+
+
+def reduce_queue(queue_dir: str, output_dir: str,
+                 max_error: Optional[float] = None) -> list:
+    """Assemble every vehicle's cost functions from the results
+
+    Cost and wait files are written as `calculate` writes them.
+
+    :param queue_dir: queue directory
+    :param output_dir: directory to write the cost and wait files to
+    :param max_error: (optional) compress the functions within this
+    maximum error
+    :return: list of written file paths
+    :raises: ValueError if not every task has a result
+    """
+    manifest = read_manifest(queue_dir)
+    num_times = len(manifest['times'])
+    representatives = _representatives(manifest)
+    solved = {vid: [None] * num_times for vid in set(representatives)}
+    missing = 0
+
+    for vid, cost_list in solved.items():
+        for time_index in range(num_times):
+            result_path = os.path.join(queue_dir, RESULTS_DIR,
+                                       task_name(vid, time_index))
+            try:
+                with open(result_path) as file:
+                    cost_list[time_index] = json.load(file)['cost']
+            except FileNotFoundError:
+                missing += 1
+
+    if missing:
+        raise ValueError(f'{missing} of {len(solved) * num_times} tasks '
+                         f'have no result yet')
+
+    costs = [solved[vid] for vid in representatives]
+
+    os.makedirs(output_dir, exist_ok=True)
+    paths = []
+
+    with tracing.span('reduce', num_vehicles=len(costs)):
+        for name, vehicle_data, cost_list in zip(manifest['names'],
+                                                 manifest['vehicles'], costs):
+            cost_func, cost_bounds, wait_func, wait_bounds = \
+                curves.curves_from_costs(manifest['times'], cost_list,
+                                         vehicle_data['wait_factor'])
+
+            if max_error is not None:
+                cost_func = compression.compress_curve(
+                    cost_func, cost_bounds, max_error).func
+                wait_func = compression.compress_curve(
+                    wait_func, wait_bounds, max_error, name='wait_func').func
+
+            paths.append(os.path.join(output_dir, f'{name}.cost'))
+            fileio.write_cost_file(paths[-1], cost_func, cost_bounds)
+            paths.append(os.path.join(output_dir, f'{name}.wait'))
+            fileio.write_cost_file(paths[-1], wait_func, wait_bounds)
+
+    return paths
+
+
+class _Lease:
+    """Background refresh of a claim's lease
+
+    """
+    def __init__(self, claim_path: str, interval: float) -> None:
+        """Init function
+
+        :param claim_path: path of the claimed task file
+        :param interval: seconds between refreshes
+        :return: None
+        """
+        self._claim_path = claim_path
+        self._interval = interval
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._refresh, daemon=True)
+
+    def __enter__(self) -> '_Lease':
+        """Start refreshing
+
+        :return: the lease
+        """
+        self._thread.start()
+        return self
+
+    def __exit__(self, *_) -> None:
+        """Stop refreshing
+
+        :return: None
+        """
+        self._stopped.set()
+        self._thread.join()
+
+    def _refresh(self) -> None:
+        """Touch the claim until stopped
+
+        :return: None
+        """
+        while not self._stopped.wait(self._interval):
+            try:
+                os.utime(self._claim_path)
+            except FileNotFoundError:
+                return
+
+
+def _representatives(manifest: dict) -> list:
+    """Get the representative vehicle IDs of a queue
+
+    :param manifest: queue parameters
+    :return: list of representative vehicle IDs indexed by vehicle ID.
+    Queues created without deduplication represent every vehicle by
+    itself.
+    """
+    return manifest.get('representatives',
+                        list(range(len(manifest['vehicles']))))
+
+
+def _write_json(filepath: str, data: dict, queue_dir: str) -> None:
+    """Write a JSON file atomically
+
+    The file is written to the queue's temporary directory and renamed
+    into place, so readers never see a partial file.
+
+    :param filepath: path of the file to write
+    :param data: data to write
+    :param queue_dir: queue directory
+    :return: None
+    """
+    temp_path = os.path.join(queue_dir, TEMP_DIR, uuid.uuid4().hex)
+
+    with open(temp_path, 'w') as file:
+        json.dump(data, file)
+
+    os.replace(temp_path, filepath)
@@ -13,6 +13,11 @@ import strings.cli as res
 
 _parser = argparse.ArgumentParser(prog=res.PROGRAM_NAME,
                                   description=res.PROGRAM_DESCRIPTION)
+_parser.add_argument(res.ARG_TRACE, type=str, help=res.ARG_TRACE_HELP)
+_parser.add_argument(res.ARG_PROFILE, action='store_true',
+                     help=res.ARG_PROFILE_HELP)
+_parser.add_argument(res.ARG_TRACE_MEMORY, res.ARG_TRACE_MEMORY_ALIAS,
+                     action='store_true', help=res.ARG_TRACE_MEMORY_HELP)
 _subparsers = _parser.add_subparsers(title=res.SUBPARSERS_TITLE,
                                      dest=res.SUBPARSERS_DEST,
                                      required=True)
@@ -24,6 +29,19 @@ _calculate_parser.add_argument(res.CALC_ARG_TIME_MIN, type=float)
 _calculate_parser.add_argument(res.CALC_ARG_TIME_MAX, type=float)
 _calculate_parser.add_argument(res.CALC_ARG_TIME_STEP, type=float)
 _calculate_parser.add_argument(res.CALC_ARG_DIRECTION, type=str)
+_calculate_parser.add_argument(res.CALC_ARG_MAX_ERROR, type=float)
+_calculate_parser.add_argument(res.CALC_ARG_HERMITE, action='store_true')
+_calculate_parser.add_argument(res.CALC_ARG_FLEET, type=str, nargs='+')
+_calculate_parser.add_argument(res.CALC_ARG_ALL_DIRECTIONS,
+                               action='store_true')
+_calculate_parser.add_argument(res.CALC_ARG_MAX_SOLVE_TIME, type=float)
+_calculate_parser.add_argument(res.CALC_ARG_MAX_ITER, type=int)
+_calculate_parser.add_argument(res.CALC_ARG_DEADLINE, type=float)
+_calculate_parser.add_argument(res.CALC_ARG_FILL_TIMEOUTS,
+                               action='store_true')
+_calculate_parser.add_argument(res.CALC_ARG_WARM_START_LIBRARY, type=str)
+_calculate_parser.add_argument(res.CALC_ARG_WARM_START_SIZE, type=int,
+                               default=512)
 
 _schedule_parser = _subparsers.add_parser(res.SCHED_PARSER_NAME,
                                           help=res.SCHED_PARSER_HELP)
@@ -31,23 +49,176 @@ _schedule_parser.add_argument(res.SCHED_ARG_SCHED_TYPE, type=str,
                               choices=[res.SCHED_TYPE_FCF,
                                        res.SCHED_TYPE_FCFS,
                                        res.SCHED_TYPE_RAND,
-                                       res.SCHED_TYPE_FIXED])
+                                       res.SCHED_TYPE_FIXED,
+                                       res.SCHED_TYPE_MERGE,
+                                       res.SCHED_TYPE_SWEEP])
 _schedule_parser.add_argument(res.SCHED_ARG_COST_FILES, type=str, nargs='*')
 _schedule_parser.add_argument(res.SCHED_ARG_OUTPUT_FILE, type=str)
 _schedule_parser.add_argument(res.SCHED_ARG_CROSS_SUM, type=float)
+_schedule_parser.add_argument(res.SCHED_ARG_WAIT_FILES, type=str, nargs='*')
+_schedule_parser.add_argument(res.SCHED_ARG_MOVEMENTS, type=str, nargs='*')
+_schedule_parser.add_argument(res.SCHED_ARG_CONFLICT_FILE, type=str)
+_schedule_parser.add_argument(res.SCHED_ARG_MONTE_CARLO, type=int)
+_schedule_parser.add_argument(res.SCHED_ARG_SEED, type=int)
+_schedule_parser.add_argument(res.SCHED_ARG_SLACK_PENALTY, type=float)
+_schedule_parser.add_argument(res.SCHED_ARG_SWEEP_MIN, type=float)
+_schedule_parser.add_argument(res.SCHED_ARG_SWEEP_MAX, type=float)
+_schedule_parser.add_argument(res.SCHED_ARG_SWEEP_STEPS, type=int, default=20)
+_schedule_parser.add_argument(res.SCHED_ARG_SWEEP_METHOD, type=str,
+                              default=res.SCHED_SWEEP_METHOD_WARM,
+                              choices=[res.SCHED_SWEEP_METHOD_WARM,
+                                       res.SCHED_SWEEP_METHOD_MULTIPLIER])
+_schedule_parser.add_argument(res.SCHED_ARG_CONVEXIFY, action='store_true')
+_schedule_parser.add_argument(res.SCHED_ARG_LAZY, action='store_true')
+_schedule_parser.add_argument(res.SCHED_ARG_TIME_MIN, type=float, default=1.0)
+_schedule_parser.add_argument(res.SCHED_ARG_TIME_MAX, type=float, default=20.0)
+_schedule_parser.add_argument(res.SCHED_ARG_TIME_STEP, type=float, default=1.0)
+_schedule_parser.add_argument(res.SCHED_ARG_LAZY_TOLERANCE, type=float,
+                              default=0.01)
+_schedule_parser.add_argument(res.SCHED_ARG_MAX_SOLVE_TIME, type=float)
+_schedule_parser.add_argument(res.SCHED_ARG_MAX_ITER, type=int)
+_schedule_parser.add_argument(res.SCHED_ARG_DEADLINE, type=float)
 
 _analyze_parser = _subparsers.add_parser(res.ANALYZE_PARSER_NAME,
                                          help=res.ANALYZE_PARSER_HELP)
-_analyze_parser.add_argument(res.ANALYZE_ARG_SCHED_FILE, type=str)
+_analyze_parser.add_argument(res.ANALYZE_ARG_SCHED_FILES, type=str, nargs='+')
 _analyze_parser.add_argument(res.ANALYZE_ARG_COST_FILEPATHS, type=str,
                              nargs='*')
 _analyze_parser.add_argument(res.ANALYZE_ARG_WAIT_FILEPATHS, type=str,
                              nargs='*')
+_analyze_parser.add_argument(res.ANALYZE_ARG_MOVEMENTS, type=str, nargs='*')
+_analyze_parser.add_argument(res.ANALYZE_ARG_CONFLICT_FILE, type=str)
+_analyze_parser.add_argument(res.ANALYZE_ARG_OUTPUT, type=str)
+_analyze_parser.add_argument(res.ANALYZE_ARG_WORKERS, type=int, default=1)
+_analyze_parser.add_argument(res.ANALYZE_ARG_DISTRIBUTION,
+                             action='store_true')
+_analyze_parser.add_argument(res.ANALYZE_ARG_STATS_FILE, type=str)
+_analyze_parser.add_argument(res.ANALYZE_ARG_MERGE_STATS, type=str, nargs='+')
 
 _plot_parser = _subparsers.add_parser(res.PLOT_PARSER_NAME,
                                       help=res.PLOT_PARSER_HELP)
 _plot_parser.add_argument(res.PLOT_ARG_FILEPATHS, type=str, nargs='*')
 _plot_parser.add_argument(res.PLOT_ARG_SCHED_FILE, type=str)
+_plot_parser.add_argument(res.PLOT_ARG_OUTPUT_DIR, type=str)
+_plot_parser.add_argument(res.PLOT_ARG_FORMAT, type=str, default='png')
+_plot_parser.add_argument(res.PLOT_ARG_WORKERS, type=int, default=1)
+_plot_parser.add_argument(res.PLOT_ARG_MAX_POINTS, type=int, default=2000)
+_plot_parser.add_argument(res.PLOT_ARG_DECIMATE, type=str,
+                          default=res.PLOT_DECIMATE_LTTB,
+                          choices=[res.PLOT_DECIMATE_LTTB,
+                                   res.PLOT_DECIMATE_MIN_MAX])
+
+_generate_parser = _subparsers.add_parser(res.GEN_PARSER_NAME,
+                                          help=res.GEN_PARSER_HELP)
+_generate_parser.add_argument(res.GEN_ARG_OUTPUT_DIR, type=str)
+_generate_parser.add_argument(res.GEN_ARG_NUM_VEHICLES, type=int,
+                              default=100)
+_generate_parser.add_argument(res.GEN_ARG_SEED, type=int, default=0)
+_generate_parser.add_argument(res.GEN_ARG_ARRIVAL_RATE, type=float,
+                              default=1.0)
+for _range_arg in (res.GEN_ARG_APPROACH, res.GEN_ARG_MAX_SPEED,
+                   res.GEN_ARG_TIME_WEIGHT, res.GEN_ARG_SPEED_WEIGHT,
+                   res.GEN_ARG_STEER_WEIGHT, res.GEN_ARG_WAIT_FACTOR):
+    _generate_parser.add_argument(_range_arg, type=float, nargs=2,
+                                  metavar=('LOW', 'HIGH'))
+_generate_parser.add_argument(res.GEN_ARG_SURROGATE, action='store_true')
+_generate_parser.add_argument(res.GEN_ARG_COST_FILES, action='store_true')
+_generate_parser.add_argument(res.GEN_ARG_NO_VEHICLE_FILES,
+                              action='store_true')
+_generate_parser.add_argument(res.GEN_ARG_TIME_MIN, type=float, default=1.0)
+_generate_parser.add_argument(res.GEN_ARG_TIME_MAX, type=float, default=20.0)
+_generate_parser.add_argument(res.GEN_ARG_TIME_STEP, type=float, default=0.5)
+
+_pipeline_parser = _subparsers.add_parser(res.PIPE_PARSER_NAME,
+                                          help=res.PIPE_PARSER_HELP)
+_pipeline_parser.add_argument(res.PIPE_ARG_VEHICLE_FILES, type=str, nargs='*')
+_pipeline_parser.add_argument(res.PIPE_ARG_COST_TABLE, type=str)
+_pipeline_parser.add_argument(res.PIPE_ARG_SCHED_TYPE, type=str,
+                              default=res.SCHED_TYPE_FCF,
+                              choices=[res.SCHED_TYPE_FCF,
+                                       res.SCHED_TYPE_FCFS,
+                                       res.SCHED_TYPE_RAND,
+                                       res.SCHED_TYPE_FIXED,
+                                       res.SCHED_TYPE_MERGE])
+_pipeline_parser.add_argument(res.PIPE_ARG_TIME_MIN, type=float, default=1.0)
+_pipeline_parser.add_argument(res.PIPE_ARG_TIME_MAX, type=float, default=20.0)
+_pipeline_parser.add_argument(res.PIPE_ARG_TIME_STEP, type=float, default=1.0)
+_pipeline_parser.add_argument(res.PIPE_ARG_MOVEMENTS, type=str, nargs='*')
+_pipeline_parser.add_argument(res.PIPE_ARG_ARRIVALS, type=str)
+_pipeline_parser.add_argument(res.PIPE_ARG_CONFLICT_FILE, type=str)
+_pipeline_parser.add_argument(res.PIPE_ARG_CROSS_SUM, type=float)
+_pipeline_parser.add_argument(res.PIPE_ARG_SLACK_PENALTY, type=float)
+_pipeline_parser.add_argument(res.PIPE_ARG_SEED, type=int)
+_pipeline_parser.add_argument(res.PIPE_ARG_OUTPUT_DIR, type=str)
+_pipeline_parser.add_argument(res.PIPE_ARG_WORKERS, type=int, default=1)
+_pipeline_parser.add_argument(res.PIPE_ARG_MAX_ERROR, type=float)
+_pipeline_parser.add_argument(res.PIPE_ARG_CONVEXIFY, action='store_true')
+
+_serve_parser = _subparsers.add_parser(res.SERVE_PARSER_NAME,
+                                       help=res.SERVE_PARSER_HELP)
+_serve_parser.add_argument(res.SERVE_ARG_HOST, type=str, default='127.0.0.1')
+_serve_parser.add_argument(res.SERVE_ARG_PORT, type=int, default=8765)
+_serve_parser.add_argument(res.SERVE_ARG_SOCKET, type=str)
+_serve_parser.add_argument(res.SERVE_ARG_CONFLICT_FILE, type=str)
+_serve_parser.add_argument(res.SERVE_ARG_CURVE_CACHE_SIZE, type=int,
+                           default=1024)
+_serve_parser.add_argument(res.SERVE_ARG_SOLVER_CACHE_SIZE, type=int,
+                           default=16)
+_serve_parser.add_argument(res.SERVE_ARG_PRELOAD, type=str, nargs='*')
+_serve_parser.add_argument(res.SERVE_ARG_VERBOSE, action='store_true')
+_serve_parser.add_argument(res.SERVE_ARG_ENABLE_COMMANDS,
+                           action='store_true')
+
+_queue_parser = _subparsers.add_parser(res.QUEUE_PARSER_NAME,
+                                       help=res.QUEUE_PARSER_HELP)
+_queue_parser.add_argument(res.QUEUE_ARG_ACTION, type=str,
+                           choices=[res.QUEUE_ACTION_CREATE,
+                                    res.QUEUE_ACTION_WORK,
+                                    res.QUEUE_ACTION_STATUS,
+                                    res.QUEUE_ACTION_REDUCE])
+_queue_parser.add_argument(res.QUEUE_ARG_QUEUE_DIR, type=str)
+_queue_parser.add_argument(res.QUEUE_ARG_VEHICLE_FILES, type=str, nargs='*')
+_queue_parser.add_argument(res.QUEUE_ARG_DIRECTIONS, type=str, nargs='*')
+_queue_parser.add_argument(res.QUEUE_ARG_TIME_MIN, type=float, default=1.0)
+_queue_parser.add_argument(res.QUEUE_ARG_TIME_MAX, type=float, default=20.0)
+_queue_parser.add_argument(res.QUEUE_ARG_TIME_STEP, type=float, default=1.0)
+_queue_parser.add_argument(res.QUEUE_ARG_LEASE_TIMEOUT, type=float,
+                           default=60.0)
+_queue_parser.add_argument(res.QUEUE_ARG_WORKER_ID, type=str)
+_queue_parser.add_argument(res.QUEUE_ARG_MAX_TASKS, type=int)
+_queue_parser.add_argument(res.QUEUE_ARG_POLL_INTERVAL, type=float,
+                           default=1.0)
+_queue_parser.add_argument(res.QUEUE_ARG_WAIT, action='store_true')
+_queue_parser.add_argument(res.QUEUE_ARG_WORKERS, type=int, default=1)
+_queue_parser.add_argument(res.QUEUE_ARG_OUTPUT_DIR, type=str)
+_queue_parser.add_argument(res.QUEUE_ARG_MAX_ERROR, type=float)
+
+_compress_parser = _subparsers.add_parser(res.COMP_PARSER_NAME,
+                                          help=res.COMP_PARSER_HELP)
+_compress_parser.add_argument(res.COMP_ARG_COST_FILES, type=str, nargs='+')
+_compress_parser.add_argument(res.COMP_ARG_MAX_ERROR, type=float,
+                              required=True)
+_compress_parser.add_argument(res.COMP_ARG_NUM_SAMPLES, type=int,
+                              default=400)
+_compress_parser.add_argument(res.COMP_ARG_OUTPUT_DIR, type=str)
+
+_atlas_parser = _subparsers.add_parser(res.ATLAS_PARSER_NAME,
+                                       help=res.ATLAS_PARSER_HELP)
+_atlas_parser.add_argument(res.ATLAS_ARG_ACTION, type=str,
+                           choices=[res.ATLAS_ACTION_BUILD,
+                                    res.ATLAS_ACTION_QUERY])
+_atlas_parser.add_argument(res.ATLAS_ARG_ATLAS_FILE, type=str)
+_atlas_parser.add_argument(res.ATLAS_ARG_VEHICLE_FILES, type=str, nargs='+')
+_atlas_parser.add_argument(res.ATLAS_ARG_AXIS, type=str, nargs=4,
+                           action='append',
+                           metavar=res.ATLAS_ARG_AXIS_METAVAR)
+_atlas_parser.add_argument(res.ATLAS_ARG_DIRECTIONS, type=str, nargs='*')
+_atlas_parser.add_argument(res.ATLAS_ARG_DIRECTION, type=str)
+_atlas_parser.add_argument(res.ATLAS_ARG_TIME_MIN, type=float, default=1.0)
+_atlas_parser.add_argument(res.ATLAS_ARG_TIME_MAX, type=float, default=20.0)
+_atlas_parser.add_argument(res.ATLAS_ARG_TIME_STEP, type=float, default=1.0)
+_atlas_parser.add_argument(res.ATLAS_ARG_WORKERS, type=int, default=1)
+_atlas_parser.add_argument(res.ATLAS_ARG_MAX_ERROR, type=float)
 
 
 # pylint: disable=E1136  # Suppress unsubscriptable error for type hints
@@ -57,4 +228,39 @@ def parse_args(argv: list[str]) -> argparse.Namespace:
     :param argv: list of commandline arguments
     :return: Namespace containing the parsed results
     """
-    return _parser.parse_args(argv)
+    args = _parser.parse_args(argv)
+    _check_args(args)
+
+    return args
+
+
+def _check_args(args: argparse.Namespace) -> None:
+    """Reject combinations of arguments that cannot work together
+
+    Exits through the subcommand parser's error like any other invalid
+    argument.
+
+    :param args: Namespace containing the parsed results
+    :return: None
+    """
+    command = getattr(args, res.SUBPARSERS_DEST, None)
+
+    if command == res.SERVE_PARSER_NAME:
+        # A traced server would keep every request's spans until it
+        # exits, and commands run from requests could not be traced
+        if args.trace is not None or args.profile or args.trace_memory:
+            _parser.error(res.SERVE_ERROR_INSTRUMENTATION)
+
+    if command == res.SCHED_PARSER_NAME:
+        # The multiplier sweep has no crossing sum to range over or
+        # soften, it traces the sums its multipliers lead to
+        if args.schedule_type == res.SCHED_TYPE_SWEEP \
+                and args.sweep_method == res.SCHED_SWEEP_METHOD_MULTIPLIER \
+                and (args.sweep_min is not None
+                     or args.sweep_max is not None
+                     or args.slack_penalty is not None):
+            _schedule_parser.error(res.SCHED_ERROR_MULTIPLIER)
+
+    if command == res.GEN_PARSER_NAME:
+        if args.cost_files and not args.surrogate:
+            _generate_parser.error(res.GEN_ERROR_COST_FILES)
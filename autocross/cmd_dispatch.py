@@ -2,8 +2,46 @@
 
 This module contains the command dispatcher.
 """
+import importlib
 from typing import Any
 from typing import Callable
+from typing import Optional
+
+from autocross import tracing
+
+
+class LazyHandler:
+    """Command handler imported on first use
+
+    The handler's module is only imported when the command is
+    dispatched, so commands do not pay for each other's imports.
+    """
+    def __init__(self, module: str, name: str, **kwargs) -> None:
+        """Init function
+
+        :param module: name of the module containing the handler
+        :param name: name of the handler within the module
+        :param kwargs: (optional) keyword arguments passed to the
+        handler along with the command arguments
+        :return: None
+        """
+        self._module = module
+        self._name = name
+        self._kwargs = kwargs
+        self._handler = None
+
+    def __call__(self, args: Any) -> int:
+        """Import the handler if needed and call it
+
+        :param args: command arguments
+        :return: exit code of called command
+        """
+        if self._handler is None:
+            with tracing.span(f'import {self._module}', 'import'):
+                module = importlib.import_module(self._module)
+            self._handler = getattr(module, self._name)
+
+        return self._handler(args, **self._kwargs)
 
 
 class CmdDispatcher:
@@ -38,11 +76,44 @@ class CmdDispatcher:
 
         self._registry[cmd] = handler
 
-    def dispatch(self, cmd: str, args: any) -> int:
+    def register_lazy_command(self, cmd: str, module: str, name: str,
+                              replace: bool = False, **kwargs) -> None:
+        """Register a command handler that is imported on dispatch
+
+        :param cmd: command name
+        :param module: name of the module containing the handler
+        :param name: name of the handler within the module
+        :param replace: replace any currently registered handler
+        :param kwargs: (optional) keyword arguments passed to the
+        handler along with the command arguments
+        :return: None
+        :raises: KeyError if replace is false and a handler is already
+        registered
+        """
+        self.register_command(cmd, LazyHandler(module, name, **kwargs),
+                              replace)
+
+    def dispatch(self, cmd: str, args: any,
+                 trace_file: Optional[str] = None, profile: bool = False,
+                 trace_memory: bool = False) -> int:
         """Dispatch a command to the registered handler
 
+        If any instrumentation is requested, the command runs inside a
+        `tracing.Tracer` and is recorded as the outermost span.
+
         :param cmd: command name
         :param args: command arguments
+        :param trace_file: (optional) path to write a Chrome trace of
+        the command's spans to
+        :param profile: profile the command with cProfile
+        :param trace_memory: track the command's memory allocations
         :return: exit code of called command
         """
-        return self._registry[cmd](args)
+        handler = self._registry[cmd]
+
+        if trace_file is None and not profile and not trace_memory:
+            return handler(args)
+
+        with tracing.Tracer(trace_file, profile, trace_memory), \
+                tracing.span(cmd, 'command'):
+            return handler(args)
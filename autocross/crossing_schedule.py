@@ -0,0 +1,264 @@
+"""Crossing schedule data structure
+
+This module contains the array-backed crossing schedule shared by the
+schedule, analyze and plot commands.
+"""
+# Standard library imports
+from typing import Optional, Sequence
+
+# Third party imports
+import numpy as np
+
+
+def slots_from_values(values) -> np.ndarray:
+    """Return non-decreasing crossing slots for the given values
+
+    Values are ordered along the last axis, so a 2-D array yields one
+    order per row. Ties keep their original order. For example, the
+    values [4, 6, 5] give the slots [0, 2, 1].
+
+    :param values: array of values to order
+    :return: array of crossing slots with the same shape as `values`
+    """
+    values = np.asarray(values)
+    permutation = np.argsort(values, axis=-1, kind='stable')
+
+    slots = np.empty_like(permutation)
+    np.put_along_axis(slots, permutation,
+                      np.arange(values.shape[-1]), axis=-1)
+
+    return slots
+
+
+class Schedule:
+    """Crossing schedule
+
+    A schedule holds, for every vehicle, its crossing slot and crossing
+    time as contiguous NumPy arrays indexed by vehicle ID. The inverse
+    permutation (vehicle ID per slot) and the start times are derived
+    on first use and cached. Unless start times are given explicitly,
+    vehicles are assumed to cross one at a time.
+    """
+    def __init__(self, crossing_order: Sequence, crossing_times: Sequence,
+                 start_times: Optional[Sequence] = None,
+                 movements: Optional[Sequence] = None) -> None:
+        """Init function
+
+        :param crossing_order: crossing slots where vehicle ID is based
+        on the position in the sequence
+        :param crossing_times: crossing times where vehicle ID is based
+        on the position in the sequence
+        :param start_times: (optional) start times where vehicle ID is
+        based on the position in the sequence. Defaults to serial
+        crossing in slot order.
+        :param movements: (optional) (lane, direction) tuples where
+        vehicle ID is based on the position in the sequence
+        :return: None
+        """
+        self._order = _read_only(crossing_order, np.int64)
+        self._times = _read_only(crossing_times, np.float64)
+
+        assert self._order.shape == self._times.shape
+
+        self._permutation = None
+        self._start_times = None
+        self._serial = start_times is None
+        self._movements = None if movements is None else list(movements)
+
+        if start_times is not None:
+            self._start_times = _read_only(start_times, np.float64)
+            assert self._start_times.shape == self._times.shape
+
+    @classmethod
+    def from_permutation(cls, permutation: Sequence,
+                         crossing_times: Sequence, **kwargs) -> 'Schedule':
+        """Create a schedule from the vehicle IDs in slot order
+
+        :param permutation: vehicle IDs where the crossing slot is based
+        on the position in the sequence
+        :param crossing_times: crossing times indexed by vehicle ID
+        :param kwargs: further arguments passed to the init function
+        :return: schedule
+        """
+        permutation = np.asarray(permutation, dtype=np.int64)
+
+        order = np.empty_like(permutation)
+        order[permutation] = np.arange(permutation.size)
+
+        schedule = cls(order, crossing_times, **kwargs)
+        schedule._permutation = _read_only(permutation, np.int64)
+
+        return schedule
+
+    @classmethod
+    def from_values(cls, values: Sequence, crossing_times: Sequence,
+                    **kwargs) -> 'Schedule':
+        """Create a schedule ordered by non-decreasing values
+
+        :param values: values indexed by vehicle ID, for example arrival
+        times or crossing times
+        :param crossing_times: crossing times indexed by vehicle ID
+        :param kwargs: further arguments passed to the init function
+        :return: schedule
+        """
+        return cls.from_permutation(np.argsort(values, kind='stable'),
+                                    crossing_times, **kwargs)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'Schedule':
+        """Create a schedule from schedule data
+
+        It is assumed that the dict contains the keys 'crossing_order'
+        and 'crossing_times'. The keys 'start_times' and 'movements'
+        are optional.
+
+        :param data: dict containing the crossing schedule data
+        :return: schedule
+        """
+        assert 'crossing_order' in data, \
+            "Key 'crossing_order' not found in data"
+        assert 'crossing_times' in data, \
+            "Key 'crossing_times' not found in data"
+
+        return cls(data['crossing_order'], data['crossing_times'],
+                   start_times=data.get('start_times'),
+                   movements=data.get('movements'))
+
+    def to_dict(self) -> dict:
+        """Return the schedule data as a dict
+
+        Start times are only included when they were given explicitly,
+        since serial start times can be derived from the order.
+
+        :return: dict containing the crossing schedule data
+        """
+        data = {
+            'crossing_order': self._order,
+            'crossing_times': self._times
+        }
+
+        if not self._serial:
+            data['start_times'] = self._start_times
+        if self._movements is not None:
+            data['movements'] = self._movements
+
+        return data
+
+    def with_start_times(self, start_times: Sequence) -> 'Schedule':
+        """Return a copy of the schedule with explicit start times
+
+        :param start_times: start times indexed by vehicle ID
+        :return: schedule sharing this schedule's order and times
+        """
+        schedule = Schedule(self._order, self._times, start_times,
+                            self._movements)
+        schedule._permutation = self._permutation
+
+        return schedule
+
+    @property
+    def num_vehicles(self) -> int:
+        """Get number of scheduled vehicles
+
+        :return: number of scheduled vehicles
+        """
+        return self._order.size
+
+    @property
+    def crossing_order(self) -> np.ndarray:
+        """Get crossing slots indexed by vehicle ID
+
+        :return: read-only array of crossing slots
+        """
+        return self._order
+
+    @property
+    def crossing_times(self) -> np.ndarray:
+        """Get crossing times indexed by vehicle ID
+
+        :return: read-only array of crossing times
+        """
+        return self._times
+
+    @property
+    def permutation(self) -> np.ndarray:
+        """Get vehicle IDs in crossing order
+
+        This is the inverse permutation of the crossing order.
+
+        :return: read-only array of vehicle IDs indexed by slot
+        """
+        if self._permutation is None:
+            self._permutation = _read_only(
+                np.argsort(self._order, kind='stable'), np.int64)
+
+        return self._permutation
+
+    @property
+    def start_times(self) -> np.ndarray:
+        """Get start times indexed by vehicle ID
+
+        :return: read-only array of start times
+        """
+        if self._start_times is None:
+            slot_times = self._times[self.permutation]
+            slot_starts = np.cumsum(slot_times) - slot_times
+
+            start_times = np.empty_like(slot_starts)
+            start_times[self.permutation] = slot_starts
+            self._start_times = _read_only(start_times, np.float64)
+
+        return self._start_times
+
+    @property
+    def movements(self) -> Optional[list]:
+        """Get vehicle movements
+
+        :return: list of (lane, direction) tuples indexed by vehicle ID,
+        or None if the schedule has no movements
+        """
+        return self._movements
+
+    @property
+    def is_serial(self) -> bool:
+        """Check whether vehicles cross one at a time
+
+        :return: True if start times are derived from the order
+        """
+        return self._serial
+
+    @property
+    def clearing_time(self) -> float:
+        """Get the time at which the last vehicle finishes crossing
+
+        :return: intersection clearing time
+        """
+        if self.num_vehicles == 0:
+            return 0.0
+
+        return float(np.max(self.start_times + self._times))
+
+    def __len__(self) -> int:
+        """Get number of scheduled vehicles
+
+        :return: number of scheduled vehicles
+        """
+        return self.num_vehicles
+
+
+def _read_only(values: Sequence, dtype) -> np.ndarray:
+    """Convert values to a contiguous read-only array
+
+    Arrays that are already read-only are shared instead of copied.
+
+    :param values: values to convert
+    :param dtype: array data type
+    :return: read-only array
+    """
+    array = np.ascontiguousarray(values, dtype=dtype).ravel()
+
+    if array.flags.writeable:
+        array = array.copy()
+        array.flags.writeable = False
+
+    return array
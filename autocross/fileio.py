@@ -1,10 +1,15 @@
 # Standard library imports
+import csv
 import pickle
 import os
 
 # Third party imports
+import numpy as np
 import yaml
 
+# Local application imports
+from autocross.crossing_schedule import Schedule
+
 
 def get_file_name(filepath: str) -> str:
     file = os.path.basename(filepath)
@@ -93,6 +98,23 @@ def read_vehicle_file(filepath: str) -> dict:
     return data
 
 
+def read_conflict_file(filepath: str) -> dict:
+    """Read movement conflict data from file
+
+    File is assumed to be in YAML format with a 'conflicts' key listing
+    pairs of conflicting movements.
+
+    :param filepath: path to the conflict file
+    :return: dict with the conflict data
+    """
+    with open(filepath, 'r') as file:
+        data = yaml.load(file, Loader=yaml.SafeLoader)
+
+    assert isinstance(data, dict)
+
+    return data
+
+
 def read_system_file(filepath: str) -> dict:
     with open(filepath, 'rb') as file:
         data = pickle.load(file)
@@ -120,16 +142,41 @@ def parse_system_data(data: dict) -> tuple:
     return data['states'], data['inputs']
 
 
-def write_schedule_file(filepath: str, order: list, times: list):
+def write_schedule_file(filepath: str, order: list, times: list, **kwargs):
     data = {
         'crossing_order': order,
-        'crossing_times': times
+        'crossing_times': times,
+        **kwargs
     }
 
     with open(filepath, 'wb') as file:
         pickle.dump(data, file)
 
 
+def write_schedule(filepath: str, schedule: Schedule) -> None:
+    """Write a crossing schedule to file
+
+    The schedule is stored as a dict of arrays, so files written by
+    this function can also be read with `read_schedule_file`.
+
+    :param filepath: path to the pickle file to write
+    :param schedule: crossing schedule to save
+    :return: None
+    """
+    with open(filepath, 'wb') as file:
+        pickle.dump(schedule.to_dict(), file,
+                    protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def read_schedule(filepath: str) -> Schedule:
+    """Read a crossing schedule from file
+
+    :param filepath: path to the pickle file containing the schedule
+    :return: crossing schedule
+    """
+    return Schedule.from_dict(read_schedule_file(filepath))
+
+
 def read_schedule_file(filepath: str) -> dict:
     """Read schedule data from file
 
@@ -162,3 +209,200 @@ def parse_schedule_data(data: dict) -> tuple:
     assert 'crossing_times' in data, "Key 'crossing_times' not found in data"
 
     return data['crossing_order'], data['crossing_times']
+
+
+def write_stats_file(filepath: str, stats) -> None:
+    """Write streaming metrics state to file
+
+    The state can be read back and merged with the metrics of other
+    shards of a run.
+
+    :param filepath: path to the pickle file to write
+    :param stats: metrics object to save
+    :return: None
+    """
+    with open(filepath, 'wb') as file:
+        pickle.dump(stats, file, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def read_stats_file(filepath: str):
+    """Read streaming metrics state from file
+
+    :param filepath: path to the pickle file containing the metrics
+    :return: metrics object
+    """
+    with open(filepath, 'rb') as file:
+        return pickle.load(file)
+
+
+def write_cost_table(filepath: str, times, costs, bounds,
+                     wait_factors) -> None:
+    """Write the crossing costs of many vehicles to one file
+
+    File is written in the NumPy npz format, which is much faster to
+    read and write than one pickled cost file per vehicle.
+
+    :param filepath: path to the npz file to write
+    :param times: array of grid times
+    :param costs: array of crossing costs with one row per vehicle
+    :param bounds: array of (lower, upper) cost bounds per vehicle
+    :param wait_factors: array of waiting costs per unit of time
+    :return: None
+    """
+    with open(filepath, 'wb') as file:
+        np.savez(file, times=times, costs=costs, bounds=bounds,
+                 wait_factors=wait_factors)
+
+
+def read_cost_table(filepath: str) -> dict:
+    """Read a cost table from file
+
+    :param filepath: path to the npz file containing the cost table
+    :return: dict with the 'times', 'costs', 'bounds' and
+    'wait_factors' arrays
+    """
+    with np.load(filepath) as data:
+        return {name: data[name] for name in data.files}
+
+
+def write_atlas_file(filepath: str, vehicle: str, axis_names, axis_values,
+                     directions, times, costs) -> None:
+    """Write a cost atlas to file
+
+    File is written in the compressed NumPy npz format. Costs are stored
+    in single precision.
+
+    :param filepath: path to the npz file to write
+    :param vehicle: vehicle data of the atlas type as JSON
+    :param axis_names: preference weight name per axis
+    :param axis_values: array of grid values per axis
+    :param directions: solved directions
+    :param times: array of solved crossing times
+    :param costs: array of costs indexed by direction, grid point and
+    time
+    :return: None
+    """
+    axes = {f'axis_{index}': values
+            for index, values in enumerate(axis_values)}
+
+    with open(filepath, 'wb') as file:
+        np.savez_compressed(file, vehicle=vehicle, axis_names=axis_names,
+                            directions=directions, times=times,
+                            costs=np.asarray(costs, dtype=np.float32),
+                            **axes)
+
+
+def read_atlas_file(filepath: str) -> dict:
+    """Read a cost atlas from file
+
+    :param filepath: path to the npz file containing the atlas
+    :return: dict with the 'vehicle' JSON, 'axis_names', 'axis_values',
+    'directions', 'times' and 'costs'
+    """
+    with np.load(filepath) as data:
+        axis_names = [str(name) for name in data['axis_names']]
+
+        return {
+            'vehicle': str(data['vehicle']),
+            'axis_names': axis_names,
+            'axis_values': [data[f'axis_{index}']
+                            for index in range(len(axis_names))],
+            'directions': [str(direction)
+                           for direction in data['directions']],
+            'times': data['times'],
+            'costs': data['costs']
+        }
+
+
+def write_warm_start_file(filepath: str, directions, num_samples, features,
+                          states, inputs) -> None:
+    """Write a warm-start library to file
+
+    File is written in the NumPy npz format, with one states and one
+    inputs array per trajectory.
+
+    :param filepath: path to the npz file to write
+    :param directions: direction per trajectory
+    :param num_samples: number of samples per trajectory
+    :param features: array of vehicle features per trajectory
+    :param states: array of states per trajectory
+    :param inputs: array of inputs per trajectory
+    :return: None
+    """
+    trajectories = {}
+    for index, (state, input_) in enumerate(zip(states, inputs)):
+        trajectories[f'features_{index}'] = features[index]
+        trajectories[f'states_{index}'] = state
+        trajectories[f'inputs_{index}'] = input_
+
+    with open(filepath, 'wb') as file:
+        np.savez(file, directions=np.asarray(directions, dtype=str),
+                 num_samples=np.asarray(num_samples, dtype=int),
+                 **trajectories)
+
+
+def read_warm_start_file(filepath: str) -> dict:
+    """Read a warm-start library from file
+
+    :param filepath: path to the npz file containing the library
+    :return: dict with lists of 'directions', 'num_samples',
+    'features', 'states' and 'inputs' indexed by trajectory
+    """
+    with np.load(filepath) as data:
+        num_entries = data['num_samples'].size
+
+        return {
+            'directions': [str(direction)
+                           for direction in data['directions']],
+            'num_samples': [int(num) for num in data['num_samples']],
+            'features': [data[f'features_{index}']
+                         for index in range(num_entries)],
+            'states': [data[f'states_{index}']
+                       for index in range(num_entries)],
+            'inputs': [data[f'inputs_{index}']
+                       for index in range(num_entries)]
+        }
+
+
+def write_arrivals_file(filepath: str, arrival_times, movements) -> None:
+    """Write an arrival sequence to file
+
+    File is written in CSV format with one row per vehicle.
+
+    :param filepath: path to the CSV file to write
+    :param arrival_times: arrival times indexed by vehicle ID
+    :param movements: 'lane:direction' strings indexed by vehicle ID
+    :return: None
+    """
+    with open(filepath, 'w', newline='') as file:
+        writer = csv.writer(file)
+        writer.writerow(('vehicle', 'arrival_time', 'movement'))
+        writer.writerows(zip(range(len(movements)),
+                             np.round(arrival_times, 6), movements))
+
+
+def read_arrivals_file(filepath: str) -> tuple:
+    """Read an arrival sequence from file
+
+    :param filepath: path to the CSV file containing the arrivals
+    :return: tuple formatted as (list of arrival times, list of
+    'lane:direction' strings), both indexed by vehicle ID
+    """
+    with open(filepath, newline='') as file:
+        rows = list(csv.DictReader(file))
+
+    return ([float(row['arrival_time']) for row in rows],
+            [row['movement'] for row in rows])
+
+
+def write_scenario_manifest(filepath: str, data: dict) -> None:
+    """Write scenario parameters to file
+
+    File is written in YAML format.
+
+    :param filepath: path to the manifest file
+    :param data: dict of scenario parameters
+    :return: None
+    """
+    with open(filepath, 'w') as file:
+        yaml.safe_dump(data, file, sort_keys=False)
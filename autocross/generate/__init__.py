@@ -0,0 +1 @@
+from .cmd_main import generate_main
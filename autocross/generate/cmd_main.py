@@ -0,0 +1,40 @@
+# Standard library imports
+import argparse
+import time
+
+# Third party imports
+import numpy as np
+
+# Local application imports
+from autocross.generate import scenario
+
+
+_RANGE_PARAMS = ('approach', 'max_speed', 'time_weight', 'speed_weight',
+                 'steer_weight', 'wait_factor')
+
+
+def generate_main(args: argparse.Namespace) -> int:
+    ranges = {name: tuple(getattr(args, name)) for name in _RANGE_PARAMS
+              if getattr(args, name) is not None}
+    params = scenario.ScenarioParams(num_vehicles=args.num_vehicles,
+                                     seed=args.seed,
+                                     arrival_rate=args.arrival_rate,
+                                     **ranges)
+
+    times = None
+    if args.surrogate:
+        times = np.arange(args.time_min, args.time_max + args.time_step / 2,
+                          args.time_step)
+
+    start = time.perf_counter()
+    paths = scenario.write_scenario(args.output_dir, params,
+                                    vehicle_files=not args.no_vehicle_files,
+                                    times=times,
+                                    cost_files=args.cost_files)
+    duration = time.perf_counter() - start
+
+    for name, path in paths.items():
+        print(f'{name}: {path}')
+    print(f'Generated {args.num_vehicles} vehicles in {duration:.3f} s')
+
+    return 0
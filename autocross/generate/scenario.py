@@ -0,0 +1,292 @@
+"""Synthetic scenario generation
+
+This module draws reproducible fleets of synthetic vehicles. All
+vehicle parameters are drawn at once as arrays from a single seeded
+generator, so a scenario is fully determined by its parameters and
+seed and large fleets are generated without per-vehicle Python work
+beyond formatting their files.
+
+Crossing costs can optionally be approximated by a closed-form
+surrogate instead of solving an optimal control problem per crossing
+time. A vehicle with weight `w_t` on crossing time, weights `w_v` and
+`w_s` on speed and steering inputs, path length `d` and turn angle
+`a` that crosses in time `T` at constant inputs has cost
+
+    w_t * T + w_v * d^2 / T + w_s * a^2 / T
+
+which is feasible for `T >= d / v_max`.
+"""
+# Standard library imports
+import math
+import os
+from dataclasses import asdict, dataclass, field
+from typing import Final, Optional
+
+# Third party imports
+import numpy as np
+import yaml
+
+# Local application imports
+from autocross import fileio
+from autocross.calculate import costs as calc_costs
+from autocross.schedule import conflicts
+
+
+LANES: Final[tuple] = conflicts.FOUR_WAY_LANES
+DIRECTIONS: Final[tuple] = (conflicts.DIRECTION_LEFT,
+                            conflicts.DIRECTION_STRAIGHT,
+                            conflicts.DIRECTION_RIGHT)
+
+# Path length through the intersection and heading change for each
+# direction, matching the reference paths used by `calculate`
+TURN_LENGTHS: Final[dict] = {
+    conflicts.DIRECTION_LEFT: math.pi / 2 * 10,
+    conflicts.DIRECTION_STRAIGHT: 10.0,
+    conflicts.DIRECTION_RIGHT: math.pi / 2 * 5
+}
+TURN_ANGLES: Final[dict] = {
+    conflicts.DIRECTION_LEFT: math.pi / 2,
+    conflicts.DIRECTION_STRAIGHT: 0.0,
+    conflicts.DIRECTION_RIGHT: math.pi / 2
+}
+
+VEHICLES_DIR: Final[str] = 'vehicles'
+COSTS_DIR: Final[str] = 'costs'
+VEHICLE_EXTENSION: Final[str] = '.vehicle'
+COST_TABLE_FILE: Final[str] = 'costs.npz'
+ARRIVALS_FILE: Final[str] = 'arrivals.csv'
+MANIFEST_FILE: Final[str] = 'scenario.yaml'
+
+_VEHICLE_TEMPLATE: Final[str] = '''---
+model:
+  type: unicycle
+  params: null
+
+state_bounds:
+  initial: [{start:.6f}, 0.0, 0.0]
+  final: [null, null, null]
+  upper: [null, null, null]
+  lower: [null, null, null]
+
+input_bounds:
+  initial: [null, null]
+  final: [null, null]
+  upper: [1.0, {max_speed:.6f}]
+  lower: [-1.0, 0.0]
+
+preferences:
+  state: [1.0, 1.0, 0.0]
+  input: [{steer_weight:.6f}, {speed_weight:.6f}]
+  time: {time_weight:.6f}
+
+wait_factor: {wait_factor:.6f}
+...
+'''
+
+
+@dataclass
+class ScenarioParams:
+    """Scenario distribution parameters
+
+    Ranges are (low, high) tuples of uniform distributions.
+    """
+    num_vehicles: int
+    """Number of vehicles"""
+    seed: int = 0
+    """Seed of the random generator"""
+    approach: tuple = (5.0, 30.0)
+    """Distance to the intersection"""
+    max_speed: tuple = (8.0, 15.0)
+    """Maximum speed"""
+    time_weight: tuple = (0.5, 2.0)
+    """Crossing time preference"""
+    speed_weight: tuple = (0.05, 0.2)
+    """Speed input preference"""
+    steer_weight: tuple = (0.5, 2.0)
+    """Steering input preference"""
+    wait_factor: tuple = (1.0, 3.0)
+    """Waiting cost per unit of time"""
+    arrival_rate: float = 1.0
+    """Mean number of arrivals per unit of time"""
+    lanes: tuple = LANES
+    """Lanes vehicles arrive in"""
+    directions: tuple = DIRECTIONS
+    """Directions vehicles cross in"""
+    direction_weights: tuple = field(default=(1.0, 1.0, 1.0))
+    """Relative frequency of each direction"""
+
+
+def sample_fleet(params: ScenarioParams) -> dict:
+    """Draw the parameters of every vehicle
+
+    Values are drawn in a fixed order from one generator, so the fleet
+    depends only on the parameters and the seed.
+
+    :param params: scenario parameters
+    :return: dict mapping parameter names to arrays indexed by vehicle
+    ID
+    """
+    generator = np.random.default_rng(params.seed)
+    size = params.num_vehicles
+
+    fleet = {name: generator.uniform(*getattr(params, name), size)
+             for name in ('approach', 'max_speed', 'time_weight',
+                          'speed_weight', 'steer_weight', 'wait_factor')}
+
+    fleet['arrival_time'] = np.cumsum(
+        generator.exponential(1 / params.arrival_rate, size))
+    fleet['lane'] = generator.integers(0, len(params.lanes), size)
+
+    weights = np.asarray(params.direction_weights, dtype=float)
+    fleet['direction'] = generator.choice(len(params.directions), size,
+                                          p=weights / weights.sum())
+
+    lengths = np.array([TURN_LENGTHS[direction]
+                        for direction in params.directions])
+    angles = np.array([TURN_ANGLES[direction]
+                       for direction in params.directions])
+    fleet['path_length'] = fleet['approach'] + lengths[fleet['direction']]
+    fleet['turn_angle'] = angles[fleet['direction']]
+
+    return fleet
+
+
+def surrogate_costs(fleet: dict, times: np.ndarray) -> tuple:
+    """Evaluate surrogate crossing costs on a time grid
+
+    :param fleet: vehicle parameters returned by `sample_fleet`
+    :param times: array of crossing times
+    :return: tuple formatted as (array of costs with one row per
+    vehicle, array of (lower, upper) cost bounds per vehicle). Raises
+    ValueError if a vehicle cannot cross before the second to last
+    time.
+    """
+    times = np.asarray(times, dtype=float)[np.newaxis, :]
+
+    effort = fleet['speed_weight'] * fleet['path_length'] ** 2 \
+        + fleet['steer_weight'] * fleet['turn_angle'] ** 2
+    costs = fleet['time_weight'][:, np.newaxis] * times \
+        + effort[:, np.newaxis] / times
+
+    # The lower bound is the first grid time at which the vehicle can
+    # cover its path at maximum speed, and a cost function needs at
+    # least two feasible grid times
+    min_times = fleet['path_length'] / fleet['max_speed']
+    index = np.searchsorted(times[0], min_times)
+    infeasible = np.flatnonzero(index > times.shape[1] - 2)
+    if infeasible.size:
+        raise ValueError(f'Vehicles {infeasible.tolist()} cannot cross '
+                         f'before the last time {times[0, -1]}, increase '
+                         f'the maximum crossing time')
+
+    lower = times[0, index]
+    bounds = np.column_stack((lower, np.full_like(lower, times[0, -1])))
+
+    return costs, bounds
+
+
+def movement_strings(fleet: dict, params: ScenarioParams) -> list:
+    """Format the movement of every vehicle
+
+    :param fleet: vehicle parameters returned by `sample_fleet`
+    :param params: scenario parameters
+    :return: list of 'lane:direction' strings indexed by vehicle ID
+    """
+    return [conflicts.format_movement((params.lanes[lane],
+                                       params.directions[direction]))
+            for lane, direction in zip(fleet['lane'], fleet['direction'])]
+
+
+def format_vehicle(fleet: dict, vid: int) -> str:
+    """Format a vehicle file
+
+    :param fleet: vehicle parameters returned by `sample_fleet`
+    :param vid: vehicle ID
+    :return: YAML vehicle file contents readable by `calculate`
+    """
+    return _VEHICLE_TEMPLATE.format(start=-fleet['approach'][vid],
+                                    max_speed=fleet['max_speed'][vid],
+                                    steer_weight=fleet['steer_weight'][vid],
+                                    speed_weight=fleet['speed_weight'][vid],
+                                    time_weight=fleet['time_weight'][vid],
+                                    wait_factor=fleet['wait_factor'][vid])
+
+
+def vehicle_data(fleet: dict, vid: int) -> dict:
+    """Get the vehicle data of a vehicle without writing its file
+
+    :param fleet: vehicle parameters returned by `sample_fleet`
+    :param vid: vehicle ID
+    :return: dict with the vehicle data, as `fileio.read_vehicle_file`
+    returns it for the formatted vehicle file
+    """
+    return yaml.load(format_vehicle(fleet, vid), Loader=yaml.SafeLoader)
+
+
+def write_scenario(output_dir: str, params: ScenarioParams,
+                   vehicle_files: bool = True,
+                   times: Optional[np.ndarray] = None,
+                   cost_files: bool = False) -> dict:
+    """Generate a scenario and write it to a directory
+
+    The directory receives a manifest of the parameters, the arrival
+    sequence and, optionally, one vehicle file per vehicle. If a time
+    grid is given, surrogate costs of all vehicles are written in bulk
+    to a single cost table, and optionally also as individual cost and
+    wait files usable by `schedule` and `analyze`.
+
+    :param output_dir: directory to write to
+    :param params: scenario parameters
+    :param vehicle_files: write one vehicle file per vehicle
+    :param times: (optional) time grid of the surrogate costs
+    :param cost_files: write individual cost and wait files, which is
+    much slower than the cost table for large fleets
+    :return: dict mapping output names to written paths
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    fleet = sample_fleet(params)
+    width = len(str(max(params.num_vehicles - 1, 0)))
+    names = [f'{vid:0{width}d}' for vid in range(params.num_vehicles)]
+    paths = {}
+
+    paths['manifest'] = os.path.join(output_dir, MANIFEST_FILE)
+    fileio.write_scenario_manifest(paths['manifest'], {
+        name: list(value) if isinstance(value, tuple) else value
+        for name, value in asdict(params).items()})
+
+    paths['arrivals'] = os.path.join(output_dir, ARRIVALS_FILE)
+    fileio.write_arrivals_file(paths['arrivals'], fleet['arrival_time'],
+                               movement_strings(fleet, params))
+
+    if vehicle_files:
+        paths['vehicles'] = os.path.join(output_dir, VEHICLES_DIR)
+        os.makedirs(paths['vehicles'], exist_ok=True)
+
+        for vid, name in enumerate(names):
+            with open(os.path.join(paths['vehicles'],
+                                   f'{name}{VEHICLE_EXTENSION}'), 'w') as file:
+                file.write(format_vehicle(fleet, vid))
+
+    if times is not None:
+        costs, bounds = surrogate_costs(fleet, times)
+
+        paths['cost_table'] = os.path.join(output_dir, COST_TABLE_FILE)
+        fileio.write_cost_table(paths['cost_table'], times, costs, bounds,
+                                fleet['wait_factor'])
+
+        if cost_files:
+            paths['costs'] = os.path.join(output_dir, COSTS_DIR)
+            os.makedirs(paths['costs'], exist_ok=True)
+
+            splines = calc_costs.cost_table_to_splines(times, costs, bounds,
+                                                       fleet['wait_factor'])
+            for name, cost_func, cost_bound, wait_func in zip(names,
+                                                              *splines):
+                fileio.write_cost_file(
+                    os.path.join(paths['costs'], f'{name}.cost'),
+                    cost_func, cost_bound)
+                fileio.write_cost_file(
+                    os.path.join(paths['costs'], f'{name}.wait'),
+                    wait_func, cost_bound)
+
+    return paths
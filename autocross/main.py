@@ -6,11 +6,7 @@
 import sys
 
 # Local application imports
-import analyze
-import calculate
 import cli
-import plot
-import schedule
 from cmd_dispatch import CmdDispatcher
 
 
@@ -21,14 +17,27 @@ def _main(argv: list[str]) -> int:
     :param argv: commandline arguments
     :return: 0 for normal exist, non-zero otherwise
     """
+    # Subcommand packages are only imported when their command runs
     dispatcher = CmdDispatcher()
-    dispatcher.register_command('analyze', analyze.analyze_main)
-    dispatcher.register_command('calculate', calculate.calculate_main)
-    dispatcher.register_command('plot', plot.plot_main)
-    dispatcher.register_command('schedule', schedule.schedule_main)
+    dispatcher.register_lazy_command('analyze', 'analyze', 'analyze_main')
+    dispatcher.register_lazy_command('atlas', 'atlas', 'atlas_main')
+    dispatcher.register_lazy_command('calculate', 'calculate',
+                                     'calculate_main')
+    dispatcher.register_lazy_command('compress', 'calculate',
+                                     'compress_main')
+    dispatcher.register_lazy_command('generate', 'generate', 'generate_main')
+    dispatcher.register_lazy_command('pipeline', 'pipeline', 'pipeline_main')
+    dispatcher.register_lazy_command('plot', 'plot', 'plot_main')
+    dispatcher.register_lazy_command('queue', 'calculate', 'queue_main')
+    dispatcher.register_lazy_command('schedule', 'schedule', 'schedule_main')
+    dispatcher.register_lazy_command('serve', 'serve', 'serve_main',
+                                     dispatcher=dispatcher,
+                                     parse_args=cli.parse_args)
 
     args = cli.parse_args(argv)
-    dispatcher.dispatch(args.command, args)
+    dispatcher.dispatch(args.command, args, trace_file=args.trace,
+                        profile=args.profile,
+                        trace_memory=args.trace_memory)
 
     return 0
 
@@ -0,0 +1 @@
+from .cmd_main import pipeline_main
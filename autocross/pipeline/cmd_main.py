@@ -0,0 +1,77 @@
+# Standard library imports
+import argparse
+import functools
+
+# Third party imports
+import numpy as np
+
+# Local application imports
+from autocross import fileio
+from autocross.pipeline import stages
+from autocross.schedule import conflicts
+from autocross.schedule import convex
+
+
+def pipeline_main(args: argparse.Namespace) -> int:
+    timings = {}
+    arrival_times = None
+    movements = [conflicts.parse_movement(movement)
+                 for movement in args.movements or []]
+
+    with stages.timed(timings, 'load'):
+        if args.arrivals:
+            arrival_times, movement_strings = \
+                fileio.read_arrivals_file(args.arrivals)
+            movements = [conflicts.parse_movement(movement)
+                         for movement in movement_strings]
+
+        conflict_graph = conflicts.load_conflict_graph(args.conflict_file) \
+            if movements else None
+
+        if args.cost_table:
+            fleet_source = stages.fleet_from_cost_table(
+                fileio.read_cost_table(args.cost_table))
+            names = [f'{vid}' for vid in range(len(fleet_source.cost_funcs))]
+        else:
+            vehicle_data = [fileio.read_vehicle_file(filepath)
+                            for filepath in args.vehicle_files]
+            names = [fileio.get_file_name(filepath)
+                     for filepath in args.vehicle_files]
+            times = np.arange(args.time_min, args.time_max + 1,
+                              args.time_step)
+            directions = [direction for _, direction in movements] or None
+            fleet_source = functools.partial(stages.calculate_fleet,
+                                             vehicle_data, times, directions,
+                                             args.workers)
+
+    kwargs = dict()
+
+    if args.cross_sum is not None:
+        kwargs['cross_sum'] = args.cross_sum
+
+    if args.slack_penalty is not None:
+        kwargs['slack_penalty'] = args.slack_penalty
+
+    result = stages.run_pipeline(fleet_source, args.schedule_type, movements,
+                                 conflict_graph, arrival_times, args.seed,
+                                 timings, args.max_error, args.convexify,
+                                 **kwargs)
+
+    if args.output_dir:
+        with stages.timed(result.timings, 'write'):
+            stages.write_artifacts(args.output_dir, result, names,
+                                   args.schedule_type)
+
+    for name, curve in zip(names, result.convex_curves or []):
+        print(convex.format_deviation(name, curve))
+
+    print(f'crossing order: {result.schedule.crossing_order.tolist()}')
+    print(f'crossing times: {result.schedule.crossing_times.tolist()}')
+    for name, value in result.analysis.items():
+        print(f"{name.replace('_', ' ')}: {value}")
+
+    for stage, duration in result.timings.items():
+        print(f'{stage} time: {duration:.3f} s')
+    print(f'total time: {sum(result.timings.values()):.3f} s')
+
+    return 0
@@ -0,0 +1,247 @@
+"""In-memory pipeline stages
+
+This module runs the calculate, schedule and analyze stages in one
+process, handing cost functions and schedules from stage to stage as
+objects instead of files. Writing the intermediate files is optional.
+"""
+# Standard library imports
+import concurrent.futures
+import contextlib
+import json
+import os
+import time
+from typing import Final, NamedTuple, Optional, Sequence
+
+# Local application imports
+from autocross import fileio
+from autocross import tracing
+from autocross.analyze import batch
+from autocross.calculate import canonical
+from autocross.calculate import compression
+from autocross.calculate import costs
+from autocross.calculate import curves
+from autocross.crossing_schedule import Schedule
+from autocross.schedule import build
+from autocross.schedule import convex
+
+
+ANALYSIS_FILE: Final[str] = 'analysis.json'
+
+
+class PipelineResult(NamedTuple):
+    """Outputs of a pipeline run
+
+    """
+    fleet: batch.Fleet
+    """Cost functions of the fleet"""
+    schedule: Schedule
+    """Crossing schedule"""
+    analysis: dict
+    """Schedule, wait and crossing cost and clearing time"""
+    timings: dict
+    """Wall time in seconds per stage, in run order"""
+    convex_curves: Optional[list] = None
+    """Convex envelopes of the cost functions, if convexified"""
+
+
+@contextlib.contextmanager
+def timed(timings: dict, stage: str):
+    """Record the wall time of a block
+
+    Times of repeated stages are accumulated. The block is also
+    recorded as a trace span.
+
+    :param timings: dict mapping stage names to seconds
+    :param stage: stage name
+    """
+    start = time.perf_counter()
+    try:
+        with tracing.span(stage):
+            yield
+    finally:
+        timings[stage] = timings.get(stage, 0.0) \
+            + time.perf_counter() - start
+
+
+def calculate_fleet(vehicle_data: Sequence, times: Sequence,
+                    directions: Optional[Sequence] = None,
+                    workers: int = 1) -> batch.Fleet:
+    """Calculate the cost functions of every vehicle
+
+    Vehicles that differ only by their position share cost functions,
+    so each distinct vehicle is solved once.
+
+    :param vehicle_data: list of vehicle data dicts
+    :param times: crossing times to solve for
+    :param directions: (optional) list of directions indexed by vehicle
+    ID. Defaults to straight.
+    :param workers: number of worker processes
+    :return: cost functions of the fleet
+    """
+    directions = directions or [None] * len(vehicle_data)
+    representatives = canonical.representatives(vehicle_data, directions)
+    unique = sorted(set(representatives))
+    tasks = [(canonical.canonicalize(vehicle_data[vid])[0], times,
+              directions[vid]) for vid in unique]
+
+    if workers > 1 and len(tasks) > 1:
+        with concurrent.futures.ProcessPoolExecutor(
+                max_workers=workers) as executor:
+            results = list(executor.map(_calculate_task, tasks))
+    else:
+        results = [_calculate_task(task) for task in tasks]
+
+    solved = dict(zip(unique, results))
+    cost_funcs = [solved[vid].cost_func for vid in representatives]
+    cost_bounds = [solved[vid].cost_bounds for vid in representatives]
+    wait_funcs, wait_bounds = zip(*[
+        curves.wait_curve(bounds, data['wait_factor'])
+        for bounds, data in zip(cost_bounds, vehicle_data)])
+
+    return batch.Fleet(cost_funcs, cost_bounds, list(wait_funcs),
+                       list(wait_bounds))
+
+
+def fleet_from_cost_table(table: dict) -> batch.Fleet:
+    """Create the cost functions of a fleet from a cost table
+
+    :param table: cost table as returned by `fileio.read_cost_table`
+    :return: cost functions of the fleet
+    """
+    cost_funcs, cost_bounds, wait_funcs = costs.cost_table_to_splines(
+        table['times'], table['costs'], table['bounds'],
+        table['wait_factors'])
+
+    return batch.Fleet(cost_funcs, cost_bounds, wait_funcs, cost_bounds)
+
+
+def compress_fleet(fleet: batch.Fleet, max_error: float) -> batch.Fleet:
+    """Compress the cost functions of every vehicle
+
+    :param fleet: cost functions of the fleet
+    :param max_error: maximum absolute error of the compressed functions
+    :return: fleet with the compressed functions
+    """
+    cost_funcs = [compression.compress_curve(func, bounds, max_error).func
+                  for func, bounds in zip(fleet.cost_funcs,
+                                          fleet.cost_bounds)]
+    wait_funcs = [compression.compress_curve(func, bounds, max_error,
+                                             name='wait_func').func
+                  for func, bounds in zip(fleet.wait_funcs,
+                                          fleet.wait_bounds)]
+
+    return fleet._replace(cost_funcs=cost_funcs, wait_funcs=wait_funcs)
+
+
+def run_pipeline(fleet_source, schedule_type: str,
+                 movements: Optional[Sequence] = None,
+                 conflict_graph: Optional[dict] = None,
+                 arrival_times: Optional[Sequence] = None,
+                 seed: Optional[int] = None,
+                 timings: Optional[dict] = None,
+                 max_error: Optional[float] = None,
+                 convexify: bool = False,
+                 **kwargs) -> PipelineResult:
+    """Schedule and analyze a fleet in memory
+
+    :param fleet_source: either a `batch.Fleet`, or a callable without
+    arguments returning one. A callable is timed as the 'calculate'
+    stage.
+    :param schedule_type: one of 'fcf', 'fcfs', 'rand', 'fixed' or
+    'merge'
+    :param movements: (optional) list of (lane, direction) tuples
+    :param conflict_graph: (optional) conflict graph for `movements`
+    :param arrival_times: (optional) arrival times used by 'fcfs'
+    :param seed: (optional) seed for random orders
+    :param timings: (optional) dict of earlier stage timings to extend
+    :param max_error: (optional) compress the cost functions within
+    this maximum error before scheduling, timed as the 'compress' stage
+    :param convexify: assign crossing times on the lower convex
+    envelopes of the cost functions, timed as the 'convexify' stage
+    :param kwargs: (optional) 'cross_sum' and 'slack_penalty' passed to
+    the crossing time assignment
+    :return: pipeline outputs
+    """
+    timings = dict(timings or {})
+
+    if callable(fleet_source):
+        with timed(timings, 'calculate'):
+            fleet = fleet_source()
+    else:
+        fleet = fleet_source
+
+    if max_error is not None:
+        with timed(timings, 'compress'):
+            fleet = compress_fleet(fleet, max_error)
+
+    convex_curves = None
+    cross_times = None
+
+    if convexify:
+        with timed(timings, 'convexify'):
+            convex_curves = convex.convexify_curves(fleet.cost_funcs,
+                                                    fleet.cost_bounds)
+
+    with timed(timings, 'schedule'):
+        if convex_curves is not None:
+            cross_times = convex.assign_convex_crossing_times(
+                convex_curves, **(kwargs if schedule_type == 'fcf' else {}))
+
+        schedule = build.build_schedule(schedule_type, fleet.cost_funcs,
+                                        fleet.cost_bounds, fleet.wait_funcs,
+                                        fleet.wait_bounds, movements,
+                                        conflict_graph, arrival_times, seed,
+                                        cross_times, **kwargs)
+
+    with timed(timings, 'analyze'):
+        analysis = batch.evaluate_schedules([schedule], fleet.cost_funcs,
+                                            fleet.wait_funcs)[0]
+
+    return PipelineResult(fleet, schedule, analysis, timings, convex_curves)
+
+
+def write_artifacts(output_dir: str, result: PipelineResult,
+                    names: Sequence, schedule_type: str) -> None:
+    """Write the intermediate and final results of a pipeline run
+
+    Cost and wait files are written as `calculate` writes them, the
+    schedule as `schedule` writes it, and the analysis as JSON.
+
+    :param output_dir: directory to write to
+    :param result: pipeline outputs
+    :param names: file names of the vehicles, indexed by vehicle ID
+    :param schedule_type: schedule type, used in the schedule file name
+    :return: None
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    fleet = result.fleet
+
+    for name, cost_func, cost_bounds, wait_func, wait_bounds in zip(
+            names, *fleet):
+        fileio.write_cost_file(os.path.join(output_dir, f'{name}.cost'),
+                               cost_func, cost_bounds)
+        fileio.write_cost_file(os.path.join(output_dir, f'{name}.wait'),
+                               wait_func, wait_bounds)
+
+    fileio.write_schedule(os.path.join(output_dir,
+                                       f'schedule.{schedule_type}'),
+                          result.schedule)
+
+    with open(os.path.join(output_dir, ANALYSIS_FILE), 'w') as file:
+        json.dump({**result.analysis, 'timings': result.timings}, file,
+                  indent=2)
+
+
+def _calculate_task(task: tuple) -> curves.CostCurves:
+    """Calculate the cost functions of one vehicle
+
+    Solutions per crossing time are dropped so that only the functions
+    are sent back from worker processes.
+
+    :param task: tuple formatted as (vehicle data, times, direction)
+    :return: cost curves without solutions
+    """
+    vehicle_data, times, direction = task
+
+    return curves.calculate_cost_curves(vehicle_data, times,
+                                        direction)._replace(results={})
@@ -1,12 +1,11 @@
 # Standard library imports
 import argparse
-
-# Third party imports
-import matplotlib.pyplot as plt
-import numpy as np
+import os
 
 # Local application imports
 from autocross import fileio
+from autocross.plot import decimate
+from autocross.plot import render
 
 
 def plot_main(args: argparse.Namespace) -> int:
@@ -15,31 +14,42 @@ def plot_main(args: argparse.Namespace) -> int:
     else:
         extension = fileio.get_file_extension(args.filepaths)
 
+    crossing_times = None
+    if args.schedule is not None:
+        crossing_times = fileio.read_schedule(args.schedule).crossing_times
+
+    if args.output_dir is not None:
+        render.render_files(args.filepaths, args.output_dir, args.format,
+                            args.workers, crossing_times, args.max_points,
+                            args.decimate)
+        return 0
+
+    # Third party imports
+    import matplotlib.pyplot as plt  # pylint: disable=C0415
+
     if extension == '.cost' or extension == '.wait':
         plt.figure()
 
-        if args.schedule is not None:
-            sched_data = fileio.read_schedule_file(args.schedule)
-            _, crossing_times = fileio.parse_schedule_data(sched_data)
+        cost_data = [fileio.parse_cost_data(fileio.read_cost_file(file))
+                     for file in args.filepaths]
+        grid = render.time_grid([bounds for _, bounds in cost_data],
+                                max_points=args.max_points)
 
         for index, file in enumerate(args.filepaths):
             filename = fileio.get_file_name(file)
-            cost_data = fileio.read_cost_file(file)
-            cost_func, cost_bounds = fileio.parse_cost_data(cost_data)
+            cost_func, cost_bounds = cost_data[index]
 
-            times = np.arange(start=cost_bounds[0], stop=cost_bounds[1],
-                              step=0.1)
+            times, costs, crossing_cost = render.evaluate_curve(
+                cost_func, cost_bounds, grid,
+                None if crossing_times is None else crossing_times[index])
 
-            plt.plot(times, cost_func(times), label=filename)
+            plt.plot(times, costs, label=filename)
 
-            from pathlib import Path
-            out_path = Path(args.filepaths[0])
-            out_data = [[time, cost] for time, cost in zip(times, np.squeeze(np.asarray(cost_func(times), dtype=object)))]
-            np.savetxt(f'{out_path.name}.dat', out_data, header='time cost', comments='')
+            render.write_curve_data(f'{os.path.basename(file)}.dat',
+                                    times, costs)
 
-            if args.schedule is not None:
-                plt.plot(crossing_times[index],
-                         cost_func(crossing_times[index]),
+            if crossing_cost is not None:
+                plt.plot(crossing_times[index], crossing_cost,
                          marker='o',
                          color='red')
 
@@ -51,20 +61,24 @@ def plot_main(args: argparse.Namespace) -> int:
         states, inputs = fileio.parse_system_data(data)
 
         for index, state in enumerate(states):
-            plt.plot(state, label=f'{index}')
+            plt.plot(*decimate.decimate_series(state, args.max_points,
+                                               args.decimate),
+                     label=f'{index}')
         plt.title('states')
         plt.legend()
         plt.show()
 
         for index, input_ in enumerate(inputs):
-            plt.plot(input_, label=f'{index}')
+            plt.plot(*decimate.decimate_series(input_, args.max_points,
+                                               args.decimate),
+                     label=f'{index}')
         plt.title('inputs')
         plt.legend()
         plt.show()
 
         ref = data['ref']
-        plt.plot(ref[1], ref[0])
-        plt.plot(states[1], states[0])
+        plt.plot(*decimate.decimate(ref[1], ref[0], args.max_points))
+        plt.plot(*decimate.decimate(states[1], states[0], args.max_points))
         plt.title('x-y')
         plt.xlabel('y')
         plt.xlim(max(states[1]), min(states[1]))
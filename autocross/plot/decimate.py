@@ -0,0 +1,129 @@
+"""Shape-preserving downsampling
+
+This module reduces long series to a fixed point budget before they are
+handed to matplotlib, so plotting time and memory do not grow with the
+length of a trajectory. Points are grouped into buckets by sample
+index, and each bucket keeps the points that matter for its shape.
+"""
+# Standard library imports
+from typing import Final, Sequence
+
+# Third party imports
+import numpy as np
+
+
+DEFAULT_MAX_POINTS: Final[int] = 2000
+METHOD_LTTB: Final[str] = 'lttb'
+METHOD_MIN_MAX: Final[str] = 'minmax'
+
+
+def lttb_indices(x: Sequence, y: Sequence, max_points: int) -> np.ndarray:
+    """Select points with Largest-Triangle-Three-Buckets
+
+    The first and last points are always kept. The remaining points are
+    split into equally sized buckets by index, and from each bucket the
+    point forming the largest triangle with the previously selected
+    point and the mean of the next bucket is kept. Buckets are formed
+    by index, so `x` does not have to be monotonic and parametric paths
+    such as x-y trajectories are supported.
+
+    :param x: array of x values
+    :param y: array of y values
+    :param max_points: maximum number of points to keep, at least 3
+    :return: array of selected indices in increasing order
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    num_points = x.size
+
+    if num_points <= max_points:
+        return np.arange(num_points)
+
+    assert max_points >= 3, 'At least three points are needed for LTTB'
+
+    edges = np.linspace(1, num_points - 1, max_points - 1).astype(np.int64)
+    indices = np.empty(max_points, dtype=np.int64)
+    indices[0] = 0
+    indices[-1] = num_points - 1
+
+    for bucket in range(max_points - 2):
+        start, stop = edges[bucket], edges[bucket + 1]
+        next_stop = edges[bucket + 2] if bucket + 2 < len(edges) \
+            else num_points
+        next_x = np.mean(x[stop:next_stop])
+        next_y = np.mean(y[stop:next_stop])
+
+        previous = indices[bucket]
+        bucket_x = x[start:stop] - x[previous]
+        bucket_y = y[start:stop] - y[previous]
+        areas = np.abs((next_x - x[previous]) * bucket_y
+                       - bucket_x * (next_y - y[previous]))
+        indices[bucket + 1] = start + int(np.argmax(areas))
+
+    return indices
+
+
+def min_max_indices(y: Sequence, max_points: int) -> np.ndarray:
+    """Select the minimum and maximum of every bucket
+
+    Every bucket keeps its lowest and highest point in index order, so
+    spikes survive downsampling exactly. This is the better choice for
+    noisy signals such as control inputs.
+
+    :param y: array of values
+    :param max_points: maximum number of points to keep, at least 2
+    :return: array of selected indices in increasing order
+    """
+    y = np.asarray(y, dtype=float)
+    num_points = y.size
+
+    if num_points <= max_points:
+        return np.arange(num_points)
+
+    num_buckets = max_points // 2
+    starts = np.linspace(0, num_points, num_buckets,
+                         endpoint=False).astype(np.int64)
+    bucket_ids = np.repeat(np.arange(num_buckets),
+                           np.diff(np.append(starts, num_points)))
+
+    # Sorting by (bucket, value) puts each bucket's minimum first and
+    # maximum last
+    order = np.lexsort((y, bucket_ids))
+    first = starts
+    last = np.append(starts[1:], num_points) - 1
+
+    return np.unique(np.concatenate((order[first], order[last])))
+
+
+def decimate(x: Sequence, y: Sequence, max_points: int = DEFAULT_MAX_POINTS,
+             method: str = METHOD_LTTB) -> tuple:
+    """Downsample a series to a point budget
+
+    :param x: array of x values
+    :param y: array of y values
+    :param max_points: maximum number of points to keep
+    :param method: 'lttb' or 'minmax'
+    :return: tuple formatted as (x values, y values)
+    """
+    x = np.asarray(x)
+    y = np.asarray(y)
+
+    if method == METHOD_LTTB:
+        indices = lttb_indices(x, y, max_points)
+    else:
+        assert method == METHOD_MIN_MAX, f'Unknown method {method}'
+        indices = min_max_indices(y, max_points)
+
+    return x[indices], y[indices]
+
+
+def decimate_series(y: Sequence, max_points: int = DEFAULT_MAX_POINTS,
+                    method: str = METHOD_LTTB) -> tuple:
+    """Downsample a series indexed by sample number
+
+    :param y: array of values
+    :param max_points: maximum number of points to keep
+    :param method: 'lttb' or 'minmax'
+    :return: tuple formatted as (sample numbers, values)
+    """
+    return decimate(np.arange(np.size(y)), np.ravel(y), max_points, method)
@@ -0,0 +1,259 @@
+"""Headless plot rendering
+
+This module renders cost, wait and system plots straight to image
+files without opening windows. Figures are created with the Agg
+canvas rather than pyplot, so rendering works without a display and
+can run on a pool of worker processes.
+"""
+# Standard library imports
+import concurrent.futures
+import os
+from typing import Final, Optional, Sequence
+
+# Third party imports
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+# Local application imports
+from autocross import fileio
+from autocross.plot import decimate
+
+
+COST_EXTENSIONS: Final[tuple] = ('.cost', '.wait')
+SYSTEM_EXTENSION: Final[str] = '.system'
+DEFAULT_TIME_STEP: Final[float] = 0.1
+DEFAULT_FORMAT: Final[str] = 'png'
+
+
+def time_grid(cost_bounds: Sequence, step: float = DEFAULT_TIME_STEP,
+              max_points: Optional[int] = None) -> np.ndarray:
+    """Create a time grid spanning all cost bounds
+
+    The step is widened if the grid would otherwise have more than
+    `max_points` points.
+
+    :param cost_bounds: list of (lower, upper) cost function bounds
+    :param step: grid step
+    :param max_points: (optional) maximum number of grid points
+    :return: array of grid times
+    """
+    lower = min(bounds[0] for bounds in cost_bounds)
+    upper = max(bounds[1] for bounds in cost_bounds)
+
+    if max_points is not None:
+        step = max(step, (upper - lower) / max_points)
+
+    return np.arange(start=lower, stop=upper, step=step)
+
+
+def evaluate_curve(cost_func, cost_bounds: Sequence, times: np.ndarray,
+                   crossing_time: Optional[float] = None) -> tuple:
+    """Evaluate a cost function on the part of a grid within its bounds
+
+    The crossing time, if given, is evaluated in the same call as the
+    grid so every curve is evaluated exactly once.
+
+    :param cost_func: cost function
+    :param cost_bounds: cost function bounds
+    :param times: array of grid times
+    :param crossing_time: (optional) scheduled crossing time to mark
+    :return: tuple formatted as (times, costs, crossing cost or None)
+    """
+    times = times[(times >= cost_bounds[0]) & (times <= cost_bounds[1])]
+    inputs = times if crossing_time is None \
+        else np.append(times, crossing_time)
+
+    costs = np.ravel(np.asarray(cost_func(inputs), dtype=float))
+
+    if crossing_time is None:
+        return times, costs, None
+
+    return times, costs[:-1], float(costs[-1])
+
+
+def write_curve_data(filepath: str, times: np.ndarray,
+                     costs: np.ndarray) -> None:
+    """Write an evaluated curve as a two column text file
+
+    :param filepath: path of the data file
+    :param times: array of times
+    :param costs: array of costs
+    :return: None
+    """
+    np.savetxt(filepath, np.column_stack((times, costs)),
+               header='time cost', comments='')
+
+
+def render_cost_file(filepath: str, output_dir: str,
+                     image_format: str = DEFAULT_FORMAT,
+                     times: Optional[np.ndarray] = None,
+                     crossing_time: Optional[float] = None,
+                     max_points: int = decimate.DEFAULT_MAX_POINTS) -> list:
+    """Render a cost or wait file and write its curve data
+
+    :param filepath: path of the cost or wait file
+    :param output_dir: directory for the image and data files
+    :param image_format: image file format
+    :param times: (optional) shared time grid. Defaults to a grid over
+    the file's own bounds.
+    :param crossing_time: (optional) scheduled crossing time to mark
+    :param max_points: maximum number of grid points if no grid is given
+    :return: list of written file paths
+    """
+    name = fileio.get_file_name(filepath)
+    extension = fileio.get_file_extension(filepath)
+    cost_func, cost_bounds = fileio.parse_cost_data(
+        fileio.read_cost_file(filepath))
+
+    if times is None:
+        times = time_grid([cost_bounds], max_points=max_points)
+
+    times, costs, crossing_cost = evaluate_curve(cost_func, cost_bounds,
+                                                 times, crossing_time)
+
+    figure = _new_figure()
+    axes = figure.add_subplot()
+    axes.plot(times, costs, label=name)
+    if crossing_cost is not None:
+        axes.plot(crossing_time, crossing_cost, marker='o', color='red')
+    axes.set_title(extension[1:])
+    axes.legend()
+
+    data_path = os.path.join(output_dir, f'{name}{extension}.dat')
+    image_path = os.path.join(output_dir, f'{name}{extension}.{image_format}')
+    write_curve_data(data_path, times, costs)
+    figure.savefig(image_path)
+
+    return [data_path, image_path]
+
+
+def render_system_file(filepath: str, output_dir: str,
+                       image_format: str = DEFAULT_FORMAT,
+                       max_points: int = decimate.DEFAULT_MAX_POINTS,
+                       method: str = decimate.METHOD_LTTB) -> list:
+    """Render the states, inputs and x-y path of a system file
+
+    Every series is downsampled to `max_points` before plotting.
+
+    :param filepath: path of the system file
+    :param output_dir: directory for the image files
+    :param image_format: image file format
+    :param max_points: maximum number of points per series
+    :param method: downsampling method, 'lttb' or 'minmax'
+    :return: list of written file paths
+    """
+    name = fileio.get_file_name(filepath)
+    data = fileio.read_system_file(filepath)
+    states, inputs = fileio.parse_system_data(data)
+    paths = []
+
+    for title, series in (('states', states), ('inputs', inputs)):
+        figure = _new_figure()
+        axes = figure.add_subplot()
+        for index, values in enumerate(series):
+            axes.plot(*decimate.decimate_series(values, max_points, method),
+                      label=f'{index}')
+        axes.set_title(title)
+        axes.legend()
+
+        paths.append(os.path.join(output_dir,
+                                  f'{name}.{title}.{image_format}'))
+        figure.savefig(paths[-1])
+
+    figure = _new_figure()
+    axes = figure.add_subplot()
+    if 'ref' in data:
+        axes.plot(*decimate.decimate(data['ref'][1], data['ref'][0],
+                                     max_points), label='ref')
+    axes.plot(*decimate.decimate(states[1], states[0], max_points),
+              label='act')
+    axes.set_title('x-y')
+    axes.set_xlabel('y')
+    axes.set_xlim(max(states[1]), min(states[1]))
+    axes.set_ylabel('x')
+    axes.legend()
+
+    paths.append(os.path.join(output_dir, f'{name}.xy.{image_format}'))
+    figure.savefig(paths[-1])
+
+    return paths
+
+
+def render_files(filepaths: Sequence, output_dir: str,
+                 image_format: str = DEFAULT_FORMAT, workers: int = 1,
+                 crossing_times: Optional[Sequence] = None,
+                 max_points: int = decimate.DEFAULT_MAX_POINTS,
+                 method: str = decimate.METHOD_LTTB) -> list:
+    """Render many cost, wait and system files, optionally in parallel
+
+    Cost and wait curves share one time grid spanning the bounds of all
+    of them, so curves of a fleet can be compared point by point in
+    their data files.
+
+    :param filepaths: list of cost, wait or system file paths
+    :param output_dir: directory for the image and data files
+    :param image_format: image file format
+    :param workers: number of worker processes
+    :param crossing_times: (optional) scheduled crossing times, one per
+    file path, marked on cost and wait plots
+    :param max_points: maximum number of points per curve or series
+    :param method: downsampling method for system series, 'lttb' or
+    'minmax'
+    :return: list of written file paths in input order
+    """
+    os.makedirs(output_dir, exist_ok=True)
+
+    cost_bounds = [fileio.parse_cost_data(fileio.read_cost_file(filepath))[1]
+                   for filepath in filepaths
+                   if fileio.get_file_extension(filepath) in COST_EXTENSIONS]
+    times = time_grid(cost_bounds, max_points=max_points) \
+        if cost_bounds else None
+
+    tasks = [(filepath, output_dir, image_format, times,
+              None if crossing_times is None else crossing_times[index],
+              max_points, method)
+             for index, filepath in enumerate(filepaths)]
+
+    if workers > 1 and len(tasks) > 1:
+        with concurrent.futures.ProcessPoolExecutor(
+                max_workers=workers) as executor:
+            results = list(executor.map(_render_task, tasks))
+    else:
+        results = [_render_task(task) for task in tasks]
+
+    return [path for paths in results for path in paths]
+
+
+def _render_task(task: tuple) -> list:
+    """Render a single file
+
+    :param task: tuple formatted as (file path, output directory, image
+    format, time grid, crossing time, maximum points, downsampling
+    method)
+    :return: list of written file paths
+    """
+    (filepath, output_dir, image_format, times, crossing_time, max_points,
+     method) = task
+    extension = fileio.get_file_extension(filepath)
+
+    if extension in COST_EXTENSIONS:
+        return render_cost_file(filepath, output_dir, image_format, times,
+                                crossing_time, max_points)
+
+    assert extension == SYSTEM_EXTENSION, \
+        f'Cannot plot files with extension {extension}'
+
+    return render_system_file(filepath, output_dir, image_format,
+                              max_points, method)
+
+
+def _new_figure() -> Figure:
+    """Create a figure attached to an Agg canvas
+
+    :return: figure
+    """
+    figure = Figure()
+    FigureCanvasAgg(figure)
+
+    return figure
@@ -0,0 +1,132 @@
+"""Schedule construction
+
+This module builds a crossing schedule of a given type from in-memory
+cost functions. It is shared by the `schedule` and `pipeline` commands.
+"""
+# Standard library imports
+import random
+from typing import Final, Optional, Sequence
+
+# Local application imports
+from autocross import budgets
+from autocross import crossing_schedule
+from autocross import tracing
+from autocross.schedule import conflicts
+from autocross.schedule import queues
+from autocross.schedule import scheduling
+from autocross.schedule import times
+
+
+SCHEDULE_TYPES: Final[tuple] = ('fcf', 'fcfs', 'rand', 'fixed', 'merge')
+
+
+def individual_crossing_times(cost_funcs: Sequence,
+                              cost_bounds: Sequence,
+                              budget: Optional[budgets.Budget] = None) -> list:
+    """Assign each vehicle its own optimal crossing time
+
+    :param cost_funcs: list of crossing cost functions
+    :param cost_bounds: list of crossing cost function bounds
+    :param budget: (optional) budget of every solve
+    :return: list of crossing times indexed by vehicle ID
+    """
+    cross_times = []
+
+    for cost_func, cost_bound in zip(cost_funcs, cost_bounds):
+        cross_times += times.assign_optimal_crossing_times(
+            [cost_func], [cost_bound], budget=budget)
+
+    return cross_times
+
+
+def build_schedule(schedule_type: str, cost_funcs: Sequence,
+                   cost_bounds: Sequence,
+                   wait_funcs: Optional[Sequence] = None,
+                   wait_bounds: Optional[Sequence] = None,
+                   movements: Optional[Sequence] = None,
+                   conflict_graph: Optional[dict] = None,
+                   arrival_times: Optional[Sequence] = None,
+                   seed: Optional[int] = None,
+                   cross_times: Optional[Sequence] = None,
+                   budget: Optional[budgets.Budget] = None,
+                   **kwargs) -> crossing_schedule.Schedule:
+    """Build a crossing schedule
+
+    :param schedule_type: one of 'fcf', 'fcfs', 'rand', 'fixed' or
+    'merge'
+    :param cost_funcs: list of crossing cost functions
+    :param cost_bounds: list of crossing cost function bounds
+    :param wait_funcs: (optional) list of waiting cost functions, used
+    to weigh lanes by 'merge'
+    :param wait_bounds: (optional) list of waiting cost function bounds
+    :param movements: (optional) list of (lane, direction) tuples. If
+    given, lane order is enforced and non-conflicting vehicles may
+    cross concurrently.
+    :param conflict_graph: (optional) conflict graph for `movements`.
+    Defaults to the four-way intersection.
+    :param arrival_times: (optional) arrival times used by 'fcfs'.
+    Defaults to a random arrival order drawn from `seed`.
+    :param seed: (optional) seed for random orders
+    :param cross_times: (optional) precomputed crossing times indexed by
+    vehicle ID. If given, no crossing time assignment is solved and
+    `kwargs` are ignored.
+    :param budget: (optional) budget of the crossing time assignment.
+    If it runs out, each vehicle gets its own cheapest crossing time.
+    :param kwargs: (optional) 'cross_sum' and 'slack_penalty' passed to
+    the crossing time assignment of 'fcf'
+    :return: crossing schedule
+    """
+    assert schedule_type in SCHEDULE_TYPES, \
+        f'Unknown schedule type {schedule_type}'
+
+    movements = list(movements or [])
+    lanes = [lane for lane, _ in movements]
+
+    with tracing.span('assign times', schedule_type=schedule_type):
+        if cross_times is None and schedule_type in ('rand', 'fcfs'):
+            cross_times = individual_crossing_times(cost_funcs, cost_bounds,
+                                                    budget)
+        elif cross_times is None and schedule_type == 'fcf':
+            cross_times = times.assign_optimal_crossing_times(
+                cost_funcs, cost_bounds, budget=budget, **kwargs)
+        elif cross_times is None:
+            cross_times = times.assign_optimal_crossing_times(
+                cost_funcs, cost_bounds, budget=budget)
+
+    if schedule_type == 'rand':
+        cross_order = scheduling.scheduled_random(len(cost_funcs), seed)
+    elif schedule_type == 'fcfs':
+        if arrival_times is None:
+            arrival_times = list(range(len(cost_funcs)))
+            random.Random(seed).shuffle(arrival_times)
+        cross_order = scheduling.scheduled_first_come_first_serve(
+            arrival_times)
+    elif schedule_type == 'fcf':
+        cross_order = scheduling.scheduled_fastest_crossing_first(cross_times)
+    elif schedule_type == 'fixed':
+        cross_order = list(range(len(cost_funcs)))
+    else:
+        lane_queues = queues.lane_queues(lanes or range(len(cost_funcs)))
+
+        if wait_funcs:
+            weights = [(float(func(bound[1])) - float(func(bound[0])))
+                       / (bound[1] - bound[0])
+                       for func, bound in zip(wait_funcs, wait_bounds)]
+        else:
+            weights = None
+
+        cross_order = queues.merge_weighted_chains(lane_queues, cross_times,
+                                                   weights)
+
+    if not movements:
+        return crossing_schedule.Schedule(cross_order, cross_times)
+
+    if conflict_graph is None:
+        conflict_graph = conflicts.load_conflict_graph()
+
+    cross_order = queues.enforce_lane_precedence(cross_order, lanes)
+    start_times = conflicts.start_times_concurrent(cross_order, cross_times,
+                                                   movements, conflict_graph)
+
+    return crossing_schedule.Schedule(cross_order, cross_times, start_times,
+                                      movements)
@@ -1,62 +1,103 @@
 # Standard library imports
 import argparse
-import random
+import os
+from typing import Optional
 
 # Local application imports
 import numpy as np
 
+from autocross import budgets
 from autocross import fileio
+from autocross import tracing
+from autocross.analyze import metrics
+from autocross.schedule import build
+from autocross.schedule import conflicts
+from autocross.schedule import convex
+from autocross.schedule import montecarlo
+from autocross.schedule import queues
 from autocross.schedule import scheduling
 from autocross.schedule import times
 
 
 def schedule_main(args: argparse.Namespace) -> int:
+    # The deadline covers the whole run, including loading
+    budget = budgets.create_budget(args.max_solve_time, args.max_iter,
+                                   args.deadline)
     cost_files = args.cost_files
     cost_funcs = []
     cost_bounds = []
+    wait_funcs = []
+    wait_bounds = []
+    lazy_curves = []
 
-    for cost_file in cost_files:
-        cost_data = fileio.read_cost_file(cost_file)
-        cost_func, cost_bound = fileio.parse_cost_data(cost_data)
-        cost_funcs.append(cost_func)
-        cost_bounds.append(cost_bound)
+    movements = [conflicts.parse_movement(movement)
+                 for movement in args.movements or []]
+    lanes = [lane for lane, _ in movements]
 
-    cross_times = []
-    cross_order = []
-    cross_costs = []
+    with tracing.span('load fleet', num_vehicles=len(cost_files)):
+        if args.lazy:
+            lazy_curves, wait_funcs, wait_bounds = _load_lazy_fleet(
+                args, [direction for _, direction in movements] or None,
+                budget)
+            cost_funcs = [curve.func for curve in lazy_curves]
+            cost_bounds = [curve.bounds for curve in lazy_curves]
+        else:
+            for cost_file in cost_files:
+                cost_data = fileio.read_cost_file(cost_file)
+                cost_func, cost_bound = fileio.parse_cost_data(cost_data)
+                cost_funcs.append(cost_func)
+                cost_bounds.append(cost_bound)
 
-    if args.schedule_type == 'rand':
-        pass
-    if args.schedule_type == 'fcfs':
-        cross_times = []
+            for wait_file in args.wait_files or []:
+                wait_data = fileio.read_cost_file(wait_file)
+                wait_func, wait_bound = fileio.parse_cost_data(wait_data)
+                wait_funcs.append(wait_func)
+                wait_bounds.append(wait_bound)
 
-        for cost_func, cost_bound in zip(cost_funcs, cost_bounds):
-            cross_times += \
-                times.assign_optimal_crossing_times([cost_func], [cost_bound])
+    if args.monte_carlo and args.schedule_type in ('fcfs', 'rand'):
+        return _monte_carlo_main(args, cost_funcs, cost_bounds, wait_funcs,
+                                 movements)
 
-        arrival_times = list(range(len(args.cost_files)))
-        random.shuffle(arrival_times)
-        cross_order = scheduling.scheduled_first_come_first_serve(
-            arrival_times)
-    elif args.schedule_type == 'fcf':
-        kwargs = dict()
+    if args.schedule_type == 'sweep':
+        return _sweep_main(args, cost_funcs, cost_bounds)
+
+    kwargs = dict()
+
+    if args.cross_sum is not None:
+        kwargs['cross_sum'] = args.cross_sum
+
+    if args.slack_penalty is not None:
+        kwargs['slack_penalty'] = args.slack_penalty
+
+    conflict_graph = conflicts.load_conflict_graph(args.conflict_file) \
+        if movements else None
+
+    cross_times = None
 
-        if args.cross_sum is not None:
-            kwargs['cross_sum'] = args.cross_sum
+    if args.convexify:
+        with tracing.span('convexify', num_vehicles=len(cost_funcs)):
+            convex_curves = convex.convexify_curves(cost_funcs, cost_bounds)
 
-        cross_times = times.assign_optimal_crossing_times(cost_funcs,
-                                                          cost_bounds,
-                                                          **kwargs)
-        cross_order = scheduling.scheduled_fastest_crossing_first(cross_times)
+        for cost_file, curve in zip(cost_files, convex_curves):
+            print(convex.format_deviation(os.path.basename(cost_file), curve))
 
+        # Like the joint assignment, only 'fcf' limits the crossing sum
+        cross_times = convex.assign_convex_crossing_times(
+            convex_curves, **(kwargs if args.schedule_type == 'fcf' else {}))
+
+    schedule = build.build_schedule(args.schedule_type, cost_funcs,
+                                    cost_bounds, wait_funcs, wait_bounds,
+                                    movements, conflict_graph,
+                                    seed=args.seed, cross_times=cross_times,
+                                    budget=budget, **kwargs)
+    cross_times = schedule.crossing_times.tolist()
+    cross_costs = []
+
+    if args.schedule_type == 'fcf':
         cross_costs = [float(func(time)) for func, time in zip(cost_funcs, cross_times)]
 
         schedule_data = [[time, cost] for time, cost in zip(cross_times, cross_costs)]
         np.savetxt(f'{args.output_file}.txt', schedule_data, header='time cost', comments='')
-    elif args.schedule_type == 'fixed':
-        cross_times = times.assign_optimal_crossing_times(cost_funcs,
-                                                          cost_bounds)
-        cross_order = list(range(len(args.cost_files)))
 
     file_dir = fileio.get_file_directory(cost_files[0])
 
@@ -65,11 +106,177 @@ def schedule_main(args: argparse.Namespace) -> int:
     else:
         output_file = f'schedule.{args.schedule_type}'
 
-    fileio.write_schedule_file(f'{file_dir}/{output_file}', cross_order,
-                               cross_times)
+    fileio.write_schedule(f'{file_dir}/{output_file}', schedule)
 
     print(f'crossing times: {cross_times}')
     print(f'crossing costs: {cross_costs}')
-    print(f'crossing order: {cross_order}')
+    print(f'crossing order: {schedule.crossing_order.tolist()}')
+    print(f'start times: {schedule.start_times.tolist()}')
+    print(f'clearing time: {schedule.clearing_time}')
+
+    if lazy_curves:
+        num_solves = sum(curve.num_solves for curve in lazy_curves)
+        num_sweep = len(lazy_curves) * len(
+            np.arange(args.time_min, args.time_max + 1, args.time_step))
+        print(f'lazy solves: {num_solves} of {num_sweep}')
+
+    if movements:
+        lane_prefixes = queues.lane_prefix_sums(queues.lane_queues(lanes),
+                                                schedule.start_times)
+        lane_waits = {lane: float(prefix[-1])
+                      for lane, prefix in lane_prefixes.items()}
+        print(f'lane waiting times: {lane_waits}')
+
+    if wait_funcs:
+        schedule_cost = \
+            metrics.sum_waiting_costs(wait_funcs, schedule.start_times) \
+            + metrics.sum_crossing_costs(cost_funcs, schedule.crossing_times)
+        print(f'schedule cost: {float(schedule_cost)}')
+
+    return 0
+
+
+def _load_lazy_fleet(args: argparse.Namespace,
+                     directions: Optional[list] = None,
+                     budget: Optional[budgets.Budget] = None) -> tuple:
+    """Create lazy cost curves from vehicle files
+
+    The positional files of the schedule command are read as vehicle
+    files. Curves are resolved down to the time step, the spacing a
+    `calculate` sweep would use.
+
+    :param args: schedule command arguments
+    :param directions: (optional) list of directions indexed by vehicle
+    ID. Defaults to straight.
+    :param budget: (optional) budget of every coarse and refinement
+    solve
+    :return: tuple formatted as (lazy cost curves, wait functions, wait
+    bounds), each a list indexed by vehicle ID
+    """
+    # Imported here, so scheduling from cost files does not load the
+    # vehicle models
+    from autocross.calculate import curves
+    from autocross.calculate import lazy
+    from autocross.calculate import vehicle
+
+    vehicle_data = [fileio.read_vehicle_file(filepath)
+                    for filepath in args.cost_files]
+    lazy_curves = lazy.lazy_cost_curves(
+        [vehicle.build_vehicle(data) for data in vehicle_data],
+        args.time_min, args.time_max, directions,
+        tolerance=args.lazy_tolerance, resolution=args.time_step,
+        budget=budget)
+
+    wait_funcs, wait_bounds = zip(*[
+        curves.wait_curve(curve.bounds, data['wait_factor'])
+        for curve, data in zip(lazy_curves, vehicle_data)])
+
+    return lazy_curves, list(wait_funcs), list(wait_bounds)
+
+
+def _monte_carlo_main(args: argparse.Namespace, cost_funcs: list,
+                      cost_bounds: list, wait_funcs: list,
+                      movements: Optional[list] = None) -> int:
+    """Evaluate many random crossing orders against fastest-crossing-first
+
+    Every vehicle crosses in its individually optimal time, so only the
+    order changes between samples. Random arrival orders are drawn and
+    their schedule costs are reported as a distribution next to the
+    cost of the fastest-crossing-first order for the same times. With
+    movements, lane order is enforced and non-conflicting vehicles may
+    cross concurrently, like in a built schedule.
+
+    :param args: schedule command arguments
+    :param cost_funcs: list of crossing cost functions
+    :param cost_bounds: list of crossing cost function bounds
+    :param wait_funcs: list of waiting cost functions
+    :param movements: (optional) list of (lane, direction) tuples
+    :return: exit code
+    """
+    assert len(wait_funcs) == len(cost_funcs), \
+        'Monte Carlo evaluation needs one wait file per cost file'
+
+    cross_times = build.individual_crossing_times(cost_funcs, cost_bounds)
+    cross_costs = [float(func(time))
+                   for func, time in zip(cost_funcs, cross_times)]
+
+    conflict_graph = conflicts.load_conflict_graph(args.conflict_file) \
+        if movements else None
+
+    orders = montecarlo.random_arrival_orders(len(cost_funcs),
+                                              args.monte_carlo, args.seed)
+    sample_costs = montecarlo.schedule_costs(orders, cross_times, wait_funcs,
+                                             cross_costs, movements,
+                                             conflict_graph)
+
+    fcf_order = np.asarray(
+        [scheduling.scheduled_fastest_crossing_first(cross_times)])
+    fcf_cost = float(montecarlo.schedule_costs(fcf_order, cross_times,
+                                               wait_funcs, cross_costs,
+                                               movements,
+                                               conflict_graph)[0])
+
+    summary = montecarlo.summarize(sample_costs)
+
+    print(f'samples: {args.monte_carlo}')
+    print(f'fcf schedule cost: {fcf_cost}')
+    for name, value in summary.items():
+        print(f'{args.schedule_type} schedule cost {name}: {value}')
+    print(f'{args.schedule_type} samples worse than fcf: '
+          f'{float(np.mean(sample_costs > fcf_cost))}')
+
+    if args.output_file:
+        np.savetxt(f'{args.output_file}.txt', sample_costs, header='cost',
+                   comments='')
+
+    return 0
+
+
+def _sweep_main(args: argparse.Namespace, cost_funcs: list,
+                cost_bounds: list) -> int:
+    """Trace the trade-off between total crossing time and cost
+
+    By default the sweep runs from the sum of the vehicles' individually
+    optimal crossing times down to the sum of their lower bounds.
+
+    :param args: schedule command arguments
+    :param cost_funcs: list of crossing cost functions
+    :param cost_bounds: list of crossing cost function bounds
+    :return: exit code
+    """
+    if args.sweep_method == 'multiplier':
+        results = times.sweep_multipliers(cost_funcs, cost_bounds,
+                                          num_multipliers=args.sweep_steps)
+    else:
+        kwargs = dict()
+
+        if args.slack_penalty is not None:
+            kwargs['slack_penalty'] = args.slack_penalty
+
+        sweep_max = args.sweep_max
+        sweep_min = args.sweep_min
+
+        if sweep_max is None:
+            upper_sum = sum(bounds[1] for bounds in cost_bounds)
+            sweep_max = sum(times.CrossingTimeProblem(
+                cost_funcs, cost_bounds, **kwargs).solve(upper_sum)[1])
+        if sweep_min is None:
+            sweep_min = sum(bounds[0] for bounds in cost_bounds)
+
+        cross_sums = np.linspace(sweep_min, sweep_max, args.sweep_steps)
+        results = times.sweep_cross_sum(cost_funcs, cost_bounds, cross_sums,
+                                        **kwargs)
+
+    sweep_data = [[cross_sum, cost, *cross_times]
+                  for cross_sum, cost, cross_times in results]
+    header = ' '.join(['cross_sum', 'cost'] +
+                      [f'time_{vid}' for vid in range(len(cost_funcs))])
+
+    for cross_sum, cost, _ in results:
+        print(f'cross sum: {cross_sum} cost: {cost}')
+
+    if args.output_file:
+        np.savetxt(f'{args.output_file}.txt', sweep_data, header=header,
+                   comments='')
 
     return 0
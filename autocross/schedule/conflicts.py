@@ -0,0 +1,274 @@
+"""Movement conflicts and concurrent crossing
+
+This module contains the movement conflict graph and an interval-based
+resource timeline used to let vehicles with non-conflicting movements
+occupy the intersection at the same time.
+"""
+# Standard library imports
+import bisect
+import heapq
+import itertools
+from typing import Final, Optional, Sequence
+
+# Local application imports
+from autocross import fileio
+
+
+DIRECTION_LEFT: Final[str] = 'left'
+DIRECTION_RIGHT: Final[str] = 'right'
+DIRECTION_STRAIGHT: Final[str] = 'straight'
+
+FOUR_WAY_LANES: Final[tuple] = ('north', 'east', 'south', 'west')
+"""Approach lanes of a four-way intersection in clockwise order"""
+
+_MOVEMENT_SEPARATOR: Final[str] = ':'
+
+
+def parse_movement(movement: str) -> tuple:
+    """Parse a movement from its string form
+
+    Movements are written as '<lane>:<direction>', for example
+    'south:left'. The direction uses the same names as the `--direction`
+    option of the calculate command. If the direction is omitted the
+    vehicle is assumed to go straight.
+
+    :param movement: movement string
+    :return: tuple formatted as (lane, direction). Raises ValueError
+    if the direction is not 'straight', 'left' or 'right'.
+    """
+    lane, _, direction = movement.partition(_MOVEMENT_SEPARATOR)
+
+    if not direction:
+        direction = DIRECTION_STRAIGHT
+
+    if direction not in (DIRECTION_STRAIGHT, DIRECTION_LEFT,
+                         DIRECTION_RIGHT):
+        raise ValueError(f'Unknown direction {direction!r} in movement '
+                         f'{movement!r}')
+
+    return lane, direction
+
+
+def format_movement(movement: tuple) -> str:
+    """Format a movement as a string
+
+    :param movement: tuple formatted as (lane, direction)
+    :return: movement string formatted as '<lane>:<direction>'
+    """
+    return _MOVEMENT_SEPARATOR.join(movement)
+
+
+def four_way_conflict_graph() -> dict:
+    """Build the conflict graph of a four-way intersection
+
+    Each approach lane contributes an entry point and an exit point on
+    the boundary of the intersection. Going clockwise, every lane's
+    entry comes before its exit (right-hand traffic). A movement is a
+    chord from its entry to its exit, and two movements conflict when
+    they share an entry, share an exit (merge), or their chords cross.
+
+    :return: dict mapping each movement to the set of movements it
+    conflicts with
+    """
+    num_lanes = len(FOUR_WAY_LANES)
+    exit_offsets = {
+        DIRECTION_RIGHT: -1,
+        DIRECTION_STRAIGHT: 2,
+        DIRECTION_LEFT: 1
+    }
+
+    chords = {}
+    for index, lane in enumerate(FOUR_WAY_LANES):
+        for direction, offset in exit_offsets.items():
+            exit_index = (index + offset) % num_lanes
+            chords[(lane, direction)] = (2 * index, 2 * exit_index + 1)
+
+    graph = {movement: set() for movement in chords}
+    for first, second in itertools.combinations(chords, 2):
+        if _chords_conflict(chords[first], chords[second]):
+            graph[first].add(second)
+            graph[second].add(first)
+
+    return graph
+
+
+def parse_conflict_data(data: dict) -> dict:
+    """Build a conflict graph from conflict data
+
+    It is assumed that the dict contains a 'conflicts' key whose value
+    is a list of movement string pairs, for example
+    `[['south:left', 'north:straight'], ...]`. Conflicts are symmetric.
+
+    :param data: conflict data, typically read from a conflict file
+    :return: dict mapping each movement to the set of movements it
+    conflicts with
+    """
+    assert 'conflicts' in data, "Key 'conflicts' not found in data"
+
+    graph = {}
+    for first, second in data['conflicts']:
+        first, second = parse_movement(first), parse_movement(second)
+        graph.setdefault(first, set()).add(second)
+        graph.setdefault(second, set()).add(first)
+
+    return graph
+
+
+def load_conflict_graph(filepath: Optional[str] = None) -> dict:
+    """Load a conflict graph
+
+    :param filepath: (optional) path to a conflict file. If not given,
+    the four-way intersection conflict graph is used.
+    :return: dict mapping each movement to the set of movements it
+    conflicts with
+    """
+    if filepath is None:
+        return four_way_conflict_graph()
+
+    return parse_conflict_data(fileio.read_conflict_file(filepath))
+
+
+def movements_conflict(first: tuple, second: tuple,
+                       conflict_graph: dict) -> bool:
+    """Check whether two movements conflict
+
+    Movements from the same approach lane always conflict because the
+    vehicles share the lane's stop line.
+
+    :param first: tuple formatted as (lane, direction)
+    :param second: tuple formatted as (lane, direction)
+    :param conflict_graph: dict mapping movements to conflicting movements
+    :return: True if the movements cannot use the intersection at the
+    same time
+    """
+    if first[0] == second[0]:
+        return True
+
+    return second in conflict_graph.get(first, ())
+
+
+class ResourceTimeline:
+    """Interval-based occupancy timeline of the intersection
+
+    The timeline stores the intervals during which each movement
+    occupies the intersection. A new vehicle is placed at the earliest
+    time where its crossing interval does not overlap any interval of a
+    conflicting movement.
+    """
+    def __init__(self, conflict_graph: dict) -> None:
+        """Init function
+
+        :param conflict_graph: dict mapping movements to conflicting
+        movements
+        :return: None
+        """
+        self._conflict_graph = conflict_graph
+        self._starts = {}
+        self._ends = {}
+
+    def earliest_start(self, movement: tuple, ready: float,
+                       duration: float) -> float:
+        """Find the earliest conflict-free start time
+
+        :param movement: tuple formatted as (lane, direction)
+        :param ready: earliest time the vehicle is allowed to start
+        :param duration: time the vehicle occupies the intersection
+        :return: earliest start time no earlier than `ready`
+        """
+        busy = [zip(self._starts[other], self._ends[other])
+                for other in self._starts
+                if movements_conflict(movement, other, self._conflict_graph)]
+
+        start = ready
+        for busy_start, busy_end in heapq.merge(*busy):
+            if busy_end <= start:
+                continue
+            if busy_start >= start + duration:
+                break
+
+            start = busy_end
+
+        return start
+
+    def reserve(self, movement: tuple, start: float, duration: float) -> None:
+        """Reserve the intersection for a movement
+
+        :param movement: tuple formatted as (lane, direction)
+        :param start: start of the reserved interval
+        :param duration: length of the reserved interval
+        :return: None
+        """
+        starts = self._starts.setdefault(movement, [])
+        ends = self._ends.setdefault(movement, [])
+
+        index = bisect.bisect(starts, start)
+        starts.insert(index, start)
+        ends.insert(index, start + duration)
+
+
+def start_times_concurrent(crossing_order: Sequence,
+                           crossing_times: Sequence,
+                           movements: Sequence,
+                           conflict_graph: Optional[dict] = None,
+                           backfill: bool = False) -> list:
+    """Generate a list of start times allowing concurrent crossings
+
+    Vehicles are admitted in their crossing order. Each vehicle starts
+    at the earliest time its movement does not conflict with any
+    vehicle already in the intersection. Unless `backfill` is set, a
+    vehicle never starts before the vehicle admitted ahead of it, so
+    the crossing order is preserved.
+
+    :param crossing_order: list of crossing slots where vehicle ID is
+    based on its position in the list
+    :param crossing_times: list of crossing times where vehicle ID is
+    based on its position in the list
+    :param movements: list of (lane, direction) tuples where vehicle ID
+    is based on its position in the list
+    :param conflict_graph: (optional) dict mapping movements to
+    conflicting movements. Defaults to a four-way intersection.
+    :param backfill: let vehicles use earlier gaps in the timeline
+    :return: list of start times for each vehicle
+    """
+    assert len(crossing_order) == len(crossing_times) == len(movements)
+
+    if conflict_graph is None:
+        conflict_graph = four_way_conflict_graph()
+
+    timeline = ResourceTimeline(conflict_graph)
+    admission = sorted(range(len(crossing_order)),
+                       key=lambda vid: crossing_order[vid])
+
+    ready = 0
+    start_times = [-1] * len(crossing_order)
+
+    for vid in admission:
+        duration = float(crossing_times[vid])
+        start = timeline.earliest_start(movements[vid], ready, duration)
+        timeline.reserve(movements[vid], start, duration)
+
+        start_times[vid] = start
+        if not backfill:
+            ready = start
+
+    return start_times
+
+
+def _chords_conflict(first: tuple, second: tuple) -> bool:
+    """Check whether two chords on the intersection boundary conflict
+
+    Chords sharing an endpoint conflict. Otherwise, chords cross when
+    exactly one endpoint of the second chord lies between the endpoints
+    of the first chord.
+
+    :param first: tuple of boundary positions formatted as (entry, exit)
+    :param second: tuple of boundary positions formatted as (entry, exit)
+    :return: True if the chords share an endpoint or cross
+    """
+    if set(first) & set(second):
+        return True
+
+    lower, upper = sorted(first)
+    inside = [lower < point < upper for point in second]
+
+    return inside[0] != inside[1]
@@ -0,0 +1,177 @@
+"""Convexified crossing time assignment
+
+This module replaces cost functions by their lower convex envelopes,
+which turns the crossing time assignment into a convex problem. With
+piecewise linear convex costs, the problem
+
+    minimize    sum_i f_i(t_i) + slack_penalty * slack
+    subject to  sum_i t_i <= cross_sum + slack, slack >= 0
+                lower_i <= t_i <= upper_i
+
+is solved exactly by a greedy method: every vehicle starts at the
+minimum of its envelope, and while the crossing sum is exceeded, time
+is removed from the envelope segment with the lowest cost per unit of
+time until that cost reaches the slack penalty. The solution is the
+global optimum of the convexified problem and takes one sort of the
+envelope segments, independent of solver iterations.
+
+How far each envelope lies below its cost function is reported, so
+curves that lose fidelity by convexification can be flagged.
+"""
+# Standard library imports
+from typing import Final, NamedTuple, Optional, Sequence
+
+# Third party imports
+import casadi
+import numpy as np
+
+# Local application imports
+from autocross.schedule import times
+
+
+DEFAULT_NUM_SAMPLES: Final[int] = 1000
+
+
+class ConvexCurve(NamedTuple):
+    """Lower convex envelope of a cost function
+
+    """
+    func: object
+    """Piecewise linear envelope function"""
+    breakpoints: np.ndarray
+    """Crossing times of the envelope vertices"""
+    values: np.ndarray
+    """Costs at the envelope vertices"""
+    max_deviation: float
+    """Largest amount the cost function lies above the envelope"""
+    relative_deviation: float
+    """Largest deviation relative to the range of the cost function"""
+
+
+def lower_convex_envelope(x: Sequence, y: Sequence) -> np.ndarray:
+    """Find the vertices of the lower convex envelope of points
+
+    :param x: strictly increasing x values
+    :param y: y values
+    :return: array of vertex indices in increasing order
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    hull = []
+
+    for index in range(x.size):
+        # Drop the last vertex while it lies on or above the line from
+        # the vertex before it to the new point
+        while len(hull) >= 2:
+            first, last = hull[-2], hull[-1]
+            cross = (x[last] - x[first]) * (y[index] - y[first]) \
+                - (y[last] - y[first]) * (x[index] - x[first])
+            if cross > 0:
+                break
+            hull.pop()
+
+        hull.append(index)
+
+    return np.asarray(hull, dtype=np.int64)
+
+
+def convexify_curve(func, bounds: Sequence,
+                    num_samples: int = DEFAULT_NUM_SAMPLES) -> ConvexCurve:
+    """Replace a cost function by its lower convex envelope
+
+    The function is sampled within its bounds, keeping the same margin
+    as `times.assign_optimal_crossing_times`.
+
+    :param func: cost function
+    :param bounds: cost function bounds formatted as (lower, upper)
+    :param num_samples: number of samples the envelope is built from
+    :return: convex envelope of the cost function
+    """
+    samples = np.linspace(float(bounds[0]) + times.EPSILON,
+                          float(bounds[1]) - times.EPSILON, num_samples)
+    values = np.ravel(np.asarray(func(samples)))
+
+    hull = lower_convex_envelope(samples, values)
+    breakpoints, hull_values = samples[hull], values[hull]
+
+    deviations = values - np.interp(samples, breakpoints, hull_values)
+    max_deviation = float(np.max(deviations))
+    value_range = float(np.ptp(values))
+
+    envelope = casadi.interpolant('cost_func', 'linear', [list(breakpoints)],
+                                  list(hull_values))
+
+    return ConvexCurve(envelope, breakpoints, hull_values, max_deviation,
+                       max_deviation / value_range if value_range else 0.0)
+
+
+def convexify_curves(cost_funcs: Sequence, cost_bounds: Sequence,
+                     num_samples: int = DEFAULT_NUM_SAMPLES) -> list:
+    """Replace cost functions by their lower convex envelopes
+
+    :param cost_funcs: list of crossing cost functions
+    :param cost_bounds: list of crossing cost function bounds
+    :param num_samples: number of samples each envelope is built from
+    :return: list of convex envelopes indexed by vehicle ID
+    """
+    return [convexify_curve(func, bounds, num_samples)
+            for func, bounds in zip(cost_funcs, cost_bounds)]
+
+
+def assign_convex_crossing_times(curves: Sequence,
+                                 cross_sum: Optional[float] = None,
+                                 slack_penalty: float = times.SLACK_PENALTY
+                                 ) -> list:
+    """Assign globally optimal crossing times on convex envelopes
+
+    :param curves: list of convex envelopes indexed by vehicle ID
+    :param cross_sum: (optional) soft limit on the sum of the crossing
+    times
+    :param slack_penalty: cost per unit of time above `cross_sum`
+    :return: list of crossing times indexed by vehicle ID
+    """
+    minima = [int(np.argmin(curve.values)) for curve in curves]
+    cross_times = [float(curve.breakpoints[minimum])
+                   for curve, minimum in zip(curves, minima)]
+
+    if cross_sum is None:
+        return cross_times
+
+    excess = sum(cross_times) - cross_sum
+
+    if excess <= 0:
+        return cross_times
+
+    # Segments left of each minimum as (cost per unit of time removed,
+    # length, vehicle ID). Convexity makes the rates of a vehicle
+    # increase to the left, so sorting keeps each vehicle's segments in
+    # order.
+    segments = []
+    for vid, (curve, minimum) in enumerate(zip(curves, minima)):
+        lengths = np.diff(curve.breakpoints[:minimum + 1])[::-1]
+        rises = -np.diff(curve.values[:minimum + 1])[::-1]
+        segments += [(rise / length, length, vid)
+                     for rise, length in zip(rises, lengths)]
+
+    segments.sort(key=lambda segment: segment[0])
+
+    for rate, length, vid in segments:
+        if excess <= 0 or rate >= slack_penalty:
+            break
+
+        removed = min(length, excess)
+        cross_times[vid] -= removed
+        excess -= removed
+
+    return cross_times
+
+
+def format_deviation(name: str, curve: ConvexCurve) -> str:
+    """Format how far a cost function deviates from its envelope
+
+    :param name: curve name, for example its file name
+    :param curve: convex envelope
+    :return: one line report
+    """
+    return f'{name}: envelope deviates by at most {curve.max_deviation:.3g} ' \
+           f'({curve.relative_deviation:.2%})'
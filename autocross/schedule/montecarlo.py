@@ -0,0 +1,174 @@
+"""Monte Carlo evaluation of crossing orders
+
+This module evaluates many randomly drawn crossing orders at once.
+Orders, start times and costs are stored as arrays with one row per
+sample and one column per vehicle, so every step is a vectorized NumPy
+operation instead of a Python loop over samples.
+"""
+# Standard library imports
+from typing import Final, Optional, Sequence
+
+# Third party imports
+import numpy as np
+
+# Local application imports
+from autocross import crossing_schedule
+from autocross.analyze import metrics
+from autocross.schedule import conflicts
+from autocross.schedule import queues
+
+
+DEFAULT_PERCENTILES: Final[tuple] = (5, 25, 50, 75, 95)
+DEFAULT_CHUNK_SIZE: Final[int] = 1024
+
+
+def random_arrival_orders(num_vehicles: int, num_samples: int,
+                          seed: Optional[int] = None,
+                          chunk_size: int = DEFAULT_CHUNK_SIZE) -> np.ndarray:
+    """Draw first-come-first-serve orders for random arrivals
+
+    Arrival times are drawn uniformly for every vehicle, and each
+    sample's crossing order is the arrival order. Samples are drawn in
+    chunks, where every chunk uses its own generator spawned from the
+    seed. Results therefore do not depend on the global random state
+    and are reproducible for a given seed and chunk size.
+
+    :param num_vehicles: number of vehicles
+    :param num_samples: number of orders to draw
+    :param seed: (optional) seed for the generators
+    :param chunk_size: number of samples drawn per generator
+    :return: array of shape (num_samples, num_vehicles) where each row
+    holds crossing slots indexed by vehicle ID
+    """
+    num_chunks = -(-num_samples // chunk_size)
+    seeds = np.random.SeedSequence(seed).spawn(num_chunks)
+
+    orders = np.empty((num_samples, num_vehicles), dtype=np.int64)
+
+    for index, chunk_seed in enumerate(seeds):
+        rows = slice(index * chunk_size,
+                     min((index + 1) * chunk_size, num_samples))
+        generator = np.random.default_rng(chunk_seed)
+
+        arrival_times = generator.random((rows.stop - rows.start,
+                                          num_vehicles))
+        orders[rows] = slots_from_values(arrival_times)
+
+    return orders
+
+
+def slots_from_values(values: np.ndarray) -> np.ndarray:
+    """Return non-decreasing crossing slots for each row of values
+
+    This is the row-wise counterpart of
+    `scheduling.scheduled_first_come_first_serve`.
+
+    :param values: array of shape (num_samples, num_vehicles)
+    :return: array of crossing slots with the same shape
+    """
+    return crossing_schedule.slots_from_values(values)
+
+
+def serial_start_times(orders: np.ndarray,
+                       crossing_times: Sequence) -> np.ndarray:
+    """Calculate start times for every sampled order
+
+    Vehicles cross one at a time, so each start time is the sum of the
+    crossing times of all vehicles in earlier slots. This is the
+    row-wise counterpart of `crossing_schedule.Schedule.start_times`.
+
+    :param orders: array of crossing slots of shape
+    (num_samples, num_vehicles)
+    :param crossing_times: list of crossing times indexed by vehicle ID
+    :return: array of start times with the same shape as `orders`
+    """
+    crossing_times = np.asarray(crossing_times, dtype=float)
+
+    permutations = np.argsort(orders, axis=1)
+    slot_times = crossing_times[permutations]
+    slot_starts = np.cumsum(slot_times, axis=1) - slot_times
+
+    return np.take_along_axis(slot_starts, orders, axis=1)
+
+
+def concurrent_start_times(orders: np.ndarray, crossing_times: Sequence,
+                           movements: Sequence,
+                           conflict_graph: Optional[dict] = None
+                           ) -> np.ndarray:
+    """Calculate start times for every sampled order with movements
+
+    Like `build.build_schedule` with movements, each order is repaired
+    to keep the lane queue order, and non-conflicting vehicles may
+    cross concurrently. Vehicles are admitted one at a time, so the
+    samples are evaluated in a loop.
+
+    :param orders: array of crossing slots of shape
+    (num_samples, num_vehicles)
+    :param crossing_times: list of crossing times indexed by vehicle ID
+    :param movements: list of (lane, direction) tuples indexed by
+    vehicle ID
+    :param conflict_graph: (optional) conflict graph for `movements`.
+    Defaults to the four-way intersection.
+    :return: array of start times with the same shape as `orders`
+    """
+    lanes = [lane for lane, _ in movements]
+    start_times = np.empty(np.shape(orders), dtype=float)
+
+    for row, order in enumerate(orders):
+        order = queues.enforce_lane_precedence(order, lanes)
+        start_times[row] = conflicts.start_times_concurrent(
+            order, crossing_times, movements, conflict_graph)
+
+    return start_times
+
+
+def schedule_costs(orders: np.ndarray, crossing_times: Sequence,
+                   wait_funcs: Sequence, cross_costs: Sequence,
+                   movements: Optional[Sequence] = None,
+                   conflict_graph: Optional[dict] = None) -> np.ndarray:
+    """Calculate the schedule cost of every sampled order
+
+    :param orders: array of crossing slots of shape
+    (num_samples, num_vehicles)
+    :param crossing_times: list of crossing times indexed by vehicle ID
+    :param wait_funcs: list of waiting cost functions indexed by
+    vehicle ID
+    :param cross_costs: list of crossing costs indexed by vehicle ID.
+    Crossing costs do not depend on the order.
+    :param movements: (optional) list of (lane, direction) tuples. If
+    given, start times come from `concurrent_start_times` instead of
+    serial crossings.
+    :param conflict_graph: (optional) conflict graph for `movements`
+    :return: array of schedule costs, one per sample
+    """
+    if movements:
+        start_times = concurrent_start_times(orders, crossing_times,
+                                             movements, conflict_graph)
+    else:
+        start_times = serial_start_times(orders, crossing_times)
+    wait_costs = metrics.evaluate_cost_matrix(wait_funcs, start_times)
+
+    return wait_costs.sum(axis=1) + float(np.sum(cross_costs))
+
+
+def summarize(values: np.ndarray,
+              percentiles: Sequence = DEFAULT_PERCENTILES) -> dict:
+    """Summarize a distribution of sampled values
+
+    :param values: array of sampled values
+    :param percentiles: percentiles to report
+    :return: dict with the mean, standard deviation, minimum, maximum
+    and the requested percentiles
+    """
+    summary = {
+        'mean': float(np.mean(values)),
+        'std': float(np.std(values)),
+        'min': float(np.min(values)),
+        'max': float(np.max(values))
+    }
+
+    for percentile, value in zip(percentiles,
+                                 np.percentile(values, percentiles)):
+        summary[f'p{percentile}'] = float(value)
+
+    return summary
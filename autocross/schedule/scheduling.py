@@ -1,6 +1,8 @@
 import random
 from typing import Optional
 
+from autocross import crossing_schedule
+
 
 def scheduled_random(num_vehicles: int, seed: Optional = None) -> list:
     """Return a random crossing order
@@ -11,14 +13,16 @@ def scheduled_random(num_vehicles: int, seed: Optional = None) -> list:
     in slot 0, and vehicle 2 would be in slot 2. The returned list would
     look like [1, 0, 2].
 
+    The shuffler uses its own generator, so the global `random` state
+    is left untouched.
+
     :param num_vehicles: number of vehicles
     :param seed: (optional) seed value for shuffler
     :return: list of crossing slots where element index corresponds
     to vehicle ID
     """
-    random.seed(seed)
     vehicles = list(range(num_vehicles))
-    random.shuffle(vehicles)
+    random.Random(seed).shuffle(vehicles)
 
     return vehicles
 
@@ -72,15 +76,4 @@ def _scheduled_non_decreasing(values: list) -> list:
     :return: list of values with a value representing where in a sorted list
     it would be located.
     """
-    tuples_list = [(value, index) for index, value in enumerate(values)]
-    schedule = [-1] * len(values)
-
-    # tuples_list is [(value, original index), (value, original index), ...]
-    # When enumerating we get [(sort index, value, original index), ...]
-    for sort_index, tup_elem in enumerate(sorted(tuples_list)):
-        _, original_index = tup_elem
-        schedule[original_index] = sort_index
-
-    assert -1 not in schedule, 'At least one vehicle did not get scheduled'
-
-    return schedule
+    return crossing_schedule.slots_from_values(values).tolist()
@@ -1,9 +1,16 @@
-from typing import Final, Sequence
+import sys
+from typing import Final, Optional, Sequence
 
 import casadi
+import numpy as np
+
+from autocross import budgets
+from autocross import tracing
 
 
 EPSILON: Final = 0.00001
+SLACK_PENALTY: Final = 100
+SWEEP_GRID_POINTS: Final = 1000
 
 
 def assign_optimal_crossing_times(cost_funcs: Sequence,
@@ -23,6 +30,11 @@ def assign_optimal_crossing_times(cost_funcs: Sequence,
     functions must be CasADi `interpolant` objects.
     :param cost_bounds: list of vehicle' crossing function bounds. List
     elements should be tuples formatted as `[(lower, upper), ...]`
+    :param kwargs: (optional) 'cross_sum' soft limit on the sum of the
+    crossing times, 'slack_penalty' cost per unit of time above that
+    limit, and 'budget' of the solve. If the solve runs out of its
+    budget, each vehicle gets its own cheapest crossing time from
+    `independent_minima` instead.
     :return: list of vehicles' assigned crossing times. The vehicle
     ordering is preserved.
     """
@@ -33,26 +45,241 @@ def assign_optimal_crossing_times(cost_funcs: Sequence,
     time_vars = [opti.variable() for _ in cost_funcs]
     time_costs = [func(time) for func, time in zip(cost_funcs, time_vars)]
 
-    slack_var = opti.variable()
-
-    # opti.minimize(sum(time_costs))
-    opti.minimize(sum(time_costs) + 100 * slack_var)
-
     for time, bounds in zip(time_vars, cost_bounds):
         lower = bounds[0] + EPSILON
         upper = bounds[1] - EPSILON
         opti.subject_to(opti.bounded(lower, time, upper))
 
     if 'cross_sum' in kwargs:
+        # The slack is only bounded below when the crossing sum
+        # constraint exists, otherwise the objective is unbounded
+        slack_var = opti.variable()
+
         # opti.subject_to(sum(time_vars) <= kwargs['cross_sum'])
         opti.subject_to(sum(time_vars) <= kwargs['cross_sum'] + slack_var)
         opti.subject_to(slack_var >= 0)
+        slack_penalty = kwargs.get('slack_penalty', SLACK_PENALTY)
+        opti.minimize(sum(time_costs) + slack_penalty * slack_var)
+    else:
+        opti.minimize(sum(time_costs))
 
     try:
-        opti.solver('ipopt')
-        solution = opti.solve()
+        opti.solver('ipopt', budgets.solver_options(kwargs.get('budget'), {}))
+        with tracing.span('solve', num_vehicles=len(cost_funcs)):
+            solution = opti.solve()
+    except budgets.BudgetExceeded as error:
+        return _fall_back(cost_funcs, cost_bounds, error)
     except RuntimeError:
+        try:
+            budgets.check_status(opti.stats())
+        except budgets.BudgetExceeded as error:
+            return _fall_back(cost_funcs, cost_bounds, error)
         raise ValueError('Cannot assign crossing times with given cost '
                          'functions and bounds')
 
     return [solution.value(time_var) for time_var in time_vars]
+
+
+def independent_minima(cost_funcs: Sequence, cost_bounds: Sequence,
+                       num_points: int = SWEEP_GRID_POINTS) -> list:
+    """Assign each vehicle its cheapest crossing time on a grid
+
+    No solver is involved, so this is a fast heuristic when the
+    crossing time assignment cannot be solved in time. A crossing sum
+    is not respected. Cost functions that are solved on demand, like
+    lazy cost curves, are evaluated through their `spline` of the
+    points solved so far, so the grid triggers no further solves.
+
+    :param cost_funcs: list of vehicles' crossing functions
+    :param cost_bounds: list of vehicles' crossing function bounds
+    :param num_points: number of grid points per vehicle
+    :return: list of crossing times indexed by vehicle ID
+    """
+    cross_times = []
+
+    for func, bounds in zip(cost_funcs, cost_bounds):
+        func = getattr(func, 'spline', func)
+        grid = np.linspace(bounds[0] + EPSILON, bounds[1] - EPSILON,
+                           num_points)
+        values = np.ravel(np.asarray(func(grid)))
+        cross_times.append(float(grid[np.argmin(values)]))
+
+    return cross_times
+
+
+def _fall_back(cost_funcs: Sequence, cost_bounds: Sequence,
+               error: Exception) -> list:
+    """Assign crossing times after the solve ran out of budget
+
+    :param cost_funcs: list of vehicles' crossing functions
+    :param cost_bounds: list of vehicles' crossing function bounds
+    :param error: reason the solve stopped
+    :return: list of crossing times from `independent_minima`
+    """
+    print(f'Crossing time assignment timed out ({error}), using '
+          f'independent minima', file=sys.stderr)
+
+    with tracing.span('fallback', num_vehicles=len(cost_funcs)):
+        return independent_minima(cost_funcs, cost_bounds)
+
+
+class CrossingTimeProblem:
+    """Parametric crossing time assignment problem
+
+    The problem is built once with the crossing sum as a parameter, so
+    it can be re-solved for many crossing sums without rebuilding it.
+    Every solve is warm-started from the previous solution, including
+    its constraint multipliers.
+    """
+    def __init__(self, cost_funcs: Sequence, cost_bounds: Sequence,
+                 slack_penalty: float = SLACK_PENALTY) -> None:
+        """Init function
+
+        :param cost_funcs: list of vehicles' crossing functions. Cost
+        functions must be CasADi `interpolant` objects.
+        :param cost_bounds: list of vehicle' crossing function bounds
+        formatted as `[(lower, upper), ...]`
+        :param slack_penalty: cost per unit of time above the crossing sum
+        :return: None
+        """
+        assert(len(cost_funcs) == len(cost_bounds))
+
+        opti = casadi.Opti()
+
+        self._time_vars = opti.variable(len(cost_funcs))
+        self._slack_var = opti.variable()
+        self._cross_sum = opti.parameter()
+
+        self._total_cost = sum(func(self._time_vars[index])
+                               for index, func in enumerate(cost_funcs))
+
+        opti.minimize(self._total_cost + slack_penalty * self._slack_var)
+
+        for index, bounds in enumerate(cost_bounds):
+            lower = bounds[0] + EPSILON
+            upper = bounds[1] - EPSILON
+            opti.subject_to(opti.bounded(lower, self._time_vars[index], upper))
+
+        opti.subject_to(casadi.sum1(self._time_vars)
+                        <= self._cross_sum + self._slack_var)
+        opti.subject_to(self._slack_var >= 0)
+
+        options = {
+            'ipopt.print_level': 0,  # Minimal printing
+            'ipopt.sb': 'yes',  # Silence banner header
+            'print_time': False,
+            'ipopt.warm_start_init_point': 'yes'
+        }
+        opti.solver('ipopt', options)
+
+        self._opti = opti
+        self._solution = None
+
+    def solve(self, cross_sum: float,
+              initial: Optional[Sequence] = None) -> tuple:
+        """Solve the problem for a crossing sum
+
+        :param cross_sum: soft limit on the sum of the crossing times
+        :param initial: (optional) initial crossing times. Defaults to
+        the previous solution.
+        :return: tuple formatted as (total crossing cost, crossing times)
+        """
+        opti = self._opti
+        opti.set_value(self._cross_sum, cross_sum)
+
+        if initial is not None:
+            opti.set_initial(self._time_vars, initial)
+        elif self._solution is not None:
+            opti.set_initial(self._solution.value_variables())
+            opti.set_initial(opti.lam_g, self._solution.value(opti.lam_g))
+
+        try:
+            with tracing.span('solve', cross_sum=float(cross_sum)):
+                self._solution = opti.solve()
+        except RuntimeError:
+            raise ValueError(f'Cannot assign crossing times for crossing '
+                             f'sum {cross_sum}')
+
+        times = np.atleast_1d(self._solution.value(self._time_vars))
+
+        return float(self._solution.value(self._total_cost)), times.tolist()
+
+
+def sweep_cross_sum(cost_funcs: Sequence, cost_bounds: Sequence,
+                    cross_sums: Sequence, **kwargs) -> list:
+    """Trace crossing cost against the crossing sum by re-solving
+
+    Crossing sums are solved from the largest to the smallest so each
+    solve starts from the solution of its neighbour.
+
+    :param cost_funcs: list of vehicles' crossing functions
+    :param cost_bounds: list of vehicles' crossing function bounds
+    :param cross_sums: crossing sums to solve for
+    :param kwargs: further arguments passed to `CrossingTimeProblem`
+    :return: list of tuples formatted as (crossing sum, total crossing
+    cost, crossing times), where the crossing sum is the sum of the
+    assigned times. Sorted by decreasing crossing sum.
+    """
+    problem = CrossingTimeProblem(cost_funcs, cost_bounds, **kwargs)
+
+    initial = [(bounds[0] + bounds[1]) / 2 for bounds in cost_bounds]
+    results = []
+
+    for cross_sum in sorted(cross_sums, reverse=True):
+        cost, times = problem.solve(cross_sum, initial)
+        results.append((sum(times), cost, times))
+        initial = None
+
+    return results
+
+
+def sweep_multipliers(cost_funcs: Sequence, cost_bounds: Sequence,
+                      multipliers: Optional[Sequence] = None,
+                      num_multipliers: int = 20,
+                      num_points: int = SWEEP_GRID_POINTS) -> list:
+    """Trace crossing cost against the crossing sum by pricing time
+
+    The objective separates per vehicle, so for a price (multiplier) on
+    total crossing time every vehicle independently minimizes its cost
+    plus the price times its crossing time. Each cost function is
+    evaluated once on a grid of `num_points` times, and every
+    multiplier is then an argmin over that grid. The sweep yields the
+    points of the trade-off curve that lie on its convex hull, exact up
+    to the grid resolution.
+
+    :param cost_funcs: list of vehicles' crossing functions
+    :param cost_bounds: list of vehicles' crossing function bounds
+    :param multipliers: (optional) prices on total crossing time. By
+    default `num_multipliers` prices are spread from zero up to the
+    steepest cost decrease found on the grids.
+    :param num_multipliers: number of default multipliers
+    :param num_points: number of grid points per vehicle
+    :return: list of tuples formatted as (crossing sum, total crossing
+    cost, crossing times), sorted by decreasing crossing sum
+    """
+    grids = [np.linspace(bounds[0] + EPSILON, bounds[1] - EPSILON, num_points)
+             for bounds in cost_bounds]
+    grid_costs = [np.ravel(np.asarray(func(grid)))
+                  for func, grid in zip(cost_funcs, grids)]
+
+    if multipliers is None:
+        max_price = max(float(np.max(-np.gradient(costs, grid)))
+                        for costs, grid in zip(grid_costs, grids))
+        multipliers = np.linspace(0, max(max_price, 0), num_multipliers)
+
+    multipliers = np.asarray(multipliers, dtype=float)[:, np.newaxis]
+
+    # Rows are multipliers, columns are vehicles
+    times = np.empty((multipliers.shape[0], len(cost_funcs)))
+    costs = np.empty_like(times)
+
+    for vid, (grid, grid_cost) in enumerate(zip(grids, grid_costs)):
+        best = np.argmin(grid_cost + multipliers * grid, axis=1)
+        times[:, vid] = grid[best]
+        costs[:, vid] = grid_cost[best]
+
+    results = [(float(np.sum(row_times)), float(np.sum(row_costs)),
+                row_times.tolist())
+               for row_times, row_costs in zip(times, costs)]
+
+    return sorted(results, key=lambda result: result[0], reverse=True)
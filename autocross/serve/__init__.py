@@ -0,0 +1 @@
+from .cmd_main import serve_main
@@ -0,0 +1,86 @@
+"""Least recently used cache
+
+This module contains the bounded cache used by the scheduling service
+to keep cost functions and crossing time problems in memory.
+"""
+# Standard library imports
+import collections
+from typing import Any, Callable, Hashable
+
+
+class LRUCache:
+    """Least recently used cache
+
+    The cache holds at most `max_size` entries. When it is full, the
+    entry that was used longest ago is evicted.
+    """
+    def __init__(self, max_size: int) -> None:
+        """Init function
+
+        :param max_size: maximum number of entries, at least 1
+        :return: None
+        """
+        assert max_size >= 1, 'Cache size must be at least 1'
+
+        self._entries = collections.OrderedDict()
+        self._max_size = max_size
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, key: Hashable, factory: Callable[[], Any]) -> Any:
+        """Get an entry, creating it on a miss
+
+        :param key: entry key
+        :param factory: callable without arguments creating the entry
+        :return: cached or newly created entry
+        """
+        if key in self._entries:
+            self._hits += 1
+            self._entries.move_to_end(key)
+            return self._entries[key]
+
+        self._misses += 1
+        value = factory()
+        self._entries[key] = value
+
+        if len(self._entries) > self._max_size:
+            self._entries.popitem(last=False)
+
+        return value
+
+    def clear(self) -> None:
+        """Remove all entries
+
+        :return: None
+        """
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        """Get cache usage
+
+        :return: dict with the keys 'size', 'max_size', 'hits' and
+        'misses'
+        """
+        return {
+            'size': len(self._entries),
+            'max_size': self._max_size,
+            'hits': self._hits,
+            'misses': self._misses
+        }
+
+    def __contains__(self, key: Hashable) -> bool:
+        """Check whether an entry is cached
+
+        Checking does not count as a use of the entry.
+
+        :param key: entry key
+        :return: True if the entry is cached
+        """
+        return key in self._entries
+
+    def __len__(self) -> int:
+        """Get number of cached entries
+
+        :return: number of cached entries
+        """
+        return len(self._entries)
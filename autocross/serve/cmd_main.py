@@ -0,0 +1,30 @@
+# Standard library imports
+import argparse
+from typing import Callable, Optional
+
+# Local application imports
+from autocross.cmd_dispatch import CmdDispatcher
+from autocross.serve import server
+from autocross.serve import service
+
+
+def serve_main(args: argparse.Namespace,
+               dispatcher: Optional[CmdDispatcher] = None,
+               parse_args: Optional[Callable] = None) -> int:
+    # Commands can write any file, so they are only served on request
+    if not args.enable_commands:
+        dispatcher, parse_args = None, None
+
+    schedule_service = service.ScheduleService(
+        dispatcher, parse_args, args.conflict_file,
+        curve_cache_size=args.curve_cache_size,
+        solver_cache_size=args.solver_cache_size)
+
+    for filepath in args.preload or []:
+        schedule_service.load_curve(filepath)
+
+    httpd = server.make_server(schedule_service, args.host, args.port,
+                               args.socket, args.verbose)
+    server.serve(httpd)
+
+    return 0
@@ -0,0 +1,205 @@
+"""HTTP front end of the scheduling service
+
+This module serves a `ScheduleService` over HTTP on a TCP port or a
+Unix socket. Requests are POSTed as JSON objects to the service routes
+and answered with JSON objects. Requests are handled one at a time, so
+cached solvers are never used concurrently.
+
+The server is meant for local clients, not browsers. Requests with an
+'Origin' header and POSTs that are not 'application/json' are refused,
+so a web page cannot reach the service with a cross-site request.
+"""
+# Standard library imports
+import http.server
+import json
+import os
+import socketserver
+import stat
+import sys
+from typing import Final, Optional
+
+# Local application imports
+from autocross.serve.service import ScheduleService
+
+
+JSON_CONTENT_TYPE: Final[str] = 'application/json'
+
+
+class _RequestHandler(http.server.BaseHTTPRequestHandler):
+    """Request handler passing JSON requests to the service
+
+    """
+    def do_GET(self) -> None:
+        """Answer a request without data
+
+        :return: None
+        """
+        if self._refuse_cross_origin():
+            return
+
+        self._answer({})
+
+    def do_POST(self) -> None:
+        """Answer a request with JSON data
+
+        :return: None
+        """
+        if self._refuse_cross_origin():
+            return
+
+        content_type = self.headers.get('Content-Type', '')
+        if content_type.split(';')[0].strip().lower() != JSON_CONTENT_TYPE:
+            self._reply(415, {'error': f'Content-Type must be '
+                                       f'{JSON_CONTENT_TYPE}'})
+            return
+
+        length = int(self.headers.get('Content-Length', 0))
+
+        try:
+            request = json.loads(self.rfile.read(length) or b'{}')
+        except json.JSONDecodeError as error:
+            self._reply(400, {'error': f'Invalid JSON: {error}'})
+            return
+
+        if not isinstance(request, dict):
+            self._reply(400, {'error': 'Request must be a JSON object'})
+            return
+
+        self._answer(request)
+
+    def _refuse_cross_origin(self) -> bool:
+        """Refuse a request sent by a web page
+
+        Browsers add an 'Origin' header to cross-site requests, local
+        clients do not.
+
+        :return: True if the request was refused
+        """
+        if 'Origin' not in self.headers:
+            return False
+
+        self._reply(403, {'error': 'Cross-origin requests are refused'})
+        return True
+
+    def _answer(self, request: dict) -> None:
+        """Pass a request to the service and send its response
+
+        :param request: request data
+        :return: None
+        """
+        service = self.server.service
+
+        if self.path not in service.routes:
+            self._reply(404, {'error': f'Unknown route {self.path}'})
+            return
+
+        try:
+            response = service.handle(self.path, request)
+        except (AssertionError, KeyError, TypeError, ValueError,
+                OSError) as error:
+            self._reply(400, {'error': f'{type(error).__name__}: {error}'})
+            return
+
+        self._reply(200, response)
+
+    def _reply(self, status: int, data: dict) -> None:
+        """Send a JSON response
+
+        :param status: HTTP status code
+        :param data: response data
+        :return: None
+        """
+        body = json.dumps(data).encode()
+
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def address_string(self) -> str:
+        """Get the client address for logging
+
+        :return: client host, or 'unix' for Unix socket clients
+        """
+        if isinstance(self.client_address, tuple):
+            return self.client_address[0]
+
+        return 'unix'
+
+    def log_message(self, format: str, *args) -> None:
+        """Log a request if the server is verbose
+
+        :param format: message format
+        :param args: message arguments
+        :return: None
+        """
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+class _UnixHTTPServer(socketserver.UnixStreamServer):
+    """HTTP server listening on a Unix socket
+
+    """
+
+
+def make_server(service: ScheduleService, host: str = '127.0.0.1',
+                port: int = 0, socket_path: Optional[str] = None,
+                verbose: bool = False) -> socketserver.BaseServer:
+    """Create a server for a scheduling service
+
+    :param service: scheduling service answering the requests
+    :param host: host to listen on
+    :param port: TCP port to listen on. Port 0 picks a free port.
+    :param socket_path: (optional) path of a Unix socket to listen on
+    instead of a TCP port. A stale socket at the path is replaced.
+    :param verbose: log every request to stderr
+    :return: server, not yet serving
+    """
+    if socket_path is not None:
+        if os.path.exists(socket_path) and \
+                stat.S_ISSOCK(os.stat(socket_path).st_mode):
+            os.remove(socket_path)
+
+        server = _UnixHTTPServer(socket_path, _RequestHandler)
+    else:
+        server = http.server.HTTPServer((host, port), _RequestHandler)
+
+    server.service = service
+    server.verbose = verbose
+
+    return server
+
+
+def server_address(server: socketserver.BaseServer) -> str:
+    """Format the address a server listens on
+
+    :param server: server returned by `make_server`
+    :return: 'http://<host>:<port>' or 'unix:<path>'
+    """
+    if isinstance(server.server_address, tuple):
+        host, port = server.server_address[:2]
+        return f'http://{host}:{port}'
+
+    return f'unix:{server.server_address}'
+
+
+def serve(server: socketserver.BaseServer) -> None:
+    """Serve requests until interrupted
+
+    :param server: server returned by `make_server`
+    :return: None
+    """
+    print(f'Serving on {server_address(server)}', file=sys.stderr,
+          flush=True)
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+        if not isinstance(server.server_address, tuple):
+            os.remove(server.server_address)
@@ -0,0 +1,300 @@
+"""Scheduling service
+
+This module answers schedule and analyze requests from memory. Cost
+functions are loaded once per file version and crossing time problems
+are built once per fleet, so a request costs only the solve and the
+evaluation. Requests and responses are dicts that map directly to JSON.
+
+Without a crossing sum the crossing time assignment separates by
+vehicle, so each cost function's optimal crossing time is solved once
+and kept with the function. With a crossing sum, the fleet's parametric
+problem is kept and warm-started from its previous solution.
+"""
+# Standard library imports
+import contextlib
+import io
+import os
+import time
+from dataclasses import dataclass
+from typing import Callable, Final, Optional, Sequence
+
+# Local application imports
+from autocross import fileio
+from autocross import tracing
+from autocross.analyze import batch
+from autocross.cmd_dispatch import CmdDispatcher
+from autocross.crossing_schedule import Schedule
+from autocross.schedule import build
+from autocross.schedule import conflicts
+from autocross.schedule import times
+from autocross.serve.cache import LRUCache
+
+
+DEFAULT_CURVE_CACHE_SIZE: Final[int] = 1024
+DEFAULT_SOLVER_CACHE_SIZE: Final[int] = 16
+
+
+@dataclass
+class CachedCurve:
+    """Cost function loaded from file
+
+    """
+    func: object
+    """Cost function"""
+    bounds: tuple
+    """Cost function bounds"""
+    optimal_time: Optional[float] = None
+    """Optimal crossing time, solved on first use"""
+
+
+class ScheduleService:
+    """Scheduling service
+
+    Routes are '/schedule', '/analyze', '/stats' and '/health'. With a
+    dispatcher and a parser, the '/command' route additionally runs any
+    registered command handler on a command line, so every command is
+    available without process start-up. Commands can write any file,
+    so the route only exists when enabled.
+    """
+    def __init__(self, dispatcher: Optional[CmdDispatcher] = None,
+                 parse_args: Optional[Callable] = None,
+                 conflict_file: Optional[str] = None,
+                 curve_cache_size: int = DEFAULT_CURVE_CACHE_SIZE,
+                 solver_cache_size: int = DEFAULT_SOLVER_CACHE_SIZE) -> None:
+        """Init function
+
+        :param dispatcher: (optional) command dispatcher used by the
+        '/command' route. The route is enabled if both the dispatcher
+        and the parser are given.
+        :param parse_args: (optional) command line parser used by the
+        '/command' route
+        :param conflict_file: (optional) path to the conflict file used
+        for requests with movements. Defaults to the four-way
+        intersection.
+        :param curve_cache_size: maximum number of cached cost functions
+        :param solver_cache_size: maximum number of cached crossing time
+        problems
+        :return: None
+        """
+        self._dispatcher = dispatcher
+        self._parse_args = parse_args
+        self._conflict_graph = conflicts.load_conflict_graph(conflict_file)
+        self._curves = LRUCache(curve_cache_size)
+        self._solvers = LRUCache(solver_cache_size)
+        self._requests = 0
+        self._start = time.monotonic()
+
+        self.routes = {
+            '/schedule': self.schedule,
+            '/analyze': self.analyze,
+            '/stats': self.stats,
+            '/health': lambda _: {'status': 'ok'}
+        }
+
+        if dispatcher is not None and parse_args is not None:
+            self.routes['/command'] = self.command
+
+    def handle(self, route: str, request: dict) -> dict:
+        """Answer a request
+
+        :param route: request route
+        :param request: request data
+        :return: response data, including the handling time in
+        milliseconds as 'elapsed_ms'
+        :raises: KeyError if the route is unknown
+        """
+        start = time.perf_counter()
+
+        with tracing.span(route, 'request'):
+            response = self.routes[route](request)
+        self._requests += 1
+
+        response['elapsed_ms'] = (time.perf_counter() - start) * 1000
+
+        return response
+
+    def load_curve(self, filepath: str) -> tuple:
+        """Load a cost function through the cache
+
+        Files are keyed by path, modification time and size, so an
+        updated file is loaded again.
+
+        :param filepath: path to a cost or wait file
+        :return: tuple formatted as (cache key, cached curve)
+        """
+        status = os.stat(filepath)
+        key = (os.path.abspath(filepath), status.st_mtime_ns, status.st_size)
+
+        curve = self._curves.get(key, lambda: CachedCurve(
+            *fileio.parse_cost_data(fileio.read_cost_file(filepath))))
+
+        return key, curve
+
+    def crossing_times(self, keys: Sequence, curves: Sequence,
+                       cross_sum: Optional[float] = None,
+                       slack_penalty: float = times.SLACK_PENALTY) -> list:
+        """Assign optimal crossing times through the caches
+
+        :param keys: cache keys of the cost functions
+        :param curves: cached cost functions
+        :param cross_sum: (optional) soft limit on the sum of the
+        crossing times
+        :param slack_penalty: cost per unit of time above `cross_sum`
+        :return: list of crossing times indexed by vehicle ID
+        """
+        if cross_sum is None:
+            for curve in curves:
+                if curve.optimal_time is None:
+                    problem = times.CrossingTimeProblem([curve.func],
+                                                        [curve.bounds])
+                    _, (curve.optimal_time,) = problem.solve(
+                        curve.bounds[1], [sum(curve.bounds) / 2])
+
+            return [curve.optimal_time for curve in curves]
+
+        key = (tuple(keys), slack_penalty)
+        initial = None
+
+        if key not in self._solvers:
+            initial = [sum(curve.bounds) / 2 for curve in curves]
+
+        problem = self._solvers.get(key, lambda: times.CrossingTimeProblem(
+            [curve.func for curve in curves],
+            [curve.bounds for curve in curves], slack_penalty))
+
+        return problem.solve(cross_sum, initial)[1]
+
+    def schedule(self, request: dict) -> dict:
+        """Build a crossing schedule
+
+        Request keys are 'cost_files' and the optional 'wait_files',
+        'schedule_type' (default 'fcf'), 'movements' as
+        'lane:direction' strings, 'arrival_times', 'seed', 'cross_sum'
+        and 'slack_penalty'.
+
+        :param request: request data
+        :return: schedule data, with the schedule's 'analysis' if wait
+        files are given
+        """
+        schedule_type = request.get('schedule_type', 'fcf')
+        keys, curves = zip(*[self.load_curve(filepath)
+                             for filepath in request['cost_files']])
+        wait_curves = [self.load_curve(filepath)[1]
+                       for filepath in request.get('wait_files', [])]
+        movements = [conflicts.parse_movement(movement)
+                     for movement in request.get('movements', [])]
+
+        # Like the `schedule` command, only 'fcf' limits the crossing sum
+        cross_sum = request.get('cross_sum') if schedule_type == 'fcf' \
+            else None
+        cross_times = self.crossing_times(
+            keys, curves, cross_sum,
+            request.get('slack_penalty', times.SLACK_PENALTY))
+
+        cost_funcs = [curve.func for curve in curves]
+        wait_funcs = [curve.func for curve in wait_curves]
+        schedule = build.build_schedule(
+            schedule_type, cost_funcs, [curve.bounds for curve in curves],
+            wait_funcs, [curve.bounds for curve in wait_curves], movements,
+            self._conflict_graph, request.get('arrival_times'),
+            request.get('seed'), cross_times=cross_times)
+
+        response = schedule_to_json(schedule)
+
+        if wait_funcs:
+            response['analysis'] = batch.evaluate_schedules(
+                [schedule], cost_funcs, wait_funcs)[0]
+
+        return response
+
+    def analyze(self, request: dict) -> dict:
+        """Evaluate crossing schedules
+
+        Request keys are 'cost_files', 'wait_files' and either
+        'schedules' as schedule data or 'schedule_files'. With the
+        optional 'movements', start times are recalculated allowing
+        concurrent crossings.
+
+        :param request: request data
+        :return: dict with the schedule, wait and crossing costs and the
+        clearing time of each schedule as 'results'
+        """
+        cost_funcs = [self.load_curve(filepath)[1].func
+                      for filepath in request['cost_files']]
+        wait_funcs = [self.load_curve(filepath)[1].func
+                      for filepath in request['wait_files']]
+        movements = [conflicts.parse_movement(movement)
+                     for movement in request.get('movements', [])]
+
+        schedules = [Schedule.from_dict(data)
+                     for data in request.get('schedules', [])]
+        schedules += [fileio.read_schedule(filepath)
+                      for filepath in request.get('schedule_files', [])]
+
+        return {'results': batch.evaluate_schedules(schedules, cost_funcs,
+                                                    wait_funcs, movements,
+                                                    self._conflict_graph)}
+
+    def command(self, request: dict) -> dict:
+        """Run a command handler on a command line
+
+        Handler output printed from Python is captured and returned.
+
+        :param request: request data with the command line as 'argv'
+        :return: dict with the handler's 'exit_code' and 'output'
+        """
+        assert self._dispatcher is not None and \
+            self._parse_args is not None, 'Commands are not enabled'
+
+        output = io.StringIO()
+
+        with contextlib.redirect_stdout(output), \
+                contextlib.redirect_stderr(output):
+            try:
+                args = self._parse_args(list(request['argv']))
+            except SystemExit as error:
+                # Help requests exit successfully after printing
+                if not error.code:
+                    return {'exit_code': 0, 'output': output.getvalue()}
+
+                raise ValueError(output.getvalue().strip())
+
+            assert args.command != 'serve', 'Cannot serve from a request'
+            exit_code = self._dispatcher.dispatch(
+                args.command, args, trace_file=args.trace,
+                profile=args.profile, trace_memory=args.trace_memory)
+
+        return {'exit_code': exit_code, 'output': output.getvalue()}
+
+    def stats(self, _: Optional[dict] = None) -> dict:
+        """Get service usage
+
+        :return: dict with the cache usage, number of answered requests
+        and uptime in seconds
+        """
+        return {
+            'curves': self._curves.stats(),
+            'solvers': self._solvers.stats(),
+            'requests': self._requests,
+            'uptime': time.monotonic() - self._start
+        }
+
+
+def schedule_to_json(schedule: Schedule) -> dict:
+    """Convert a schedule to JSON compatible data
+
+    :param schedule: crossing schedule
+    :return: dict with the crossing order, crossing times, start times
+    and, if the schedule has any, movements as 'lane:direction' strings
+    """
+    data = {
+        'crossing_order': schedule.crossing_order.tolist(),
+        'crossing_times': schedule.crossing_times.tolist(),
+        'start_times': schedule.start_times.tolist()
+    }
+
+    if schedule.movements is not None:
+        data['movements'] = [conflicts.format_movement(tuple(movement))
+                             for movement in schedule.movements]
+
+    return data
@@ -15,6 +15,15 @@ PROGRAM_DESCRIPTION: Final[str] = f'{PROGRAM_NAME} is a tool for scheduling ' \
 SUBPARSERS_TITLE: Final[str] = f'{PROGRAM_NAME} commands'
 SUBPARSERS_DEST: Final[str] = 'command'
 
+# Instrumentation arguments
+ARG_TRACE: Final[str] = '--trace'
+ARG_TRACE_HELP: Final[str] = 'write a Chrome trace of the command to a file'
+ARG_PROFILE: Final[str] = '--profile'
+ARG_PROFILE_HELP: Final[str] = 'profile the command with cProfile'
+ARG_TRACE_MEMORY: Final[str] = '--trace_memory'
+ARG_TRACE_MEMORY_ALIAS: Final[str] = '--trace-memory'
+ARG_TRACE_MEMORY_HELP: Final[str] = 'track memory allocations'
+
 # Calculate subcommand strings
 CALC_PARSER_NAME: Final[str] = 'calculate'
 CALC_PARSER_HELP: Final[str] = "generate a vehicle's crossing cost file"
@@ -23,6 +32,16 @@ CALC_ARG_TIME_MIN: Final[str] = 'time_min'
 CALC_ARG_TIME_MAX: Final[str] = 'time_max'
 CALC_ARG_TIME_STEP: Final[str] = 'time_step'
 CALC_ARG_DIRECTION: Final[str] = '--direction'
+CALC_ARG_MAX_ERROR: Final[str] = '--max_error'
+CALC_ARG_HERMITE: Final[str] = '--hermite'
+CALC_ARG_FLEET: Final[str] = '--fleet'
+CALC_ARG_ALL_DIRECTIONS: Final[str] = '--all_directions'
+CALC_ARG_MAX_SOLVE_TIME: Final[str] = '--max_solve_time'
+CALC_ARG_MAX_ITER: Final[str] = '--max_iter'
+CALC_ARG_DEADLINE: Final[str] = '--deadline'
+CALC_ARG_FILL_TIMEOUTS: Final[str] = '--fill_timeouts'
+CALC_ARG_WARM_START_LIBRARY: Final[str] = '--warm_start_library'
+CALC_ARG_WARM_START_SIZE: Final[str] = '--warm_start_size'
 
 # Schedule subcommand strings
 SCHED_PARSER_NAME: Final[str] = 'schedule'
@@ -30,21 +49,169 @@ SCHED_PARSER_HELP: Final[str] = 'generate a crossing schedule'
 SCHED_ARG_COST_FILES: Final[str] = 'cost_files'
 SCHED_ARG_OUTPUT_FILE: Final[str] = '--output_file'
 SCHED_ARG_CROSS_SUM: Final[str] = '--cross_sum'
+SCHED_ARG_WAIT_FILES: Final[str] = '--wait_files'
+SCHED_ARG_MOVEMENTS: Final[str] = '--movements'
+SCHED_ARG_CONFLICT_FILE: Final[str] = '--conflict_file'
+SCHED_ARG_MONTE_CARLO: Final[str] = '--monte_carlo'
+SCHED_ARG_SEED: Final[str] = '--seed'
+SCHED_ARG_SLACK_PENALTY: Final[str] = '--slack_penalty'
+SCHED_ARG_SWEEP_MIN: Final[str] = '--sweep_min'
+SCHED_ARG_SWEEP_MAX: Final[str] = '--sweep_max'
+SCHED_ARG_SWEEP_STEPS: Final[str] = '--sweep_steps'
+SCHED_ARG_SWEEP_METHOD: Final[str] = '--sweep_method'
+SCHED_ARG_CONVEXIFY: Final[str] = '--convexify'
+SCHED_ARG_LAZY: Final[str] = '--lazy'
+SCHED_ARG_TIME_MIN: Final[str] = '--time_min'
+SCHED_ARG_TIME_MAX: Final[str] = '--time_max'
+SCHED_ARG_TIME_STEP: Final[str] = '--time_step'
+SCHED_ARG_LAZY_TOLERANCE: Final[str] = '--lazy_tolerance'
+SCHED_ARG_MAX_SOLVE_TIME: Final[str] = '--max_solve_time'
+SCHED_ARG_MAX_ITER: Final[str] = '--max_iter'
+SCHED_ARG_DEADLINE: Final[str] = '--deadline'
+SCHED_SWEEP_METHOD_WARM: Final[str] = 'warm'
+SCHED_SWEEP_METHOD_MULTIPLIER: Final[str] = 'multiplier'
 SCHED_ARG_SCHED_TYPE: Final[str] = 'schedule_type'
 SCHED_TYPE_FCF: Final[str] = 'fcf'
 SCHED_TYPE_FCFS: Final[str] = 'fcfs'
 SCHED_TYPE_RAND: Final[str] = 'rand'
 SCHED_TYPE_FIXED: Final[str] = 'fixed'
+SCHED_TYPE_MERGE: Final[str] = 'merge'
+SCHED_TYPE_SWEEP: Final[str] = 'sweep'
+SCHED_ERROR_MULTIPLIER: Final[str] = \
+    '--sweep_min, --sweep_max and --slack_penalty do not apply to ' \
+    '--sweep_method multiplier'
 
 # Analyze subcommand strings
 ANALYZE_PARSER_NAME: Final[str] = 'analyze'
 ANALYZE_PARSER_HELP: Final[str] = 'analyze a crossing schedule'
-ANALYZE_ARG_SCHED_FILE: Final[str] = 'schedule_file'
+ANALYZE_ARG_SCHED_FILES: Final[str] = 'schedule_files'
 ANALYZE_ARG_COST_FILEPATHS: Final[str] = '--cost_filepaths'
 ANALYZE_ARG_WAIT_FILEPATHS: Final[str] = '--wait_filepaths'
+ANALYZE_ARG_MOVEMENTS: Final[str] = '--movements'
+ANALYZE_ARG_CONFLICT_FILE: Final[str] = '--conflict_file'
+ANALYZE_ARG_OUTPUT: Final[str] = '--output'
+ANALYZE_ARG_WORKERS: Final[str] = '--workers'
+ANALYZE_ARG_DISTRIBUTION: Final[str] = '--distribution'
+ANALYZE_ARG_STATS_FILE: Final[str] = '--stats_file'
+ANALYZE_ARG_MERGE_STATS: Final[str] = '--merge_stats'
 
 # Plot subcommand strings
 PLOT_PARSER_NAME: Final[str] = 'plot'
 PLOT_PARSER_HELP: Final[str] = "plot a vehicle's cost or system file"
 PLOT_ARG_FILEPATHS: Final[str] = 'filepaths'
 PLOT_ARG_SCHED_FILE: Final[str] = '--schedule'
+PLOT_ARG_OUTPUT_DIR: Final[str] = '--output_dir'
+PLOT_ARG_FORMAT: Final[str] = '--format'
+PLOT_ARG_WORKERS: Final[str] = '--workers'
+PLOT_ARG_MAX_POINTS: Final[str] = '--max_points'
+PLOT_ARG_DECIMATE: Final[str] = '--decimate'
+PLOT_DECIMATE_LTTB: Final[str] = 'lttb'
+PLOT_DECIMATE_MIN_MAX: Final[str] = 'minmax'
+
+# Generate subcommand strings
+GEN_PARSER_NAME: Final[str] = 'generate'
+GEN_PARSER_HELP: Final[str] = 'generate a synthetic scenario'
+GEN_ARG_OUTPUT_DIR: Final[str] = 'output_dir'
+GEN_ARG_NUM_VEHICLES: Final[str] = '--num_vehicles'
+GEN_ARG_SEED: Final[str] = '--seed'
+GEN_ARG_ARRIVAL_RATE: Final[str] = '--arrival_rate'
+GEN_ARG_APPROACH: Final[str] = '--approach'
+GEN_ARG_MAX_SPEED: Final[str] = '--max_speed'
+GEN_ARG_TIME_WEIGHT: Final[str] = '--time_weight'
+GEN_ARG_SPEED_WEIGHT: Final[str] = '--speed_weight'
+GEN_ARG_STEER_WEIGHT: Final[str] = '--steer_weight'
+GEN_ARG_WAIT_FACTOR: Final[str] = '--wait_factor'
+GEN_ARG_SURROGATE: Final[str] = '--surrogate'
+GEN_ARG_COST_FILES: Final[str] = '--cost_files'
+GEN_ARG_NO_VEHICLE_FILES: Final[str] = '--no_vehicle_files'
+GEN_ARG_TIME_MIN: Final[str] = '--time_min'
+GEN_ARG_TIME_MAX: Final[str] = '--time_max'
+GEN_ARG_TIME_STEP: Final[str] = '--time_step'
+GEN_ERROR_COST_FILES: Final[str] = \
+    '--cost_files requires --surrogate'
+
+# Pipeline subcommand strings
+PIPE_PARSER_NAME: Final[str] = 'pipeline'
+PIPE_PARSER_HELP: Final[str] = 'calculate, schedule and analyze in memory'
+PIPE_ARG_VEHICLE_FILES: Final[str] = 'vehicle_files'
+PIPE_ARG_COST_TABLE: Final[str] = '--cost_table'
+PIPE_ARG_SCHED_TYPE: Final[str] = '--schedule_type'
+PIPE_ARG_TIME_MIN: Final[str] = '--time_min'
+PIPE_ARG_TIME_MAX: Final[str] = '--time_max'
+PIPE_ARG_TIME_STEP: Final[str] = '--time_step'
+PIPE_ARG_MOVEMENTS: Final[str] = '--movements'
+PIPE_ARG_ARRIVALS: Final[str] = '--arrivals'
+PIPE_ARG_CONFLICT_FILE: Final[str] = '--conflict_file'
+PIPE_ARG_CROSS_SUM: Final[str] = '--cross_sum'
+PIPE_ARG_SLACK_PENALTY: Final[str] = '--slack_penalty'
+PIPE_ARG_SEED: Final[str] = '--seed'
+PIPE_ARG_OUTPUT_DIR: Final[str] = '--output_dir'
+PIPE_ARG_WORKERS: Final[str] = '--workers'
+PIPE_ARG_MAX_ERROR: Final[str] = '--max_error'
+PIPE_ARG_CONVEXIFY: Final[str] = '--convexify'
+
+# Serve subcommand strings
+SERVE_PARSER_NAME: Final[str] = 'serve'
+SERVE_PARSER_HELP: Final[str] = 'answer schedule requests from memory'
+SERVE_ARG_HOST: Final[str] = '--host'
+SERVE_ARG_PORT: Final[str] = '--port'
+SERVE_ARG_SOCKET: Final[str] = '--socket'
+SERVE_ARG_CONFLICT_FILE: Final[str] = '--conflict_file'
+SERVE_ARG_CURVE_CACHE_SIZE: Final[str] = '--curve_cache_size'
+SERVE_ARG_SOLVER_CACHE_SIZE: Final[str] = '--solver_cache_size'
+SERVE_ARG_PRELOAD: Final[str] = '--preload'
+SERVE_ARG_VERBOSE: Final[str] = '--verbose'
+SERVE_ARG_ENABLE_COMMANDS: Final[str] = '--enable_commands'
+SERVE_ERROR_INSTRUMENTATION: Final[str] = \
+    'serve cannot run with --trace, --profile or --trace_memory, pass ' \
+    'them to single requests instead'
+
+# Queue subcommand strings
+QUEUE_PARSER_NAME: Final[str] = 'queue'
+QUEUE_PARSER_HELP: Final[str] = 'distribute calculate over a shared ' \
+                                'filesystem'
+QUEUE_ARG_ACTION: Final[str] = 'action'
+QUEUE_ACTION_CREATE: Final[str] = 'create'
+QUEUE_ACTION_WORK: Final[str] = 'work'
+QUEUE_ACTION_STATUS: Final[str] = 'status'
+QUEUE_ACTION_REDUCE: Final[str] = 'reduce'
+QUEUE_ARG_QUEUE_DIR: Final[str] = 'queue_dir'
+QUEUE_ARG_VEHICLE_FILES: Final[str] = 'vehicle_files'
+QUEUE_ARG_DIRECTIONS: Final[str] = '--directions'
+QUEUE_ARG_TIME_MIN: Final[str] = '--time_min'
+QUEUE_ARG_TIME_MAX: Final[str] = '--time_max'
+QUEUE_ARG_TIME_STEP: Final[str] = '--time_step'
+QUEUE_ARG_LEASE_TIMEOUT: Final[str] = '--lease_timeout'
+QUEUE_ARG_WORKER_ID: Final[str] = '--worker_id'
+QUEUE_ARG_MAX_TASKS: Final[str] = '--max_tasks'
+QUEUE_ARG_POLL_INTERVAL: Final[str] = '--poll_interval'
+QUEUE_ARG_WAIT: Final[str] = '--wait'
+QUEUE_ARG_WORKERS: Final[str] = '--workers'
+QUEUE_ARG_OUTPUT_DIR: Final[str] = '--output_dir'
+QUEUE_ARG_MAX_ERROR: Final[str] = '--max_error'
+
+# Compress subcommand strings
+COMP_PARSER_NAME: Final[str] = 'compress'
+COMP_PARSER_HELP: Final[str] = 'refit cost files with fewer knots'
+COMP_ARG_COST_FILES: Final[str] = 'cost_files'
+COMP_ARG_MAX_ERROR: Final[str] = '--max_error'
+COMP_ARG_NUM_SAMPLES: Final[str] = '--num_samples'
+COMP_ARG_OUTPUT_DIR: Final[str] = '--output_dir'
+
+# Atlas subcommand strings
+ATLAS_PARSER_NAME: Final[str] = 'atlas'
+ATLAS_PARSER_HELP: Final[str] = 'build or query a preference-space cost atlas'
+ATLAS_ARG_ACTION: Final[str] = 'action'
+ATLAS_ACTION_BUILD: Final[str] = 'build'
+ATLAS_ACTION_QUERY: Final[str] = 'query'
+ATLAS_ARG_ATLAS_FILE: Final[str] = 'atlas_file'
+ATLAS_ARG_VEHICLE_FILES: Final[str] = 'vehicle_files'
+ATLAS_ARG_AXIS: Final[str] = '--axis'
+ATLAS_ARG_AXIS_METAVAR: Final[tuple] = ('NAME', 'LOW', 'HIGH', 'COUNT')
+ATLAS_ARG_DIRECTIONS: Final[str] = '--directions'
+ATLAS_ARG_DIRECTION: Final[str] = '--direction'
+ATLAS_ARG_TIME_MIN: Final[str] = '--time_min'
+ATLAS_ARG_TIME_MAX: Final[str] = '--time_max'
+ATLAS_ARG_TIME_STEP: Final[str] = '--time_step'
+ATLAS_ARG_WORKERS: Final[str] = '--workers'
+ATLAS_ARG_MAX_ERROR: Final[str] = '--max_error'
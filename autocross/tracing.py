@@ -0,0 +1,209 @@
+"""Tracing and profiling
+
+This module records nested timing spans and exports them in the Chrome
+trace event format, which can be loaded by chrome://tracing or
+Perfetto. Any stage can open a span with `span`. Spans only record
+while a `Tracer` is active, otherwise they cost a global lookup.
+
+A tracer can additionally profile the traced code with cProfile and
+track allocations with tracemalloc. Spans are recorded per process, so
+work done in worker processes shows up as the span waiting for it.
+"""
+# Standard library imports
+import contextlib
+import cProfile
+import json
+import os
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from typing import Final, Optional
+
+
+PROFILE_EXTENSION: Final[str] = '.prof'
+PROFILE_LINES: Final[int] = 25
+MEMORY_LINES: Final[int] = 10
+
+# Tracer recording the spans, or None if tracing is off
+_active_tracer = None
+
+
+class Tracer:
+    """Recorder of timing spans
+
+    Use the tracer as a context manager around the code to trace. On
+    exit, the trace is written to file if a trace file is given, and
+    profile and memory summaries are printed to stderr if enabled.
+    """
+    def __init__(self, trace_file: Optional[str] = None,
+                 profile: bool = False,
+                 trace_memory: bool = False) -> None:
+        """Init function
+
+        :param trace_file: (optional) path to the JSON trace file to
+        write. With `profile`, the profile statistics are written next
+        to it with the extension '.prof'.
+        :param profile: profile the traced code with cProfile
+        :param trace_memory: track memory allocations with tracemalloc
+        and record the traced memory with every span
+        :return: None
+        """
+        self._trace_file = trace_file
+        self._profiler = cProfile.Profile() if profile else None
+        self._trace_memory = trace_memory
+        self._events = []
+        self._origin = 0
+        self._pid = os.getpid()
+
+    def __enter__(self) -> 'Tracer':
+        """Start tracing
+
+        :return: the tracer
+        """
+        global _active_tracer
+        assert _active_tracer is None, 'A tracer is already active'
+
+        self._origin = time.perf_counter_ns()
+        _active_tracer = self
+
+        if self._trace_memory:
+            tracemalloc.start()
+        if self._profiler is not None:
+            self._profiler.enable()
+
+        return self
+
+    def __exit__(self, *_) -> None:
+        """Stop tracing and write the results
+
+        :return: None
+        """
+        global _active_tracer
+
+        if self._profiler is not None:
+            self._profiler.disable()
+
+        snapshot = None
+        if self._trace_memory:
+            snapshot = tracemalloc.take_snapshot()
+            tracemalloc.stop()
+
+        _active_tracer = None
+
+        if self._trace_file is not None:
+            self.write(self._trace_file)
+
+        if self._profiler is not None:
+            self._report_profile()
+
+        if snapshot is not None:
+            _report_memory(snapshot)
+
+    @property
+    def events(self) -> list:
+        """Get the recorded trace events
+
+        :return: list of Chrome trace event dicts
+        """
+        return self._events
+
+    def record(self, name: str, category: str, start: int, end: int,
+               args: dict) -> None:
+        """Record a completed span
+
+        :param name: span name
+        :param category: span category
+        :param start: start time from `time.perf_counter_ns`
+        :param end: end time from `time.perf_counter_ns`
+        :param args: span arguments shown by trace viewers
+        :return: None
+        """
+        if self._trace_memory and tracemalloc.is_tracing():
+            current, peak = tracemalloc.get_traced_memory()
+            args = {**args, 'memory_kib': current / 1024,
+                    'peak_memory_kib': peak / 1024}
+            self._events.append({
+                'name': 'memory', 'ph': 'C', 'pid': self._pid,
+                'ts': (end - self._origin) / 1000,
+                'args': {'current_kib': current / 1024}
+            })
+
+        self._events.append({
+            'name': name, 'cat': category, 'ph': 'X', 'pid': self._pid,
+            'tid': threading.get_ident(),
+            'ts': (start - self._origin) / 1000,
+            'dur': (end - start) / 1000,
+            'args': args
+        })
+
+    def write(self, filepath: str) -> None:
+        """Write the trace to file
+
+        File is written in the Chrome trace event format.
+
+        :param filepath: path to the JSON trace file
+        :return: None
+        """
+        events = sorted(self._events, key=lambda event: event['ts'])
+
+        with open(filepath, 'w') as file:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'},
+                      file)
+
+    def _report_profile(self) -> None:
+        """Print and save the profile statistics
+
+        :return: None
+        """
+        stats = pstats.Stats(self._profiler, stream=sys.stderr)
+
+        if self._trace_file is not None:
+            stats.dump_stats(
+                f'{os.path.splitext(self._trace_file)[0]}{PROFILE_EXTENSION}')
+
+        stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(PROFILE_LINES)
+
+
+@contextlib.contextmanager
+def span(name: str, category: str = 'stage', **args):
+    """Record the wall time of a block as a span
+
+    Spans opened inside the block are nested within it.
+
+    :param name: span name
+    :param category: span category
+    :param args: (optional) span arguments shown by trace viewers
+    """
+    tracer = _active_tracer
+
+    if tracer is None:
+        yield
+        return
+
+    start = time.perf_counter_ns()
+    try:
+        yield
+    finally:
+        tracer.record(name, category, start, time.perf_counter_ns(), args)
+
+
+def is_active() -> bool:
+    """Check whether spans are being recorded
+
+    :return: True if a tracer is active
+    """
+    return _active_tracer is not None
+
+
+def _report_memory(snapshot: tracemalloc.Snapshot) -> None:
+    """Print the largest allocation sites
+
+    :param snapshot: memory snapshot
+    :return: None
+    """
+    print('Largest allocation sites:', file=sys.stderr)
+
+    for stat in snapshot.statistics('lineno')[:MEMORY_LINES]:
+        print(f'  {stat}', file=sys.stderr)
@@ -0,0 +1,407 @@
+"""Benchmark suite for autocross
+
+Measures the calculate, schedule, analyze and fileio hot paths on
+synthetic vehicles and cost curves, so it runs offline and needs no
+input files. Results are written as JSON and compared against a stored
+baseline.
+
+Usage (from the repository root):
+
+    python benchmarks/run.py [--quick] [--output FILE]
+                             [--baseline FILE] [--update_baseline]
+                             [--threshold RATIO] [--filter TEXT]
+"""
+# Standard library imports
+import argparse
+import contextlib
+import json
+import math
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from typing import Callable, Final, Optional
+
+# Third party imports
+import casadi
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(
+    __file__))))
+
+# Local application imports
+from autocross import crossing_schedule  # noqa: E402
+from autocross import fileio  # noqa: E402
+from autocross.analyze import metrics  # noqa: E402
+from autocross.calculate import costs  # noqa: E402
+from autocross.calculate import reference  # noqa: E402
+from autocross.calculate import vehicle  # noqa: E402
+from autocross.schedule import queues  # noqa: E402
+from autocross.schedule import scheduling  # noqa: E402
+from autocross.schedule import times  # noqa: E402
+
+
+DEFAULT_BASELINE: Final[str] = os.path.join(os.path.dirname(__file__),
+                                            'baseline.json')
+DEFAULT_OUTPUT: Final[str] = 'bench_results.json'
+DEFAULT_THRESHOLD: Final[float] = 1.5
+MIN_SAMPLE_TIME: Final[float] = 0.05
+SEED: Final[int] = 0
+
+FLEET_SIZES: Final[tuple] = (10, 100, 1000, 10000)
+SOLVER_FLEET_SIZES: Final[tuple] = (10, 100, 1000)
+CROSSING_TIMES: Final[tuple] = (2, 4, 8)
+DELTA_T: Final[float] = 0.1
+COST_GRID: Final[np.ndarray] = np.linspace(0, 20, 41)
+
+SYNTHETIC_VEHICLE: Final[dict] = {
+    'state_bounds': {
+        'initial': [0.0, 0.0, 0.0],
+        'final': [None, None, None],
+        'upper': [None, None, None],
+        'lower': [None, None, None]
+    },
+    'input_bounds': {
+        'initial': [None, None],
+        'final': [None, None],
+        'upper': [1.0, 15.0],
+        'lower': [-1.0, 0.0]
+    },
+    'preferences': {
+        'state': [1.0, 1.0, 0.0],
+        'input': [1.0, 0.1],
+        'time': 1.0
+    }
+}
+
+
+def synthetic_cost_funcs(num_vehicles: int, seed: int = SEED) -> tuple:
+    """Create quadratic cost and linear wait curves for a fleet
+
+    :param num_vehicles: number of vehicles
+    :param seed: seed for the curve parameters
+    :return: tuple formatted as (cost functions, cost bounds, wait
+    functions)
+    """
+    generator = np.random.default_rng(seed)
+    optima = generator.uniform(4, 12, num_vehicles)
+    scales = generator.uniform(0.5, 2.0, num_vehicles)
+
+    cost_funcs = [casadi.interpolant('cost', 'bspline', [COST_GRID],
+                                     list(scale * (COST_GRID - optimum) ** 2
+                                          + 10))
+                  for optimum, scale in zip(optima, scales)]
+    wait_funcs = [casadi.interpolant('wait', 'bspline', [COST_GRID],
+                                     list(2 * COST_GRID))] * num_vehicles
+    cost_bounds = [(1.0, 19.0)] * num_vehicles
+
+    return cost_funcs, cost_bounds, wait_funcs
+
+
+@contextlib.contextmanager
+def silence_stdout():
+    """Redirect the stdout file descriptor to the null device
+
+    IPOPT writes to the C-level stdout, which `contextlib.redirect_stdout`
+    does not capture.
+    """
+    sys.stdout.flush()
+    saved = os.dup(1)
+    with open(os.devnull, 'w') as null:
+        os.dup2(null.fileno(), 1)
+        try:
+            yield
+        finally:
+            os.dup2(saved, 1)
+            os.close(saved)
+
+
+def measure(func: Callable, repeats: int) -> dict:
+    """Time repeated calls of a function
+
+    Fast functions are called in loops lasting at least
+    `MIN_SAMPLE_TIME`, so timer resolution and call overhead do not
+    dominate the result. The first call is untimed and builds CasADi
+    functions and warms caches.
+
+    :param func: function without arguments
+    :param repeats: number of timed samples
+    :return: dict with the minimum and median duration per call in
+    seconds
+    """
+    with silence_stdout():
+        start = time.perf_counter()
+        func()
+        first = time.perf_counter() - start
+
+        loops = max(1, math.ceil(MIN_SAMPLE_TIME / max(first, 1e-9)))
+        durations = []
+
+        for _ in range(repeats):
+            start = time.perf_counter()
+            for _ in range(loops):
+                func()
+            durations.append((time.perf_counter() - start) / loops)
+
+    return {
+        'min': min(durations),
+        'median': statistics.median(durations),
+        'repeats': repeats,
+        'loops': loops
+    }
+
+
+def calculate_cases(quick: bool) -> dict:
+    """Create the calculate benchmarks
+
+    :param quick: use the reduced problem sizes
+    :return: dict mapping benchmark names to functions
+    """
+    veh = vehicle.build_vehicle(SYNTHETIC_VEHICLE)
+    cases = {}
+
+    for crossing_time in CROSSING_TIMES[:2] if quick else CROSSING_TIMES:
+        num_samples = costs.get_horizon(crossing_time, delta_t=DELTA_T)
+        ref = reference.left_turn(num_samples + 1, 10)
+
+        cases[f'calculate.calculate_with_reference[n={num_samples}]'] = \
+            lambda t=crossing_time, n=num_samples, r=ref: \
+            costs.calculate_with_reference(veh, t, n, DELTA_T, r)
+
+    return cases
+
+
+def schedule_cases(quick: bool) -> dict:
+    """Create the schedule benchmarks
+
+    :param quick: use the reduced problem sizes
+    :return: dict mapping benchmark names to functions
+    """
+    cases = {}
+
+    for size in SOLVER_FLEET_SIZES[:2] if quick else SOLVER_FLEET_SIZES:
+        cost_funcs, cost_bounds, _ = synthetic_cost_funcs(size)
+        cases[f'times.assign_optimal_crossing_times[n={size}]'] = \
+            lambda f=cost_funcs, b=cost_bounds: \
+            times.assign_optimal_crossing_times(f, b)
+
+    for size in FLEET_SIZES[:3] if quick else FLEET_SIZES:
+        generator = np.random.default_rng(SEED)
+        values = list(generator.uniform(1, 20, size))
+        lanes = list(generator.integers(0, 4, size))
+        lane_queues = queues.lane_queues(lanes)
+
+        cases[f'scheduling.scheduled_random[n={size}]'] = \
+            lambda n=size: scheduling.scheduled_random(n, seed=SEED)
+        cases[f'scheduling.scheduled_first_come_first_serve[n={size}]'] = \
+            lambda v=values: scheduling.scheduled_first_come_first_serve(v)
+        cases[f'scheduling.scheduled_fastest_crossing_first[n={size}]'] = \
+            lambda v=values: scheduling.scheduled_fastest_crossing_first(v)
+        cases[f'queues.merge_weighted_chains[n={size}]'] = \
+            lambda q=lane_queues, v=values: queues.merge_weighted_chains(q, v)
+
+    return cases
+
+
+def analyze_cases(quick: bool) -> dict:
+    """Create the analyze benchmarks
+
+    :param quick: use the reduced problem sizes
+    :return: dict mapping benchmark names to functions
+    """
+    cases = {}
+
+    for size in FLEET_SIZES[:3] if quick else FLEET_SIZES:
+        cost_funcs, _, wait_funcs = synthetic_cost_funcs(size)
+        generator = np.random.default_rng(SEED)
+        crossing_times = generator.uniform(1, 5, size)
+        schedule = crossing_schedule.Schedule.from_values(
+            generator.random(size), crossing_times)
+        start_times = list(schedule.start_times)
+
+        cases[f'metrics.sum_waiting_costs[n={size}]'] = \
+            lambda f=wait_funcs, s=start_times: \
+            metrics.sum_waiting_costs(f, s)
+        cases[f'metrics.sum_crossing_costs[n={size}]'] = \
+            lambda f=cost_funcs, c=list(crossing_times): \
+            metrics.sum_crossing_costs(f, c)
+        cases[f'metrics.evaluate_cost_matrix[n={size}x100]'] = \
+            lambda f=wait_funcs, s=np.tile(schedule.start_times, (100, 1)): \
+            metrics.evaluate_cost_matrix(f, s)
+
+    return cases
+
+
+def fileio_cases(quick: bool, directory: str) -> dict:
+    """Create the fileio benchmarks
+
+    :param quick: use the reduced problem sizes
+    :param directory: directory for the written files
+    :return: dict mapping benchmark names to (function, bytes per call)
+    """
+    cost_funcs, cost_bounds, _ = synthetic_cost_funcs(1)
+    cost_path = os.path.join(directory, 'bench.cost')
+    fileio.write_cost_file(cost_path, cost_funcs[0], cost_bounds[0])
+
+    cost_bytes = os.path.getsize(cost_path)
+
+    cases = {
+        'fileio.write_cost_file': (lambda: fileio.write_cost_file(
+            cost_path, cost_funcs[0], cost_bounds[0]), cost_bytes),
+        'fileio.read_cost_file': (lambda: fileio.parse_cost_data(
+            fileio.read_cost_file(cost_path)), cost_bytes)
+    }
+
+    for size in FLEET_SIZES[:3] if quick else FLEET_SIZES:
+        generator = np.random.default_rng(SEED)
+        schedule = crossing_schedule.Schedule.from_values(
+            generator.random(size), generator.uniform(1, 5, size))
+        path = os.path.join(directory, f'bench_{size}.sched')
+        fileio.write_schedule(path, schedule)
+        num_bytes = os.path.getsize(path)
+
+        cases[f'fileio.write_schedule[n={size}]'] = \
+            (lambda p=path, s=schedule: fileio.write_schedule(p, s),
+             num_bytes)
+        cases[f'fileio.read_schedule[n={size}]'] = \
+            (lambda p=path: fileio.read_schedule(p), num_bytes)
+
+    return cases
+
+
+def run(quick: bool, repeats: int, name_filter: Optional[str]) -> dict:
+    """Run all benchmarks
+
+    :param quick: use the reduced problem sizes
+    :param repeats: number of timed calls per benchmark
+    :param name_filter: (optional) only run benchmarks whose name
+    contains this text
+    :return: dict mapping benchmark names to timing results
+    """
+    results = {}
+
+    with tempfile.TemporaryDirectory() as directory:
+        cases = {**calculate_cases(quick), **schedule_cases(quick),
+                 **analyze_cases(quick), **fileio_cases(quick, directory)}
+
+        for name, func in cases.items():
+            if name_filter and name_filter not in name:
+                continue
+
+            num_bytes = None
+            if isinstance(func, tuple):
+                func, num_bytes = func
+
+            results[name] = measure(func, repeats)
+            if num_bytes is not None:
+                results[name]['bytes'] = num_bytes
+                results[name]['throughput_mb_s'] = \
+                    num_bytes / results[name]['median'] / 1e6
+            print(f"{name}: {results[name]['median'] * 1e3:.3f} ms",
+                  file=sys.stderr)
+
+    return results
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list:
+    """Compare results against a baseline
+
+    :param results: dict mapping benchmark names to timing results
+    :param baseline: dict mapping benchmark names to timing results
+    :param threshold: ratio of minimum durations above which a
+    benchmark counts as a regression. The minimum is the least noisy
+    estimate of a function's cost.
+    :return: list of rows formatted as (name, baseline minimum, current
+    minimum, ratio, status)
+    """
+    rows = []
+
+    for name, result in results.items():
+        if name not in baseline:
+            rows.append((name, None, result['min'], None, 'new'))
+            continue
+
+        ratio = result['min'] / baseline[name]['min']
+        if ratio > threshold:
+            status = 'REGRESSION'
+        elif ratio < 1 / threshold:
+            status = 'faster'
+        else:
+            status = 'ok'
+
+        rows.append((name, baseline[name]['min'], result['min'], ratio,
+                     status))
+
+    return rows
+
+
+def print_comparison(rows: list) -> None:
+    """Print a comparison table
+
+    :param rows: rows returned by `compare`
+    :return: None
+    """
+    width = max([len(row[0]) for row in rows] + [9])
+    print(f"{'benchmark':<{width}}  {'baseline':>12}  {'current':>12}  "
+          f"{'ratio':>7}  status")
+
+    for name, base, current, ratio, status in rows:
+        base_text = '-' if base is None else f'{base * 1e3:.3f} ms'
+        ratio_text = '-' if ratio is None else f'{ratio:.2f}'
+        print(f'{name:<{width}}  {base_text:>12}  '
+              f'{current * 1e3:>9.3f} ms  {ratio_text:>7}  {status}')
+
+
+def environment() -> dict:
+    """Describe the environment the benchmarks ran in
+
+    :return: dict of version and platform information
+    """
+    return {
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'casadi': casadi.__version__,
+        'platform': platform.platform(),
+        'processor': platform.processor()
+    }
+
+
+def main(argv: list) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--quick', action='store_true',
+                        help='run reduced problem sizes')
+    parser.add_argument('--repeats', type=int, default=5)
+    parser.add_argument('--output', type=str, default=DEFAULT_OUTPUT)
+    parser.add_argument('--baseline', type=str, default=DEFAULT_BASELINE)
+    parser.add_argument('--update_baseline', action='store_true',
+                        help='write the results to the baseline file')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD)
+    parser.add_argument('--filter', type=str)
+    args = parser.parse_args(argv)
+
+    results = run(args.quick, args.repeats, args.filter)
+    report = {'environment': environment(), 'results': results}
+
+    with open(args.output, 'w') as file:
+        json.dump(report, file, indent=2)
+
+    if args.update_baseline:
+        with open(args.baseline, 'w') as file:
+            json.dump(report, file, indent=2)
+        return 0
+
+    baseline = {}
+    if os.path.isfile(args.baseline):
+        with open(args.baseline) as file:
+            baseline = json.load(file)['results']
+
+    rows = compare(results, baseline, args.threshold)
+    print_comparison(rows)
+
+    return 1 if any(row[4] == 'REGRESSION' for row in rows) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
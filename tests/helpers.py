@@ -0,0 +1,16 @@
+"""Shared test fixtures
+
+"""
+# Local application imports
+from autocross.generate import scenario
+
+
+def sample_vehicle_data() -> dict:
+    """Get the vehicle data of a single seeded synthetic vehicle
+
+    :return: dict with the vehicle data of the only vehicle of
+    `scenario.ScenarioParams(1, seed=1)`
+    """
+    fleet = scenario.sample_fleet(scenario.ScenarioParams(1, seed=1))
+
+    return scenario.vehicle_data(fleet, 0)
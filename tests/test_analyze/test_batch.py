@@ -0,0 +1,179 @@
+"""Test cases for batch module
+
+"""
+# Standard library imports
+import argparse
+import contextlib
+import csv
+import io
+import os
+import tempfile
+import unittest
+
+# Third party imports
+import casadi
+import numpy as np
+
+# Local application imports
+from autocross import crossing_schedule
+from autocross import fileio
+from autocross.analyze import batch
+from autocross.analyze import cmd_main
+
+
+class TestBatch(unittest.TestCase):
+    """Test cases for analyzing many schedules at once
+
+    """
+    def setUp(self) -> None:
+        """Write a two vehicle fleet and three schedules
+
+        Crossing costs are t^2 and waiting costs are 2t for every
+        vehicle.
+
+        :return: None
+        """
+        self._dir = tempfile.TemporaryDirectory()
+        grid = np.linspace(0, 20, 21)
+
+        cost_func = casadi.interpolant('cost', 'bspline', [grid],
+                                       list(grid ** 2))
+        wait_func = casadi.interpolant('wait', 'bspline', [grid],
+                                       list(2 * grid))
+
+        self._cost_files = []
+        self._wait_files = []
+        for vid in range(2):
+            cost_file = os.path.join(self._dir.name, f'{vid}.cost')
+            wait_file = os.path.join(self._dir.name, f'{vid}.wait')
+            fileio.write_cost_file(cost_file, cost_func, (0, 20))
+            fileio.write_cost_file(wait_file, wait_func, (0, 20))
+            self._cost_files.append(cost_file)
+            self._wait_files.append(wait_file)
+
+        self._schedule_dir = os.path.join(self._dir.name, 'schedules')
+        os.mkdir(self._schedule_dir)
+
+        self._schedules = [crossing_schedule.Schedule([0, 1], [1, 3]),
+                           crossing_schedule.Schedule([1, 0], [1, 3]),
+                           crossing_schedule.Schedule([0, 1], [2, 2])]
+        for index, schedule in enumerate(self._schedules):
+            fileio.write_schedule(
+                os.path.join(self._schedule_dir, f'schedule.{index}'),
+                schedule)
+
+    def tearDown(self) -> None:
+        """Remove the temporary files
+
+        :return: None
+        """
+        self._dir.cleanup()
+
+    def test_evaluate_schedules(self) -> None:
+        """Test case for vectorized schedule evaluation
+
+        :return: None
+        """
+        fleet = batch.load_fleet(self._cost_files, self._wait_files)
+
+        output = batch.evaluate_schedules(self._schedules, fleet.cost_funcs,
+                                          fleet.wait_funcs)
+
+        np.testing.assert_allclose([2, 6, 4],
+                                   [row['wait_cost'] for row in output])
+        np.testing.assert_allclose([10, 10, 8],
+                                   [row['crossing_cost'] for row in output])
+        np.testing.assert_allclose([4, 4, 4],
+                                   [row['clearing_time'] for row in output])
+
+    def test_evaluate_schedule_files_pool(self) -> None:
+        """Test case for evaluation on a process pool
+
+        :return: None
+        """
+        filepaths = batch.find_schedule_files([self._schedule_dir])
+
+        serial, serial_stats = batch.evaluate_schedule_files(
+            filepaths, self._cost_files, self._wait_files, distribution=True)
+        pooled, pooled_stats = batch.evaluate_schedule_files(
+            filepaths, self._cost_files, self._wait_files, workers=2,
+            chunk_size=1, distribution=True)
+
+        self.assertEqual(3, len(pooled))
+        for serial_row, pooled_row in zip(serial, pooled):
+            self.assertEqual(serial_row['schedule'], pooled_row['schedule'])
+            self.assertAlmostEqual(serial_row['schedule_cost'],
+                                   pooled_row['schedule_cost'])
+
+        serial_summary = serial_stats.summary()
+        pooled_summary = pooled_stats.summary()
+        for name in ('delay', 'cost'):
+            self.assertEqual(serial_summary[name]['count'],
+                             pooled_summary[name]['count'])
+            self.assertAlmostEqual(serial_summary[name]['mean'],
+                                   pooled_summary[name]['mean'])
+            self.assertAlmostEqual(serial_summary[name]['p99'],
+                                   pooled_summary[name]['p99'])
+
+    def test_write_table_csv(self) -> None:
+        """Test case for writing a CSV comparison table
+
+        :return: None
+        """
+        filepath = os.path.join(self._dir.name, 'table.csv')
+        rows, _ = batch.evaluate_schedule_files(
+            batch.find_schedule_files([self._schedule_dir]),
+            self._cost_files, self._wait_files)
+
+        batch.write_table(filepath, rows)
+
+        with open(filepath, newline='') as file:
+            output = list(csv.DictReader(file))
+
+        self.assertEqual(3, len(output))
+        self.assertEqual(list(batch.TABLE_COLUMNS), list(output[0]))
+
+    def test_find_schedule_files_mixed(self) -> None:
+        """Test case for skipping files that are not schedules
+
+        :return: None
+        """
+        for name in ('0.cost', '0.wait', 'notes.txt', 'analysis.json'):
+            with open(os.path.join(self._schedule_dir, name), 'w') as file:
+                file.write('0\n')
+        os.mkdir(os.path.join(self._schedule_dir, 'schedule.dir'))
+
+        filepaths = batch.find_schedule_files([self._schedule_dir])
+
+        self.assertEqual([os.path.join(self._schedule_dir, f'schedule.{index}')
+                          for index in range(3)], filepaths)
+        rows, _ = batch.evaluate_schedule_files(filepaths, self._cost_files,
+                                                self._wait_files)
+        self.assertEqual(3, len(rows))
+
+    def test_analyze_single_output(self) -> None:
+        """Test case for writing the table of a single schedule file
+
+        :return: None
+        """
+        filepath = os.path.join(self._dir.name, 'table.csv')
+        schedule_file = os.path.join(self._schedule_dir, 'schedule.0')
+        args = argparse.Namespace(
+            schedule_files=[schedule_file], cost_filepaths=self._cost_files,
+            wait_filepaths=self._wait_files, movements=None,
+            conflict_file=None, output=filepath, distribution=False,
+            stats_file=None, merge_stats=None)
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            cmd_main.analyze_main(args)
+
+        with open(filepath, newline='') as file:
+            output = list(csv.DictReader(file))
+
+        self.assertEqual(1, len(output))
+        self.assertEqual(schedule_file, output[0]['schedule'])
+        self.assertAlmostEqual(12, float(output[0]['schedule_cost']))
+
+
+if __name__ == '__main__':
+    unittest.main()
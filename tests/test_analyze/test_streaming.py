@@ -0,0 +1,94 @@
+"""Test cases for streaming module
+
+"""
+# Standard library imports
+import pickle
+import unittest
+
+# Third party imports
+import numpy as np
+
+# Local application imports
+from autocross.analyze import streaming
+
+
+class TestStreaming(unittest.TestCase):
+    """Test cases for streaming distribution metrics
+
+    """
+    def setUp(self) -> None:
+        """Draw a reproducible set of delays
+
+        :return: None
+        """
+        self._values = np.random.default_rng(3).exponential(5.0, 10000)
+
+    def test_running_stats(self) -> None:
+        """Test case for batched mean, deviation and extremes
+
+        :return: None
+        """
+        stats = streaming.RunningStats()
+        for batch in np.array_split(self._values, 7):
+            stats.add(batch)
+
+        self.assertEqual(self._values.size, stats.count)
+        self.assertAlmostEqual(np.mean(self._values), stats.mean)
+        self.assertAlmostEqual(np.std(self._values), stats.std)
+        self.assertEqual(np.min(self._values), stats.min)
+        self.assertEqual(np.max(self._values), stats.max)
+
+    def test_jain_index(self) -> None:
+        """Test case for Jain's fairness index
+
+        :return: None
+        """
+        equal = streaming.RunningStats()
+        equal.add([2.0, 2.0, 2.0, 2.0])
+        unfair = streaming.RunningStats()
+        unfair.add([1.0, 0.0, 0.0, 0.0])
+
+        self.assertAlmostEqual(1.0, equal.jain_index)
+        self.assertAlmostEqual(0.25, unfair.jain_index)
+
+    def test_quantile_accuracy(self) -> None:
+        """Test case for quantiles within the relative accuracy
+
+        :return: None
+        """
+        sketch = streaming.QuantileSketch(relative_accuracy=0.01)
+        sketch.add(self._values)
+
+        for quantile in (0.5, 0.9, 0.99):
+            expected = np.quantile(self._values, quantile,
+                                   method='lower')
+            self.assertLessEqual(abs(sketch.quantile(quantile) - expected),
+                                 0.01 * expected)
+
+    def test_merge_shards(self) -> None:
+        """Test case for merging metrics of separate shards
+
+        :return: None
+        """
+        delays = self._values.reshape(100, 100)
+        costs = 2 * delays
+        optimal_costs = np.full(100, 4.0)
+
+        combined = streaming.DistributionMetrics()
+        combined.update(delays, costs, optimal_costs)
+
+        merged = streaming.DistributionMetrics()
+        for rows in np.array_split(np.arange(100), 3):
+            shard = streaming.DistributionMetrics()
+            shard.update(delays[rows], costs[rows], optimal_costs)
+            merged.merge(pickle.loads(pickle.dumps(shard)))
+
+        expected = combined.summary()
+        output = merged.summary()
+        for name in streaming.DistributionMetrics.METRICS:
+            for key, value in expected[name].items():
+                self.assertAlmostEqual(value, output[name][key])
+
+
+if __name__ == '__main__':
+    unittest.main()
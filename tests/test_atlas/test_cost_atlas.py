@@ -0,0 +1,128 @@
+"""Test cases for cost_atlas module
+
+"""
+# Standard library imports
+import copy
+import os
+import tempfile
+import unittest
+
+# Third party imports
+import numpy as np
+
+# Local application imports
+from autocross.atlas import cost_atlas
+from tests import helpers
+
+
+class TestCostAtlas(unittest.TestCase):
+    """Test cases for interpolating crossing costs in an atlas
+
+    """
+    def setUp(self) -> None:
+        """Create a vehicle and an atlas with known costs
+
+        :return: None
+        """
+        self._vehicle = helpers.sample_vehicle_data()
+
+        self._axes = [cost_atlas.Axis('input.1', np.array([0.5, 1.0, 2.0])),
+                      cost_atlas.Axis('state.0', np.array([1.0, 3.0, 5.0]))]
+        self._times = np.arange(4.0, 10.0)
+
+        # Costs are linear in the first weight and quadratic in the second
+        speed, state, times = np.meshgrid(self._axes[0].values,
+                                          self._axes[1].values, self._times,
+                                          indexing='ij')
+        costs = 10 * speed + state ** 2 + 1 / times
+        base = cost_atlas.with_preferences(self._vehicle, self._axes,
+                                           [1.0, 3.0])
+        self._atlas = cost_atlas.CostAtlas(base, self._axes, ['straight'],
+                                           self._times, costs[np.newaxis])
+
+    def _vehicle_at(self, point: list) -> dict:
+        """Get the vehicle with the gridded weights set
+
+        :param point: weight per axis
+        :return: vehicle data
+        """
+        return cost_atlas.with_preferences(self._vehicle, self._axes, point)
+
+    def test_interpolate(self):
+        """Test case for interpolating between grid points
+
+        :return: None
+        """
+        costs, errors = cost_atlas.interpolate(self._atlas,
+                                               self._vehicle_at([2.0, 3.0]))
+        np.testing.assert_allclose(costs, 20 + 9 + 1 / self._times)
+        np.testing.assert_allclose(errors, 0.0)
+
+        costs, errors = cost_atlas.interpolate(self._atlas,
+                                               self._vehicle_at([0.75, 2.0]))
+        np.testing.assert_allclose(costs, 7.5 + 5 + 1 / self._times)
+        # The quadratic's second difference bounds its linear error of 1
+        self.assertTrue(np.all(errors >= 1.0))
+
+    def test_query_time_cost(self):
+        """Test case for adding the vehicle's own time cost
+
+        :return: None
+        """
+        data = self._vehicle_at([1.0, 3.0])
+        data['preferences']['time'] = 2.5
+
+        curve = cost_atlas.query_atlas(self._atlas, data)
+
+        self.assertFalse(curve.exact)
+        self.assertEqual(curve.cost_bounds, (4.0, 9.0))
+        self.assertAlmostEqual(float(curve.cost_func(6.0)),
+                               10 + 9 + 1 / 6 + 2.5 * 6, places=6)
+
+    def test_no_interpolation(self):
+        """Test case for rejecting vehicles the atlas does not cover
+
+        :return: None
+        """
+        other = copy.deepcopy(self._vehicle_at([1.0, 3.0]))
+        other['input_bounds']['upper'][1] += 1
+
+        self.assertIsNone(cost_atlas.interpolate(
+            self._atlas, self._vehicle_at([3.0, 3.0])))
+        self.assertIsNone(cost_atlas.interpolate(self._atlas, other))
+        self.assertIsNone(cost_atlas.interpolate(
+            self._atlas, self._vehicle_at([1.0, 3.0]), 'left'))
+
+    def test_exact_fallback(self):
+        """Test case for solving vehicles with a large error estimate
+
+        :return: None
+        """
+        curve = cost_atlas.query_atlas(self._atlas,
+                                       self._vehicle_at([0.75, 2.0]),
+                                       max_error=0.5)
+
+        self.assertTrue(curve.exact)
+        self.assertEqual(curve.error, 0.0)
+        self.assertEqual(curve.cost_bounds, (4.0, 9.0))
+
+    def test_write_read(self):
+        """Test case for reading a written atlas
+
+        :return: None
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            atlas_file = os.path.join(directory, 'car.atlas')
+            cost_atlas.write_atlas(atlas_file, self._atlas)
+            atlas = cost_atlas.read_atlas(atlas_file)
+
+        self.assertEqual(atlas.vehicle, self._atlas.vehicle)
+        self.assertEqual(atlas.directions, ['straight'])
+        self.assertEqual([axis.name for axis in atlas.axes],
+                         ['input.1', 'state.0'])
+        np.testing.assert_allclose(atlas.costs, self._atlas.costs,
+                                   rtol=1e-6)
+
+
+if __name__ == '__main__':
+    unittest.main()
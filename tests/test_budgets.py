@@ -0,0 +1,62 @@
+"""Test cases for budgets module
+
+"""
+# Standard library imports
+import time
+import unittest
+
+# Local application imports
+from autocross import budgets
+
+
+class TestBudgets(unittest.TestCase):
+    """Test cases for solve budgets
+
+    """
+    def test_unlimited(self):
+        """Test case for solves without a budget
+
+        :return: None
+        """
+        options = {'ipopt.sb': 'yes'}
+
+        self.assertIsNone(budgets.create_budget())
+        self.assertEqual(budgets.solver_options(None, options), options)
+
+    def test_solver_options(self):
+        """Test case for limiting the wall time by the deadline
+
+        :return: None
+        """
+        budget = budgets.create_budget(max_time=60.0, max_iter=50,
+                                       run_time=2.0)
+        options = budgets.solver_options(budget, {'ipopt.sb': 'yes'})
+
+        self.assertEqual(options['ipopt.max_iter'], 50)
+        self.assertLessEqual(options['ipopt.max_wall_time'], 2.0)
+        self.assertEqual(options['ipopt.sb'], 'yes')
+
+    def test_deadline_passed(self):
+        """Test case for refusing to solve after the deadline
+
+        :return: None
+        """
+        budget = budgets.Budget(deadline=time.monotonic() - 1)
+
+        with self.assertRaises(budgets.BudgetExceeded):
+            budget.solver_options()
+
+    def test_check_status(self):
+        """Test case for telling timeouts from failed solves
+
+        :return: None
+        """
+        budgets.check_status({'return_status': 'Infeasible_Problem_Detected'})
+
+        with self.assertRaises(budgets.BudgetExceeded):
+            budgets.check_status(
+                {'return_status': 'Maximum_Iterations_Exceeded'})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+"""Test cases for canonical module
+
+"""
+# Standard library imports
+import copy
+import unittest
+
+# Third party imports
+import numpy as np
+
+# Local application imports
+from autocross.calculate import canonical
+from autocross.calculate import curves
+from autocross.calculate import vehicle
+from tests import helpers
+
+
+class TestCanonical(unittest.TestCase):
+    """Test cases for sharing solutions between translated vehicles
+
+    """
+    def setUp(self) -> None:
+        """Create a vehicle and a translated copy of it
+
+        :return: None
+        """
+        self._vehicle = helpers.sample_vehicle_data()
+
+        self._moved = copy.deepcopy(self._vehicle)
+        self._moved['state_bounds']['initial'][0] += 3.5
+        self._moved['state_bounds']['initial'][1] -= 1.25
+        self._moved['wait_factor'] *= 2
+
+    def test_canonicalize(self):
+        """Test case for moving a vehicle to the origin
+
+        :return: None
+        """
+        data = copy.deepcopy(self._vehicle)
+        data['state_bounds']['final'][0] = 30.0
+        initial = data['state_bounds']['initial']
+
+        result, offset = canonical.canonicalize(data)
+
+        self.assertEqual(offset, tuple(initial[:2]))
+        self.assertEqual(result['state_bounds']['initial'][:2], [0.0, 0.0])
+        self.assertAlmostEqual(result['state_bounds']['final'][0],
+                               30.0 - initial[0])
+        self.assertEqual(data['state_bounds']['final'][0], 30.0)
+
+    def test_representatives(self):
+        """Test case for grouping vehicles that differ by position only
+
+        :return: None
+        """
+        other = copy.deepcopy(self._vehicle)
+        other['preferences']['time'] += 1
+
+        self.assertEqual(canonical.representatives(
+            [self._vehicle, other, self._moved]), [0, 1, 0])
+        self.assertEqual(canonical.representatives(
+            [self._vehicle, self._moved], [None, 'left']), [0, 1])
+
+    def test_translated_solution(self):
+        """Test case for solving a translated vehicle like the original
+
+        :return: None
+        """
+        solved = curves.solve_crossing_time(
+            vehicle.build_vehicle(self._moved), 5.0)
+
+        canonical_data, offset = canonical.canonicalize(self._moved)
+        shared = canonical.translate_results(
+            {5.0: curves.solve_crossing_time(
+                vehicle.build_vehicle(canonical_data), 5.0)}, offset)[5.0]
+
+        self.assertAlmostEqual(shared['cost'], solved['cost'], places=5)
+        np.testing.assert_allclose(shared['states'], solved['states'],
+                                   atol=1e-5)
+
+
+if __name__ == '__main__':
+    unittest.main()
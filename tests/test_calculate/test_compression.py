@@ -0,0 +1,79 @@
+"""Test cases for compression module
+
+"""
+# Standard library imports
+import unittest
+
+# Third party imports
+import casadi
+import numpy as np
+
+# Local application imports
+from autocross.calculate import compression
+
+
+class TestCompression(unittest.TestCase):
+    """Test cases for refitting cost functions with fewer knots
+
+    """
+    def setUp(self) -> None:
+        """Create a densely sampled cost function
+
+        :return: None
+        """
+        self._grid = np.linspace(1, 20, 191)
+        self._func = casadi.interpolant('cost', 'bspline', [self._grid],
+                                        list(self._grid + 16 / self._grid))
+
+    def test_compress_curve(self):
+        """Test case for meeting the error bound with fewer knots
+
+        :return: None
+        """
+        curve = compression.compress_curve(self._func, (1, 20), 0.01)
+
+        samples = np.linspace(1, 20, 1000)
+        errors = np.abs(np.ravel(curve.func(samples))
+                        - np.ravel(self._func(samples)))
+
+        self.assertLess(curve.knots.size, 40)
+        self.assertLessEqual(curve.max_error, 0.01)
+        self.assertLess(np.max(errors), 0.02)
+        self.assertGreater(curve.ratio, 2)
+        self.assertEqual((1, 20), curve.bounds)
+
+    def test_compress_linear(self):
+        """Test case for compressing a linear wait function
+
+        :return: None
+        """
+        func = casadi.interpolant('wait', 'bspline', [self._grid],
+                                  list(2 * self._grid))
+        curve = compression.compress_curve(func, (1, 20), 1e-6)
+
+        self.assertEqual(compression.MIN_KNOTS, curve.knots.size)
+
+    def test_compress_keeps_smaller_original(self):
+        """Test case for keeping a function that cannot be compressed
+
+        :return: None
+        """
+        grid = np.linspace(1, 20, 6)
+        func = casadi.interpolant('cost', 'bspline', [grid],
+                                  list(grid + 16 / grid))
+        curve = compression.compress_curve(func, (1, 20), 0)
+
+        self.assertIs(func, curve.func)
+        self.assertEqual(1.0, curve.ratio)
+
+    def test_select_knots(self):
+        """Test case for selecting knots in increasing order
+
+        :return: None
+        """
+        values = self._grid + 16 / self._grid
+        selected = compression.select_knots(self._grid, values, 0.01)
+
+        self.assertEqual(0, selected[0])
+        self.assertEqual(self._grid.size - 1, selected[-1])
+        self.assertTrue(np.all(np.diff(selected) > 0))
@@ -0,0 +1,51 @@
+"""Test cases for curves module
+
+"""
+# Standard library imports
+import contextlib
+import io
+import unittest
+
+# Local application imports
+from autocross import budgets
+from autocross.calculate import curves
+from autocross.calculate import vehicle
+from tests import helpers
+
+
+class TestCurves(unittest.TestCase):
+    """Test cases for solves that run out of budget
+
+    """
+    def test_timed_out(self):
+        """Test case for recording a timed-out solve
+
+        :return: None
+        """
+        veh = vehicle.build_vehicle(helpers.sample_vehicle_data())
+
+        with contextlib.redirect_stderr(io.StringIO()):
+            result = curves.solve_crossing_time(
+                veh, 4.0, budget=budgets.Budget(max_iter=1))
+
+        self.assertEqual(result, {'cost': None, 'timed_out': True})
+
+    def test_fill_timed_out(self):
+        """Test case for filling timed-out costs between solved costs
+
+        :return: None
+        """
+        results = {4.0: {'cost': 3.0},
+                   5.0: {'cost': None, 'timed_out': True},
+                   6.0: {'cost': 4.0},
+                   7.0: {'cost': None, 'timed_out': True}}
+
+        self.assertEqual(curves.fill_timed_out(sorted(results), results), 1)
+        self.assertAlmostEqual(results[5.0]['cost'], 3.5)
+        self.assertAlmostEqual(results[5.0]['slope'], 0.5)
+        self.assertTrue(results[5.0]['filled'])
+        self.assertIsNone(results[7.0]['cost'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+"""Test cases for hermite module
+
+"""
+# Standard library imports
+import pickle
+import unittest
+
+# Third party imports
+import casadi
+import numpy as np
+
+# Local application imports
+from autocross.calculate import curves
+from autocross.calculate import hermite
+from autocross.calculate import vehicle
+from tests import helpers
+
+
+class TestHermite(unittest.TestCase):
+    """Test cases for cubic Hermite cost functions
+
+    """
+    def setUp(self) -> None:
+        """Sample a cost function and its derivative on a coarse grid
+
+        :return: None
+        """
+        self._times = np.array([1.0, 2.0, 4.0, 7.0, 10.0])
+        self._func = hermite.hermite_interpolant(
+            self._times, self._times + 16 / self._times,
+            1 - 16 / self._times ** 2)
+
+    def test_interpolate_values_and_slopes(self):
+        """Test case for matching the values and slopes at the times
+
+        :return: None
+        """
+        time = casadi.MX.sym('time')
+        slope = casadi.Function('slope', [time], [
+            casadi.jacobian(self._func(time), time)])
+
+        np.testing.assert_allclose(np.ravel(self._func(self._times)),
+                                   self._times + 16 / self._times)
+        np.testing.assert_allclose(np.ravel(slope(self._times)),
+                                   1 - 16 / self._times ** 2)
+
+    def test_cubic_is_exact(self):
+        """Test case for reproducing a cubic polynomial exactly
+
+        :return: None
+        """
+        func = hermite.hermite_interpolant(self._times, self._times ** 3,
+                                           3 * self._times ** 2)
+        samples = np.linspace(1, 10, 37)
+
+        np.testing.assert_allclose(np.ravel(func(samples)), samples ** 3)
+
+    def test_pickle(self):
+        """Test case for writing the function like an interpolant
+
+        :return: None
+        """
+        func = pickle.loads(pickle.dumps(self._func))
+
+        self.assertAlmostEqual(float(func(3.0)), float(self._func(3.0)))
+
+    def test_sweep_slope(self):
+        """Test case for matching the slope of the sweep's costs
+
+        :return: None
+        """
+        veh = vehicle.build_vehicle(helpers.sample_vehicle_data())
+
+        result = curves.solve_crossing_time(veh, 6.0, sensitivity=True)
+        after = curves.solve_crossing_time(veh, 6.1)['cost']
+        before = curves.solve_crossing_time(veh, 5.9)['cost']
+
+        self.assertAlmostEqual(result['cost'],
+                               curves.solve_crossing_time(veh, 6.0)['cost'])
+        self.assertAlmostEqual(result['slope'], (after - before) / 0.2,
+                               delta=0.05 * abs(result['slope']))
+
+
+if __name__ == '__main__':
+    unittest.main()
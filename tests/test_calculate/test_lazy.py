@@ -0,0 +1,103 @@
+"""Test cases for lazy module
+
+"""
+# Standard library imports
+import time
+import unittest
+from typing import Optional
+
+# Local application imports
+from autocross import budgets
+from autocross.calculate import lazy
+from autocross.calculate import vehicle
+from autocross.schedule import times
+from tests import helpers
+
+
+class _BoundedCurve(lazy.LazyCostCurve):
+    """Lazy cost curve of 1 / t without a solution below 2.3
+
+    """
+    def _solve_cost(self, time: float) -> Optional[float]:
+        """Get the cost of one crossing time without solving
+
+        :param time: crossing time
+        :return: crossing cost, or None below 2.3
+        """
+        return 1 / time if time >= 2.3 else None
+
+
+class TestLazy(unittest.TestCase):
+    """Test cases for solving cost curves on demand
+
+    """
+    @classmethod
+    def setUpClass(cls) -> None:
+        """Create a lazy cost curve from four coarse solves
+
+        :return: None
+        """
+        cls._veh = vehicle.build_vehicle(helpers.sample_vehicle_data())
+        cls._curve = lazy.LazyCostCurve(cls._veh, 5, 8, initial_points=4,
+                                        resolution=0.5)
+
+    def test_coarse_solves(self):
+        """Test case for solving only the coarse points up front
+
+        :return: None
+        """
+        self.assertEqual(self._curve.bounds, (5.0, 8.0))
+        self.assertGreaterEqual(self._curve.num_solves, 4)
+
+    def test_refine_on_evaluation(self):
+        """Test case for solving near an evaluation once
+
+        :return: None
+        """
+        cost = float(self._curve.func(6.5))
+        num_solves = self._curve.num_solves
+        solved_times = self._curve.solved_times
+
+        self.assertGreater(len(solved_times), 4)
+        self.assertTrue(any(abs(time - 6.5) <= 0.5 for time in solved_times))
+        self.assertAlmostEqual(self._curve(6.5), cost)
+        self.assertEqual(self._curve.num_solves, num_solves)
+
+    def test_fallback_without_solves(self):
+        """Test case for the fallback evaluating only solved points
+
+        :return: None
+        """
+        num_solves = self._curve.num_solves
+
+        cross_times = times.independent_minima([self._curve.func],
+                                               [self._curve.bounds])
+
+        self.assertEqual(self._curve.num_solves, num_solves)
+        self.assertTrue(5 <= cross_times[0] <= 8)
+
+    def test_bisect_lower_bound(self):
+        """Test case for a curve with an infeasible first point
+
+        :return: None
+        """
+        curve = _BoundedCurve(None, 1, 9, initial_points=5, resolution=0.1)
+
+        self.assertTrue(2.3 <= curve.bounds[0] <= 2.4)
+        self.assertEqual(9.0, curve.bounds[1])
+        self.assertAlmostEqual(1 / 2.5, curve(2.5), places=3)
+
+    def test_budget(self):
+        """Test case for coarse solves running out of the run budget
+
+        :return: None
+        """
+        budget = budgets.Budget(deadline=time.monotonic())
+
+        with self.assertRaises(ValueError):
+            lazy.LazyCostCurve(self._veh, 5, 8, initial_points=4,
+                               budget=budget)
+
+
+if __name__ == '__main__':
+    unittest.main()
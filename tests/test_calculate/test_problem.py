@@ -0,0 +1,84 @@
+"""Test cases for problem module
+
+"""
+# Standard library imports
+import unittest
+
+# Local application imports
+from autocross.calculate import costs
+from autocross.calculate import curves
+from autocross.calculate import problem
+from autocross.calculate import vehicle
+from autocross.calculate import warmstart
+from tests import helpers
+
+
+class TestProblem(unittest.TestCase):
+    """Test cases for crossing problems shared between directions
+
+    """
+    def setUp(self) -> None:
+        """Create a vehicle
+
+        :return: None
+        """
+        self._vehicle = helpers.sample_vehicle_data()
+
+    def test_shared_problem(self):
+        """Test case for solving every direction like a separate problem
+
+        :return: None
+        """
+        veh = vehicle.build_vehicle(self._vehicle)
+        time = 4.0
+        num_samples = costs.get_horizon(time, delta_t=curves.DELTA_T)
+        shared = problem.CrossingProblem(veh, num_samples)
+
+        for direction in ('left', 'straight'):
+            _, ref = curves.reference_path(direction, num_samples,
+                                           veh.state_bounds.initial)
+            cost, _, _ = shared.solve(time, ref)
+
+            self.assertAlmostEqual(cost, curves.solve_crossing_time(
+                veh, time, direction)['cost'], places=6)
+
+    def test_direction_curves(self):
+        """Test case for building one cost function per direction
+
+        :return: None
+        """
+        direction_curves = problem.calculate_direction_curves(
+            self._vehicle, [4.0, 5.0, 6.0, 7.0, 8.0], ('left', 'right'),
+            sensitivity=True)
+
+        self.assertEqual(list(direction_curves), ['left', 'right'])
+        for cost_curves in direction_curves.values():
+            self.assertEqual(cost_curves.cost_bounds, (4.0, 8.0))
+            self.assertIn('slope', cost_curves.results[5.0])
+
+    def test_warm_start_library(self):
+        """Test case for warm-started directions matching separate solves
+
+        :return: None
+        """
+        veh = vehicle.build_vehicle(self._vehicle)
+        times = [4.0, 5.0, 6.0, 7.0, 8.0]
+        directions = ('left', 'straight')
+        separate_library = warmstart.WarmStartLibrary()
+        shared_library = warmstart.WarmStartLibrary()
+
+        direction_curves = problem.calculate_direction_curves(
+            self._vehicle, times, directions, library=shared_library)
+
+        self.assertGreater(shared_library.hits, 0)
+        for direction in directions:
+            for time in times:
+                cost = curves.solve_crossing_time(
+                    veh, time, direction, library=separate_library)['cost']
+                self.assertAlmostEqual(
+                    cost, direction_curves[direction].results[time]['cost'],
+                    places=6)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,124 @@
+"""Test cases for warmstart module
+
+"""
+# Standard library imports
+import copy
+import os
+import tempfile
+import unittest
+
+# Third party imports
+import numpy as np
+
+# Local application imports
+from autocross.calculate import curves
+from autocross.calculate import vehicle
+from autocross.calculate import warmstart
+from tests import helpers
+
+
+class TestWarmStart(unittest.TestCase):
+    """Test cases for the warm-start library
+
+    """
+    def setUp(self) -> None:
+        """Create a vehicle and a translated copy of it
+
+        :return: None
+        """
+        data = helpers.sample_vehicle_data()
+
+        moved = copy.deepcopy(data)
+        moved['state_bounds']['initial'][0] += 3.5
+        moved['state_bounds']['initial'][1] -= 1.25
+
+        self._vehicle = vehicle.build_vehicle(data)
+        self._moved = vehicle.build_vehicle(moved)
+
+        self._states = np.stack((np.linspace(0, 10, 11), np.zeros(11),
+                                 np.ones(11)))
+        for index, position in enumerate(data['state_bounds']['initial'][:2]):
+            self._states[index, :] += position
+        self._inputs = np.stack((np.zeros(10), np.linspace(1, 2, 10)))
+
+    def test_resample(self):
+        """Test case for resampling a trajectory to another horizon
+
+        :return: None
+        """
+        resampled = warmstart.resample(self._inputs, 19)
+
+        self.assertEqual(resampled.shape, (2, 19))
+        np.testing.assert_allclose(resampled[1, [0, -1]], [1, 2])
+        np.testing.assert_allclose(resampled[1, 9], 1.5)
+
+    def test_initial_guess(self):
+        """Test case for moving a stored trajectory to a vehicle
+
+        :return: None
+        """
+        library = warmstart.WarmStartLibrary()
+        library.add(self._vehicle, None, self._states, self._inputs)
+
+        self.assertIsNone(library.initial_guess(self._moved, 'left', 10))
+
+        states, inputs = library.initial_guess(self._moved, 'straight', 10)
+        np.testing.assert_allclose(states[0] - states[0, 0],
+                                   np.linspace(0, 10, 11))
+        np.testing.assert_allclose(
+            states[:2, 0], self._moved.state_bounds.initial[:2])
+        np.testing.assert_allclose(inputs, self._inputs)
+        self.assertEqual((library.hits, library.misses), (1, 1))
+
+    def test_size_bound(self):
+        """Test case for evicting the least recently used trajectory
+
+        :return: None
+        """
+        library = warmstart.WarmStartLibrary(max_entries=2)
+
+        for num_samples in (10, 20, 30):
+            library.add(self._vehicle, None,
+                        warmstart.resample(self._states, num_samples + 1),
+                        warmstart.resample(self._inputs, num_samples))
+
+        self.assertEqual(len(library), 2)
+        states, _ = library.initial_guess(self._vehicle, None, 12)
+        self.assertEqual(states.shape[1], 13)
+
+    def test_write_read(self):
+        """Test case for reading a written library
+
+        :return: None
+        """
+        library = warmstart.WarmStartLibrary()
+        library.add(self._vehicle, 'left', self._states, self._inputs)
+
+        with tempfile.TemporaryDirectory() as directory:
+            library_file = os.path.join(directory, 'library.npz')
+            library.write(library_file)
+
+            read = warmstart.WarmStartLibrary()
+            read.read(library_file)
+            read.read(os.path.join(directory, 'missing.npz'))
+
+        self.assertEqual(len(read), 1)
+        states, _ = read.initial_guess(self._vehicle, 'left', 10)
+        np.testing.assert_allclose(states, self._states)
+
+    def test_warm_solve(self):
+        """Test case for solving from the library like from the reference
+
+        :return: None
+        """
+        library = warmstart.WarmStartLibrary()
+        cold = curves.solve_crossing_time(self._vehicle, 6.0,
+                                          library=library)
+        warm = curves.solve_crossing_time(self._moved, 6.0, library=library)
+
+        self.assertEqual(library.hits, 1)
+        self.assertAlmostEqual(warm['cost'], cold['cost'], places=5)
+
+
+if __name__ == '__main__':
+    unittest.main()
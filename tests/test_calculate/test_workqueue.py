@@ -0,0 +1,125 @@
+"""Test cases for workqueue module
+
+"""
+# Standard library imports
+import multiprocessing
+import os
+import tempfile
+import unittest
+
+# Third party imports
+import numpy as np
+
+# Local application imports
+from autocross import fileio
+from autocross.calculate import workqueue
+from tests import helpers
+
+
+class TestWorkQueue(unittest.TestCase):
+    """Test cases for distributing solves over worker processes
+
+    """
+    def setUp(self) -> None:
+        """Create a queue for one vehicle and five crossing times
+
+        :return: None
+        """
+        self._dir = tempfile.TemporaryDirectory()
+        self._queue_dir = os.path.join(self._dir.name, 'queue')
+
+        self._num_tasks = workqueue.create_queue(
+            self._queue_dir, [helpers.sample_vehicle_data()], ['car'],
+            [5, 6, 7, 8, 9], lease_timeout=1.0)
+
+    def tearDown(self) -> None:
+        """Remove the queue
+
+        :return: None
+        """
+        self._dir.cleanup()
+
+    def test_create_existing(self):
+        """Test case for refusing to create into an existing queue
+
+        :return: None
+        """
+        manifest = workqueue.read_manifest(self._queue_dir)
+
+        with self.assertRaises(ValueError):
+            workqueue.create_queue(self._queue_dir, manifest['vehicles'],
+                                   ['car'], [5, 6])
+        with self.assertRaises(AssertionError):
+            workqueue.create_queue(os.path.join(self._dir.name, 'other'),
+                                   manifest['vehicles'], ['car'], [5, 6],
+                                   ['left', 'right'])
+
+        self.assertEqual(self._num_tasks,
+                         workqueue.queue_status(self._queue_dir)['pending'])
+
+    def test_claim_task(self):
+        """Test case for claiming every task exactly once
+
+        :return: None
+        """
+        claims = [workqueue.claim_task(self._queue_dir, 'worker')
+                  for _ in range(self._num_tasks)]
+
+        self.assertEqual(5, len(set(claims)))
+        self.assertIsNone(workqueue.claim_task(self._queue_dir, 'other'))
+        self.assertEqual({'pending': 0, 'claimed': 5, 'done': 0, 'total': 5},
+                         workqueue.queue_status(self._queue_dir))
+
+    def test_requeue_expired(self):
+        """Test case for retrying tasks whose lease expired
+
+        :return: None
+        """
+        workqueue.claim_task(self._queue_dir, 'worker')
+
+        self.assertEqual(0, workqueue.requeue_expired(self._queue_dir))
+        self.assertEqual(1, workqueue.requeue_expired(self._queue_dir, 0))
+        self.assertEqual(5, workqueue.queue_status(self._queue_dir)['pending'])
+
+    def test_workers(self):
+        """Test case for solving a queue with several worker processes
+
+        One task is held by a worker that never finishes, so it is only
+        solved after its lease expires.
+
+        :return: None
+        """
+        workqueue.claim_task(self._queue_dir, 'dead')
+
+        context = multiprocessing.get_context('spawn')
+        workers = [context.Process(target=workqueue.run_worker,
+                                   args=(self._queue_dir,),
+                                   kwargs={'poll_interval': 0.1,
+                                           'wait': True})
+                   for _ in range(3)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join(timeout=120)
+
+        self.assertEqual([0, 0, 0], [worker.exitcode for worker in workers])
+        self.assertEqual({'pending': 0, 'claimed': 0, 'done': 5, 'total': 5},
+                         workqueue.queue_status(self._queue_dir))
+
+        output_dir = os.path.join(self._dir.name, 'costs')
+        paths = workqueue.reduce_queue(self._queue_dir, output_dir)
+        self.assertEqual(['car.cost', 'car.wait'],
+                         [os.path.basename(path) for path in paths])
+
+        cost_func, cost_bounds = fileio.parse_cost_data(
+            fileio.read_cost_file(paths[0]))
+        self.assertEqual((5, 9), tuple(cost_bounds))
+        self.assertTrue(np.all(np.isfinite(np.ravel(cost_func([5, 7, 9])))))
+
+    def test_reduce_incomplete(self):
+        """Test case for reducing a queue with missing results
+
+        :return: None
+        """
+        with self.assertRaises(ValueError):
+            workqueue.reduce_queue(self._queue_dir, self._dir.name)
@@ -90,6 +90,26 @@ class TestCmdDispatch(unittest.TestCase):
         with self.assertRaises(KeyError):
             dispatcher.dispatch('test_cmd', None)
 
+    def test_cmd_dispatcher_register_lazy_command(self) -> None:
+        """Test case for dispatching to a lazily imported command
+
+        Test case assumes the handler is only imported on dispatch.
+
+        :return: None
+        """
+        dispatcher = cmd_dispatch.CmdDispatcher()
+
+        dispatcher.register_lazy_command('missing_cmd', 'missing_module',
+                                         'missing_main')
+        dispatcher.register_lazy_command('test_cmd', 'json', 'dumps',
+                                         sort_keys=True)
+
+        self.assertEqual('{"a": 1, "b": 2}',
+                         dispatcher.dispatch('test_cmd', {'b': 2, 'a': 1}))
+
+        with self.assertRaises(ModuleNotFoundError):
+            dispatcher.dispatch('missing_cmd', None)
+
 
 if __name__ == '__main__':
     unittest.main()
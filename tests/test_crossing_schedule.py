@@ -0,0 +1,107 @@
+"""Test cases for crossing_schedule module
+
+"""
+# Standard library imports
+import unittest
+
+# Third party imports
+import numpy as np
+
+# Local application imports
+from autocross import crossing_schedule
+
+
+class TestSchedule(unittest.TestCase):
+    """Test cases for the array-backed crossing schedule
+
+    """
+    def setUp(self) -> None:
+        """Setup a serial schedule
+
+        Vehicle 2 crosses first, then vehicle 0, then vehicle 1.
+
+        :return: None
+        """
+        self._schedule = crossing_schedule.Schedule([1, 2, 0], [3, 4, 2])
+
+    def test_slots_from_values(self) -> None:
+        """Test case for non-decreasing slots
+
+        :return: None
+        """
+        output = crossing_schedule.slots_from_values([4, 6, 5, 4])
+
+        np.testing.assert_array_equal([0, 3, 2, 1], output)
+
+    def test_permutation(self) -> None:
+        """Test case for the inverse permutation
+
+        :return: None
+        """
+        np.testing.assert_array_equal([2, 0, 1], self._schedule.permutation)
+
+    def test_start_times(self) -> None:
+        """Test case for serial start times
+
+        :return: None
+        """
+        np.testing.assert_array_equal([2, 5, 0], self._schedule.start_times)
+        self.assertEqual(9, self._schedule.clearing_time)
+
+    def test_from_values(self) -> None:
+        """Test case for ordering by values
+
+        :return: None
+        """
+        schedule = crossing_schedule.Schedule.from_values([23, 51, 0, 30],
+                                                          [1, 1, 1, 1])
+
+        np.testing.assert_array_equal([1, 3, 0, 2], schedule.crossing_order)
+
+    def test_explicit_start_times(self) -> None:
+        """Test case for concurrent start times
+
+        :return: None
+        """
+        schedule = self._schedule.with_start_times([0, 0, 1])
+
+        self.assertFalse(schedule.is_serial)
+        self.assertEqual(4, schedule.clearing_time)
+
+    def test_arrays_read_only(self) -> None:
+        """Test case for read-only arrays
+
+        :return: None
+        """
+        with self.assertRaises(ValueError):
+            self._schedule.crossing_times[0] = 1
+
+    def test_dict_round_trip(self) -> None:
+        """Test case for converting to and from schedule data
+
+        :return: None
+        """
+        schedule = self._schedule.with_start_times([0, 0, 1])
+
+        output = crossing_schedule.Schedule.from_dict(schedule.to_dict())
+
+        np.testing.assert_array_equal(schedule.crossing_order,
+                                      output.crossing_order)
+        np.testing.assert_array_equal(schedule.start_times,
+                                      output.start_times)
+
+    def test_from_dict_lists(self) -> None:
+        """Test case for schedule data stored as lists
+
+        :return: None
+        """
+        data = {'crossing_order': [1, 0], 'crossing_times': [2.0, 3.0]}
+
+        output = crossing_schedule.Schedule.from_dict(data)
+
+        self.assertTrue(output.is_serial)
+        np.testing.assert_array_equal([3, 0], output.start_times)
+
+
+if __name__ == '__main__':
+    unittest.main()
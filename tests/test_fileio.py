@@ -10,6 +10,7 @@ import time
 import unittest
 
 # Local application imports
+from autocross import crossing_schedule
 from autocross import fileio
 
 
@@ -86,6 +87,38 @@ class TestFileio(unittest.TestCase):
         self.assertEqual(self._cost_data['cost_function'], out_func)
         self.assertEqual(self._cost_data['cost_bounds'], out_bounds)
 
+    def test_write_read_schedule(self) -> None:
+        """Test case for writing and reading a schedule
+
+        :return: None
+        """
+        schedule = crossing_schedule.Schedule([1, 0], [2.0, 3.0])
+
+        fileio.write_schedule(self._cost_filepath, schedule)
+        output = fileio.read_schedule(self._cost_filepath)
+        data = fileio.read_schedule_file(self._cost_filepath)
+
+        self.assertEqual([1, 0], list(output.crossing_order))
+        self.assertEqual([2.0, 3.0], list(output.crossing_times))
+        self.assertEqual([1, 0], list(data['crossing_order']))
+
+    def test_write_read_cost_table(self) -> None:
+        """Test case for writing and reading a cost table
+
+        :return: None
+        """
+        times = [1.0, 2.0, 3.0]
+        costs = [[3.0, 2.0, 1.0], [1.0, 2.0, 3.0]]
+
+        fileio.write_cost_table(self._cost_filepath, times, costs,
+                                [[1.0, 3.0], [2.0, 3.0]], [1.0, 2.0])
+        output = fileio.read_cost_table(self._cost_filepath)
+
+        self.assertEqual(times, list(output['times']))
+        self.assertEqual(costs, output['costs'].tolist())
+        self.assertEqual([2.0, 3.0], list(output['bounds'][1]))
+        self.assertEqual([1.0, 2.0], list(output['wait_factors']))
+
     def test_read_vehicle_file(self) -> None:
         """Test case for reading a vehicle file
 
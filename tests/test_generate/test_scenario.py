@@ -0,0 +1,100 @@
+"""Test cases for scenario module
+
+"""
+# Standard library imports
+import os
+import tempfile
+import unittest
+
+# Third party imports
+import numpy as np
+
+# Local application imports
+from autocross import fileio
+from autocross.calculate import vehicle
+from autocross.generate import scenario
+
+
+class TestScenario(unittest.TestCase):
+    """Test cases for synthetic scenario generation
+
+    """
+    def test_sample_fleet_deterministic(self) -> None:
+        """Test case for fleets determined by the seed
+
+        :return: None
+        """
+        first = scenario.sample_fleet(scenario.ScenarioParams(50, seed=3))
+        second = scenario.sample_fleet(scenario.ScenarioParams(50, seed=3))
+        other = scenario.sample_fleet(scenario.ScenarioParams(50, seed=4))
+
+        for name, values in first.items():
+            np.testing.assert_array_equal(values, second[name])
+        self.assertFalse(np.array_equal(first['approach'], other['approach']))
+        self.assertTrue(np.all(np.diff(first['arrival_time']) > 0))
+
+    def test_surrogate_costs(self) -> None:
+        """Test case for surrogate costs within feasible bounds
+
+        :return: None
+        """
+        fleet = scenario.sample_fleet(scenario.ScenarioParams(20))
+        times = np.arange(1, 20.5, 0.5)
+
+        costs, bounds = scenario.surrogate_costs(fleet, times)
+
+        self.assertEqual((20, times.size), costs.shape)
+        min_times = fleet['path_length'] / fleet['max_speed']
+        self.assertTrue(np.all(bounds[:, 0] >= np.minimum(min_times, 19)))
+        self.assertTrue(np.all(bounds[:, 0] < bounds[:, 1]))
+
+    def test_surrogate_costs_infeasible(self) -> None:
+        """Test case for vehicles that cannot cross within the time grid
+
+        :return: None
+        """
+        fleet = scenario.sample_fleet(scenario.ScenarioParams(5))
+        min_times = fleet['path_length'] / fleet['max_speed']
+        times = np.linspace(0.1, 0.9, 5) * np.min(min_times)
+
+        with self.assertRaises(ValueError):
+            scenario.surrogate_costs(fleet, times)
+
+    def test_write_scenario(self) -> None:
+        """Test case for writing vehicle, arrival and cost files
+
+        :return: None
+        """
+        params = scenario.ScenarioParams(12, seed=1)
+
+        with tempfile.TemporaryDirectory() as directory:
+            paths = scenario.write_scenario(directory, params,
+                                            times=np.arange(1, 21),
+                                            cost_files=True)
+
+            vehicle_files = sorted(os.listdir(paths['vehicles']))
+            self.assertEqual(12, len(vehicle_files))
+            data = fileio.read_vehicle_file(
+                os.path.join(paths['vehicles'], vehicle_files[0]))
+            veh = vehicle.build_vehicle(data)
+            self.assertEqual(2, veh.num_inputs)
+            self.assertIn('wait_factor', data)
+            self.assertEqual(data, scenario.vehicle_data(
+                scenario.sample_fleet(params), 0))
+
+            arrival_times, movements = fileio.read_arrivals_file(
+                paths['arrivals'])
+            self.assertEqual(12, len(arrival_times))
+            self.assertEqual(2, len(movements[0].split(':')))
+
+            table = fileio.read_cost_table(paths['cost_table'])
+            cost_func, cost_bounds = fileio.parse_cost_data(
+                fileio.read_cost_file(os.path.join(paths['costs'],
+                                                   '00.cost')))
+            self.assertAlmostEqual(table['costs'][0, 4],
+                                   float(cost_func(table['times'][4])))
+            self.assertEqual(tuple(table['bounds'][0]), cost_bounds)
+
+
+if __name__ == '__main__':
+    unittest.main()
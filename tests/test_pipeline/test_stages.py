@@ -0,0 +1,93 @@
+"""Test cases for stages module
+
+"""
+# Standard library imports
+import json
+import os
+import tempfile
+import unittest
+
+# Third party imports
+import numpy as np
+
+# Local application imports
+from autocross import fileio
+from autocross.pipeline import stages
+from autocross.schedule import build
+
+
+class TestStages(unittest.TestCase):
+    """Test cases for running the pipeline in memory
+
+    """
+    def setUp(self) -> None:
+        """Create a three vehicle fleet from a cost table
+
+        :return: None
+        """
+        times = np.arange(1.0, 21.0)
+        costs = np.stack([times + effort / times for effort in (4, 9, 16)])
+        bounds = np.array([[1.0, 20.0]] * 3)
+        self._fleet = stages.fleet_from_cost_table({
+            'times': times, 'costs': costs, 'bounds': bounds,
+            'wait_factors': np.array([1.0, 2.0, 3.0])})
+
+    def test_run_pipeline(self):
+        """Test case for scheduling and analyzing a fleet
+
+        :return: None
+        """
+        timings = {'load': 0.5}
+        result = stages.run_pipeline(lambda: self._fleet, 'fcf',
+                                     timings=timings)
+
+        self.assertEqual(['load', 'calculate', 'schedule', 'analyze'],
+                         list(result.timings))
+        self.assertEqual({'load': 0.5}, timings)
+        self.assertEqual([0, 1, 2],
+                         sorted(result.schedule.crossing_order.tolist()))
+
+        expected = build.build_schedule('fcf', self._fleet.cost_funcs,
+                                        self._fleet.cost_bounds)
+        np.testing.assert_allclose(expected.crossing_times,
+                                   result.schedule.crossing_times)
+        self.assertAlmostEqual(result.analysis['wait_cost']
+                               + result.analysis['crossing_cost'],
+                               result.analysis['schedule_cost'])
+
+    def test_run_pipeline_movements(self):
+        """Test case for enforcing lane order with movements
+
+        :return: None
+        """
+        movements = [('north', 'straight'), ('north', 'straight'),
+                     ('east', 'straight')]
+        result = stages.run_pipeline(self._fleet, 'fcf', movements)
+
+        order = result.schedule.crossing_order.tolist()
+        self.assertLess(order.index(0), order.index(1))
+        self.assertNotIn('calculate', result.timings)
+
+    def test_write_artifacts(self):
+        """Test case for writing the pipeline outputs
+
+        :return: None
+        """
+        result = stages.run_pipeline(self._fleet, 'fixed')
+
+        with tempfile.TemporaryDirectory() as output_dir:
+            stages.write_artifacts(output_dir, result, ['a', 'b', 'c'],
+                                   'fixed')
+
+            self.assertTrue(os.path.isfile(os.path.join(output_dir,
+                                                        'b.wait')))
+            schedule = fileio.read_schedule(
+                os.path.join(output_dir, 'schedule.fixed'))
+            self.assertEqual([0, 1, 2], list(schedule.crossing_order))
+
+            with open(os.path.join(output_dir,
+                                   stages.ANALYSIS_FILE)) as file:
+                analysis = json.load(file)
+            self.assertAlmostEqual(result.analysis['schedule_cost'],
+                                   analysis['schedule_cost'])
+            self.assertIn('schedule', analysis['timings'])
@@ -0,0 +1,66 @@
+"""Test cases for decimate module
+
+"""
+# Standard library imports
+import unittest
+
+# Third party imports
+import numpy as np
+
+# Local application imports
+from autocross.plot import decimate
+
+
+class TestDecimate(unittest.TestCase):
+    """Test cases for shape-preserving downsampling
+
+    """
+    def setUp(self) -> None:
+        """Create a long noisy signal with a single spike
+
+        :return: None
+        """
+        self._x = np.linspace(0, 100, 100000)
+        self._y = np.sin(self._x) \
+            + 0.01 * np.random.default_rng(1).standard_normal(self._x.size)
+        self._y[54321] = 10.0
+
+    def test_lttb(self) -> None:
+        """Test case for LTTB keeping endpoints and the spike
+
+        :return: None
+        """
+        indices = decimate.lttb_indices(self._x, self._y, 500)
+
+        self.assertEqual(500, indices.size)
+        self.assertEqual(0, indices[0])
+        self.assertEqual(self._x.size - 1, indices[-1])
+        self.assertTrue(np.all(np.diff(indices) > 0))
+        self.assertIn(54321, indices)
+
+    def test_min_max(self) -> None:
+        """Test case for keeping every bucket's extremes
+
+        :return: None
+        """
+        indices = decimate.min_max_indices(self._y, 500)
+
+        self.assertLessEqual(indices.size, 500)
+        self.assertTrue(np.all(np.diff(indices) > 0))
+        self.assertIn(54321, indices)
+        self.assertIn(int(np.argmin(self._y)), indices)
+
+    def test_short_series(self) -> None:
+        """Test case for series within the budget kept as they are
+
+        :return: None
+        """
+        x, y = decimate.decimate([0, 1, 2], [3, 1, 2], 10,
+                                 decimate.METHOD_MIN_MAX)
+
+        np.testing.assert_array_equal([0, 1, 2], x)
+        np.testing.assert_array_equal([3, 1, 2], y)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+"""Test cases for render module
+
+"""
+# Standard library imports
+import os
+import tempfile
+import unittest
+
+# Third party imports
+import casadi
+import numpy as np
+
+# Local application imports
+from autocross import fileio
+from autocross.plot import render
+
+
+class TestRender(unittest.TestCase):
+    """Test cases for headless plot rendering
+
+    """
+    def setUp(self) -> None:
+        """Write two cost files with different bounds
+
+        :return: None
+        """
+        self._dir = tempfile.TemporaryDirectory()
+        grid = np.linspace(0, 20, 21)
+        cost_func = casadi.interpolant('cost', 'bspline', [grid],
+                                       list(grid ** 2))
+
+        self._cost_files = []
+        for vid, bounds in enumerate(((0, 10), (5, 20))):
+            filepath = os.path.join(self._dir.name, f'{vid}.cost')
+            fileio.write_cost_file(filepath, cost_func, bounds)
+            self._cost_files.append(filepath)
+
+    def tearDown(self) -> None:
+        """Remove the temporary files
+
+        :return: None
+        """
+        self._dir.cleanup()
+
+    def test_evaluate_curve(self) -> None:
+        """Test case for evaluating a curve and its crossing time at once
+
+        :return: None
+        """
+        calls = []
+
+        def cost_func(times):
+            calls.append(times)
+            return times ** 2
+
+        times, costs, crossing_cost = render.evaluate_curve(
+            cost_func, (1, 3), np.arange(0, 5), 2.5)
+
+        self.assertEqual(1, len(calls))
+        np.testing.assert_allclose([1, 2, 3], times)
+        np.testing.assert_allclose([1, 4, 9], costs)
+        self.assertAlmostEqual(6.25, crossing_cost)
+
+    def test_render_files(self) -> None:
+        """Test case for one data file per input on a shared grid
+
+        :return: None
+        """
+        output_dir = os.path.join(self._dir.name, 'out')
+
+        output = render.render_files(self._cost_files, output_dir,
+                                     crossing_times=[4, 6])
+
+        self.assertEqual(4, len(output))
+        for path in output:
+            self.assertTrue(os.path.isfile(path))
+
+        first = np.loadtxt(os.path.join(output_dir, '0.cost.dat'),
+                           skiprows=1)
+        second = np.loadtxt(os.path.join(output_dir, '1.cost.dat'),
+                            skiprows=1)
+        np.testing.assert_allclose(first[50:, 0], second[:len(first) - 50, 0])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,137 @@
+"""Test cases for conflicts module
+
+"""
+# Standard library imports
+import unittest
+
+# Local application imports
+from autocross.schedule import conflicts
+
+
+class TestConflictGraph(unittest.TestCase):
+    """Test cases for building movement conflict graphs
+
+    """
+    def setUp(self) -> None:
+        """Build the four-way intersection conflict graph
+
+        :return: None
+        """
+        self._graph = conflicts.four_way_conflict_graph()
+
+    def test_parse_movement(self) -> None:
+        """Test case for parsing movement strings
+
+        :return: None
+        """
+        self.assertEqual(('south', 'left'),
+                         conflicts.parse_movement('south:left'))
+        self.assertEqual(('south', 'straight'),
+                         conflicts.parse_movement('south'))
+        self.assertEqual(('south', 'straight'),
+                         conflicts.parse_movement('south:straight'))
+
+    def test_parse_movement_misspelled(self) -> None:
+        """Test case for rejecting an unknown direction
+
+        :return: None
+        """
+        with self.assertRaises(ValueError):
+            conflicts.parse_movement('south:lfet')
+
+    def test_opposing_straights_compatible(self) -> None:
+        """Test case for opposing through movements
+
+        :return: None
+        """
+        self.assertFalse(conflicts.movements_conflict(
+            ('north', 'straight'), ('south', 'straight'), self._graph))
+
+    def test_left_turn_conflicts_with_opposing_straight(self) -> None:
+        """Test case for a left turn across opposing traffic
+
+        :return: None
+        """
+        self.assertTrue(conflicts.movements_conflict(
+            ('south', 'left'), ('north', 'straight'), self._graph))
+
+    def test_merge_conflict(self) -> None:
+        """Test case for movements sharing an exit
+
+        :return: None
+        """
+        self.assertTrue(conflicts.movements_conflict(
+            ('south', 'straight'), ('east', 'right'), self._graph))
+
+    def test_same_lane_conflict(self) -> None:
+        """Test case for movements sharing an approach lane
+
+        :return: None
+        """
+        self.assertTrue(conflicts.movements_conflict(
+            ('south', 'right'), ('south', 'left'), self._graph))
+
+    def test_parse_conflict_data_symmetric(self) -> None:
+        """Test case for parsing conflicts from data
+
+        :return: None
+        """
+        data = {'conflicts': [['a:left', 'b:straight']]}
+
+        graph = conflicts.parse_conflict_data(data)
+
+        self.assertIn(('b', 'straight'), graph[('a', 'left')])
+        self.assertIn(('a', 'left'), graph[('b', 'straight')])
+
+
+class TestStartTimesConcurrent(unittest.TestCase):
+    """Test cases for concurrent start times
+
+    """
+    def test_compatible_movements_overlap(self) -> None:
+        """Test case for vehicles with non-conflicting movements
+
+        :return: None
+        """
+        movements = [('north', 'straight'), ('south', 'straight')]
+
+        output = conflicts.start_times_concurrent([0, 1], [4, 5], movements)
+
+        self.assertEqual([0, 0], output)
+
+    def test_conflicting_movements_serialized(self) -> None:
+        """Test case for vehicles with conflicting movements
+
+        :return: None
+        """
+        movements = [('north', 'straight'), ('east', 'straight'),
+                     ('south', 'straight')]
+
+        output = conflicts.start_times_concurrent([1, 0, 2], [4, 3, 2],
+                                                  movements)
+
+        self.assertEqual([3, 0, 3], output)
+
+    def test_order_preserved_without_backfill(self) -> None:
+        """Test case for admission order
+
+        The third vehicle is compatible with the first, but it is not
+        allowed to start before the second vehicle.
+
+        :return: None
+        """
+        movements = [('north', 'straight'), ('east', 'straight'),
+                     ('south', 'straight')]
+
+        output = conflicts.start_times_concurrent([0, 1, 2], [4, 3, 2],
+                                                  movements)
+        backfilled = conflicts.start_times_concurrent([0, 1, 2], [4, 3, 2],
+                                                      movements,
+                                                      backfill=True)
+
+        self.assertEqual([0, 4, 7], output)
+        self.assertEqual([0, 4, 0], backfilled)
+
+
+if __name__ == '__main__':
+    unittest.main()
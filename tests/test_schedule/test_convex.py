@@ -0,0 +1,99 @@
+"""Test cases for convex module
+
+"""
+# Standard library imports
+import unittest
+
+# Third party imports
+import casadi
+import numpy as np
+
+# Local application imports
+from autocross.schedule import convex
+from autocross.schedule import times
+
+
+class TestConvex(unittest.TestCase):
+    """Test cases for convexified crossing time assignment
+
+    """
+    def setUp(self) -> None:
+        """Create convex cost functions with known optimal times
+
+        :return: None
+        """
+        grid = np.linspace(1, 20, 191)
+        self._efforts = (4, 9, 16)
+        self._funcs = [casadi.interpolant('cost', 'bspline', [grid],
+                                          list(grid + effort / grid))
+                       for effort in self._efforts]
+        self._bounds = [(1.0, 20.0)] * len(self._funcs)
+
+    def test_lower_convex_envelope(self):
+        """Test case for dropping points above the envelope
+
+        :return: None
+        """
+        x = np.arange(5.0)
+        y = np.array([0.0, 2.0, 1.0, 3.0, 4.0])
+
+        np.testing.assert_array_equal(convex.lower_convex_envelope(x, y),
+                                      [0, 2, 4])
+
+    def test_convexify_nonconvex_curve(self):
+        """Test case for reporting the deviation of a nonconvex curve
+
+        :return: None
+        """
+        grid = np.linspace(1, 20, 191)
+        func = casadi.interpolant('cost', 'linear', [grid],
+                                  list(np.sin(grid)))
+
+        curve = convex.convexify_curve(func, (1, 20))
+
+        self.assertAlmostEqual(curve.max_deviation, 2.0, places=2)
+        self.assertAlmostEqual(curve.relative_deviation, 1.0, places=2)
+        self.assertTrue(np.all(np.diff(np.diff(curve.values)
+                                       / np.diff(curve.breakpoints)) >= 0))
+
+    def test_assign_individual_times(self):
+        """Test case for crossing at each envelope's minimum
+
+        :return: None
+        """
+        curves = convex.convexify_curves(self._funcs, self._bounds)
+
+        self.assertTrue(all(curve.max_deviation < 1e-9 for curve in curves))
+        np.testing.assert_allclose(
+            convex.assign_convex_crossing_times(curves),
+            np.sqrt(self._efforts), atol=0.05)
+
+    def test_assign_times_with_cross_sum(self):
+        """Test case for matching the solver on a crossing sum
+
+        :return: None
+        """
+        curves = convex.convexify_curves(self._funcs, self._bounds)
+
+        cross_times = convex.assign_convex_crossing_times(curves, 6.0)
+        problem = times.CrossingTimeProblem(self._funcs, self._bounds)
+        _, expected = problem.solve(6.0, [3.0, 3.0, 3.0])
+
+        self.assertAlmostEqual(sum(cross_times), 6.0)
+        np.testing.assert_allclose(cross_times, expected, atol=0.05)
+
+    def test_slack_penalty(self):
+        """Test case for exceeding the crossing sum when it is cheaper
+
+        :return: None
+        """
+        curves = convex.convexify_curves(self._funcs, self._bounds)
+
+        cross_times = convex.assign_convex_crossing_times(curves, 6.0, 0.0)
+
+        np.testing.assert_allclose(
+            cross_times, convex.assign_convex_crossing_times(curves))
+
+
+if __name__ == '__main__':
+    unittest.main()
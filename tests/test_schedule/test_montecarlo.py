@@ -0,0 +1,118 @@
+"""Test cases for montecarlo module
+
+"""
+# Standard library imports
+import unittest
+
+# Third party imports
+import numpy as np
+
+# Local application imports
+from autocross.analyze import utils
+from autocross.schedule import conflicts
+from autocross.schedule import montecarlo
+from autocross.schedule import queues
+
+
+class TestMonteCarlo(unittest.TestCase):
+    """Test cases for Monte Carlo evaluation of crossing orders
+
+    """
+    def test_random_arrival_orders_reproducible(self) -> None:
+        """Test case for seeded order generation
+
+        :return: None
+        """
+        first = montecarlo.random_arrival_orders(6, 50, seed=7, chunk_size=16)
+        second = montecarlo.random_arrival_orders(6, 50, seed=7,
+                                                  chunk_size=16)
+
+        np.testing.assert_array_equal(first, second)
+
+    def test_random_arrival_orders_are_permutations(self) -> None:
+        """Test case for the shape and content of drawn orders
+
+        :return: None
+        """
+        output = montecarlo.random_arrival_orders(6, 50, seed=7,
+                                                  chunk_size=16)
+
+        self.assertEqual((50, 6), output.shape)
+        np.testing.assert_array_equal(np.sort(output, axis=1),
+                                      np.tile(np.arange(6), (50, 1)))
+
+    def test_slots_from_values(self) -> None:
+        """Test case for vectorized first-come-first-serve slots
+
+        :return: None
+        """
+        values = np.array([[23, 51, 0, 30], [4, 3, 5, 1]])
+        sol = np.array([[1, 3, 0, 2], [2, 1, 3, 0]])
+
+        np.testing.assert_array_equal(sol,
+                                      montecarlo.slots_from_values(values))
+
+    def test_serial_start_times(self) -> None:
+        """Test case comparing against the single schedule start times
+
+        :return: None
+        """
+        crossing_times = [3.0, 1.5, 2.0, 4.0]
+        orders = np.array([[2, 0, 3, 1], [0, 1, 2, 3]])
+
+        output = montecarlo.serial_start_times(orders, crossing_times)
+
+        for row, order in zip(output, orders):
+            sol = utils.start_times_from_schedule(list(order), crossing_times)
+            np.testing.assert_allclose(sol, row)
+
+    def test_schedule_costs(self) -> None:
+        """Test case for sampled schedule costs
+
+        :return: None
+        """
+        wait_funcs = [lambda time: 2 * time, lambda time: time]
+        orders = np.array([[0, 1], [1, 0]])
+
+        output = montecarlo.schedule_costs(orders, [3.0, 5.0], wait_funcs,
+                                           [1.0, 1.0])
+
+        np.testing.assert_allclose([5.0, 12.0], output)
+
+    def test_concurrent_start_times(self) -> None:
+        """Test case comparing against single concurrent schedules
+
+        :return: None
+        """
+        crossing_times = [3.0, 1.5, 2.0, 4.0]
+        movements = [('north', 'straight'), ('south', 'straight'),
+                     ('east', 'straight'), ('north', 'left')]
+        lanes = [lane for lane, _ in movements]
+        orders = np.array([[2, 0, 3, 1], [3, 1, 2, 0]])
+
+        output = montecarlo.concurrent_start_times(orders, crossing_times,
+                                                   movements)
+
+        for row, order in zip(output, orders):
+            sol = conflicts.start_times_concurrent(
+                queues.enforce_lane_precedence(order, lanes),
+                crossing_times, movements)
+            np.testing.assert_allclose(sol, row)
+        self.assertLess(np.max(output[0] + crossing_times),
+                        sum(crossing_times))
+
+    def test_summarize(self) -> None:
+        """Test case for distribution summaries
+
+        :return: None
+        """
+        output = montecarlo.summarize(np.arange(101), percentiles=(50, 95))
+
+        self.assertEqual(50, output['mean'])
+        self.assertEqual(50, output['p50'])
+        self.assertEqual(95, output['p95'])
+        self.assertEqual(100, output['max'])
+
+
+if __name__ == '__main__':
+    unittest.main()
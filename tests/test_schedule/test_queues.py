@@ -0,0 +1,113 @@
+"""Test cases for queues module
+
+"""
+# Standard library imports
+import itertools
+import unittest
+
+# Local application imports
+from autocross.schedule import queues
+
+
+class TestQueues(unittest.TestCase):
+    """Test cases for scheduling lane queues
+
+    """
+    def setUp(self) -> None:
+        """Setup lanes and crossing times
+
+        Vehicles 0, 2 and 4 are queued in lane 'a' and vehicles 1 and 3
+        in lane 'b'.
+
+        :return: None
+        """
+        self._lanes = ['a', 'b', 'a', 'b', 'a']
+        self._crossing_times = [9, 4, 1, 2, 3]
+        self._queues = queues.lane_queues(self._lanes)
+
+    def _respects_queues(self, schedule: list) -> bool:
+        """Check that a schedule keeps every lane's queue order
+
+        :param schedule: list of crossing slots indexed by vehicle ID
+        :return: True if queue order is kept in every lane
+        """
+        return all(schedule[first] < schedule[second]
+                   for queue in self._queues.values()
+                   for first, second in zip(queue, queue[1:]))
+
+    def _weighted_start_sum(self, schedule: list, weights: list) -> float:
+        """Calculate the total weighted start time of a serial schedule
+
+        :param schedule: list of crossing slots indexed by vehicle ID
+        :param weights: list of weights indexed by vehicle ID
+        :return: sum of weighted start times
+        """
+        start = 0
+        total = 0
+
+        for vid in sorted(range(len(schedule)), key=schedule.__getitem__):
+            total += weights[vid] * start
+            start += self._crossing_times[vid]
+
+        return total
+
+    def test_lane_queues(self) -> None:
+        """Test case for grouping vehicles into queues
+
+        :return: None
+        """
+        self.assertEqual({'a': [0, 2, 4], 'b': [1, 3]}, self._queues)
+
+    def test_lane_prefix_sums(self) -> None:
+        """Test case for per-lane prefix sums
+
+        :return: None
+        """
+        output = queues.lane_prefix_sums(self._queues, self._crossing_times)
+
+        self.assertEqual([0, 9, 10, 13], list(output['a']))
+        self.assertEqual([0, 4, 6], list(output['b']))
+
+    def test_enforce_lane_precedence(self) -> None:
+        """Test case for repairing a crossing order
+
+        :return: None
+        """
+        crossing_order = [4, 1, 0, 3, 2]
+
+        output = queues.enforce_lane_precedence(crossing_order, self._lanes)
+
+        self.assertEqual([0, 1, 2, 3, 4], output)
+
+    def test_merge_by_key(self) -> None:
+        """Test case for merging queues by front vehicle key
+
+        :return: None
+        """
+        output = queues.merge_by_key(self._queues, self._crossing_times)
+
+        self.assertEqual([2, 0, 3, 1, 4], output)
+
+    def test_merge_weighted_chains_optimal(self) -> None:
+        """Test case for weighted chain merging
+
+        The merged order is compared against all orders that respect
+        the lane queues.
+
+        :return: None
+        """
+        weights = [1, 2, 1, 1, 3]
+
+        output = queues.merge_weighted_chains(self._queues,
+                                              self._crossing_times, weights)
+
+        best = min(self._weighted_start_sum(list(order), weights)
+                   for order in itertools.permutations(range(5))
+                   if self._respects_queues(list(order)))
+
+        self.assertTrue(self._respects_queues(output))
+        self.assertEqual(best, self._weighted_start_sum(output, weights))
+
+
+if __name__ == '__main__':
+    unittest.main()
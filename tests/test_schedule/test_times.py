@@ -0,0 +1,101 @@
+"""Test cases for times module
+
+"""
+# Standard library imports
+import contextlib
+import io
+import unittest
+
+# Third party imports
+import casadi
+import numpy as np
+
+# Local application imports
+from autocross import budgets
+from autocross.schedule import times
+
+
+class TestCrossSumSweep(unittest.TestCase):
+    """Test cases for sweeping the crossing sum
+
+    """
+    def setUp(self) -> None:
+        """Setup quadratic cost functions
+
+        Vehicle costs are (t - 6)^2 and 2 (t - 8)^2 on [2, 12], so the
+        unconstrained crossing sum is 14.
+
+        :return: None
+        """
+        grid = np.linspace(2, 12, 41)
+        self._cost_funcs = [
+            casadi.interpolant('cost_0', 'bspline', [grid],
+                               list((grid - 6) ** 2)),
+            casadi.interpolant('cost_1', 'bspline', [grid],
+                               list(2 * (grid - 8) ** 2))
+        ]
+        self._cost_bounds = [(2, 12), (2, 12)]
+
+    def test_crossing_time_problem_resolve(self) -> None:
+        """Test case for re-solving with a new crossing sum
+
+        With a binding crossing sum of 11, the optimum moves times in
+        proportion to the inverse curvature: (4, 7).
+
+        :return: None
+        """
+        problem = times.CrossingTimeProblem(self._cost_funcs,
+                                            self._cost_bounds)
+
+        _, unconstrained = problem.solve(20)
+        cost, constrained = problem.solve(11)
+
+        np.testing.assert_allclose([6, 8], unconstrained, atol=1e-3)
+        np.testing.assert_allclose([4, 7], constrained, atol=1e-3)
+        self.assertAlmostEqual(6, cost, places=3)
+
+    def test_sweep_cross_sum_sorted(self) -> None:
+        """Test case for the re-solving sweep
+
+        :return: None
+        """
+        output = times.sweep_cross_sum(self._cost_funcs, self._cost_bounds,
+                                       [9, 14, 11])
+
+        self.assertEqual(3, len(output))
+        np.testing.assert_allclose([14, 11, 9],
+                                   [result[0] for result in output],
+                                   atol=1e-3)
+
+    def test_sweep_multipliers_matches_resolve(self) -> None:
+        """Test case for the multiplier sweep
+
+        A multiplier of 4 prices both vehicles at the constrained
+        optimum for a crossing sum of 11.
+
+        :return: None
+        """
+        output = times.sweep_multipliers(self._cost_funcs, self._cost_bounds,
+                                         multipliers=[0, 4], num_points=1001)
+
+        np.testing.assert_allclose([14, 11], [result[0] for result in output],
+                                   atol=1e-2)
+        np.testing.assert_allclose([4, 7], output[1][2], atol=1e-2)
+
+    def test_budget_fallback(self) -> None:
+        """Test case for falling back to independent minima
+
+        :return: None
+        """
+        with contextlib.redirect_stderr(io.StringIO()):
+            cross_times = times.assign_optimal_crossing_times(
+                self._cost_funcs, self._cost_bounds, cross_sum=11,
+                budget=budgets.Budget(max_iter=1))
+
+        np.testing.assert_allclose([6, 8], cross_times, atol=1e-2)
+        self.assertEqual(cross_times, times.independent_minima(
+            self._cost_funcs, self._cost_bounds))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,47 @@
+"""Test cases for cache module
+
+"""
+# Standard library imports
+import unittest
+
+# Local application imports
+from autocross.serve.cache import LRUCache
+
+
+class TestLRUCache(unittest.TestCase):
+    """Test cases for the least recently used cache
+
+    """
+    def test_get(self):
+        """Test case for creating entries only on a miss
+
+        :return: None
+        """
+        cache = LRUCache(2)
+        calls = []
+
+        def factory():
+            calls.append(None)
+            return len(calls)
+
+        self.assertEqual(1, cache.get('a', factory))
+        self.assertEqual(1, cache.get('a', factory))
+        self.assertEqual(1, len(calls))
+        self.assertEqual({'size': 1, 'max_size': 2, 'hits': 1, 'misses': 1},
+                         cache.stats())
+
+    def test_eviction(self):
+        """Test case for evicting the least recently used entry
+
+        :return: None
+        """
+        cache = LRUCache(2)
+        cache.get('a', lambda: 1)
+        cache.get('b', lambda: 2)
+        cache.get('a', lambda: 1)
+        cache.get('c', lambda: 3)
+
+        self.assertIn('a', cache)
+        self.assertNotIn('b', cache)
+        self.assertIn('c', cache)
+        self.assertEqual(2, len(cache))
@@ -0,0 +1,212 @@
+"""Test cases for service and server modules
+
+"""
+# Standard library imports
+import json
+import os
+import tempfile
+import threading
+import unittest
+import urllib.request
+
+# Third party imports
+import casadi
+import numpy as np
+
+# Local application imports
+from autocross import fileio
+from autocross.serve import server
+from autocross.serve import service
+
+
+JSON_HEADERS = {'Content-Type': 'application/json'}
+
+
+class TestScheduleService(unittest.TestCase):
+    """Test cases for answering requests from memory
+
+    """
+    def setUp(self) -> None:
+        """Write a three vehicle fleet
+
+        Vehicle i has crossing cost t + (i + 2)^2 / t, which is minimal
+        at t = i + 2, and waiting cost 2t.
+
+        :return: None
+        """
+        self._dir = tempfile.TemporaryDirectory()
+        grid = np.linspace(1, 20, 39)
+        wait_func = casadi.interpolant('wait', 'bspline', [grid],
+                                       list(2 * grid))
+
+        self._cost_files = []
+        self._wait_files = []
+        for vid in range(3):
+            cost_func = casadi.interpolant('cost', 'bspline', [grid],
+                                           list(grid + (vid + 2) ** 2 / grid))
+            cost_file = os.path.join(self._dir.name, f'{vid}.cost')
+            wait_file = os.path.join(self._dir.name, f'{vid}.wait')
+            fileio.write_cost_file(cost_file, cost_func, (1, 20))
+            fileio.write_cost_file(wait_file, wait_func, (1, 20))
+            self._cost_files.append(cost_file)
+            self._wait_files.append(wait_file)
+
+        self._service = service.ScheduleService()
+
+    def tearDown(self) -> None:
+        """Remove the fleet
+
+        :return: None
+        """
+        self._dir.cleanup()
+
+    def test_schedule(self):
+        """Test case for scheduling from cached cost functions
+
+        :return: None
+        """
+        request = {'cost_files': self._cost_files,
+                   'wait_files': self._wait_files}
+        response = self._service.handle('/schedule', request)
+
+        np.testing.assert_allclose([2, 3, 4], response['crossing_times'],
+                                   atol=0.05)
+        self.assertEqual([0, 1, 2], response['crossing_order'])
+        self.assertAlmostEqual(response['analysis']['wait_cost']
+                               + response['analysis']['crossing_cost'],
+                               response['analysis']['schedule_cost'])
+
+        self._service.handle('/schedule', request)
+        stats = self._service.stats()
+        self.assertEqual(6, stats['curves']['misses'])
+        self.assertEqual(6, stats['curves']['hits'])
+        self.assertEqual(2, stats['requests'])
+
+    def test_schedule_cross_sum(self):
+        """Test case for re-solving a cached crossing time problem
+
+        :return: None
+        """
+        request = {'cost_files': self._cost_files, 'cross_sum': 6}
+
+        for cross_sum in (7, 6):
+            request['cross_sum'] = cross_sum
+            response = self._service.handle('/schedule', request)
+            self.assertLess(sum(response['crossing_times']), cross_sum + 0.1)
+
+        self.assertEqual({'size': 1, 'max_size': 16, 'hits': 1, 'misses': 1},
+                         self._service.stats()['solvers'])
+
+    def test_schedule_movements(self):
+        """Test case for scheduling with movements
+
+        :return: None
+        """
+        response = self._service.handle('/schedule', {
+            'cost_files': self._cost_files,
+            'movements': ['north:straight', 'south:straight',
+                          'east:straight']})
+
+        self.assertEqual(0.0, response['start_times'][1])
+        self.assertEqual('east:straight', response['movements'][2])
+
+    def test_reload_changed_file(self):
+        """Test case for loading a cost file again after it changed
+
+        :return: None
+        """
+        key, _ = self._service.load_curve(self._cost_files[0])
+
+        grid = np.linspace(1, 20, 39)
+        cost_func = casadi.interpolant('cost', 'bspline', [grid],
+                                       list(grid + 100 / grid))
+        fileio.write_cost_file(self._cost_files[0], cost_func, (1, 20))
+        os.utime(self._cost_files[0], ns=(0, key[1] + 1))
+
+        response = self._service.handle('/schedule', {
+            'cost_files': self._cost_files[:1]})
+        np.testing.assert_allclose([10], response['crossing_times'],
+                                   atol=0.05)
+
+    def test_analyze(self):
+        """Test case for evaluating schedules sent as data
+
+        :return: None
+        """
+        response = self._service.handle('/analyze', {
+            'cost_files': self._cost_files,
+            'wait_files': self._wait_files,
+            'schedules': [{'crossing_order': [0, 1, 2],
+                           'crossing_times': [2, 3, 4]}]})
+
+        self.assertAlmostEqual(4 + 6 + 8 + 2 * (2 + 5),
+                               response['results'][0]['schedule_cost'],
+                               places=3)
+
+    def test_http(self):
+        """Test case for answering requests over HTTP
+
+        :return: None
+        """
+        httpd = server.make_server(self._service, port=0)
+        thread = threading.Thread(target=httpd.serve_forever)
+        thread.start()
+
+        try:
+            url = server.server_address(httpd)
+            request = urllib.request.Request(
+                f'{url}/schedule',
+                data=json.dumps({'cost_files': self._cost_files}).encode(),
+                headers=JSON_HEADERS)
+            with urllib.request.urlopen(request) as response:
+                data = json.load(response)
+
+            self.assertEqual([0, 1, 2], data['crossing_order'])
+
+            with self.assertRaises(urllib.error.HTTPError) as context:
+                urllib.request.urlopen(urllib.request.Request(
+                    f'{url}/schedule', data=b'{}', headers=JSON_HEADERS))
+            self.assertEqual(400, context.exception.code)
+        finally:
+            httpd.shutdown()
+            httpd.server_close()
+            thread.join()
+
+    def test_http_cross_site(self):
+        """Test case for refusing requests a web page could send
+
+        :return: None
+        """
+        httpd = server.make_server(self._service, port=0)
+        thread = threading.Thread(target=httpd.serve_forever)
+        thread.start()
+
+        try:
+            url = server.server_address(httpd)
+            refused = [
+                # Form-encoded POSTs are sent cross-site without preflight
+                (urllib.request.Request(f'{url}/command',
+                                        data=b'argv=generate'), 415),
+                (urllib.request.Request(
+                    f'{url}/health', data=b'{}',
+                    headers={**JSON_HEADERS,
+                             'Origin': 'http://example.com'}), 403)
+            ]
+
+            for request, code in refused:
+                with self.assertRaises(urllib.error.HTTPError) as context:
+                    urllib.request.urlopen(request)
+                self.assertEqual(code, context.exception.code)
+        finally:
+            httpd.shutdown()
+            httpd.server_close()
+            thread.join()
+
+    def test_commands_disabled(self):
+        """Test case for leaving out the command route by default
+
+        :return: None
+        """
+        self.assertNotIn('/command', self._service.routes)
+        self.assertIn('/command', service.ScheduleService(
+            object(), lambda argv: None).routes)
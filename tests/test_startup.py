@@ -0,0 +1,113 @@
+"""Test cases for command start-up
+
+"""
+# Standard library imports
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+# Third party imports
+import casadi
+import numpy as np
+
+# Local application imports
+from autocross import crossing_schedule
+from autocross import fileio
+
+
+_AUTOCROSS_DIR = os.path.join(os.path.dirname(os.path.dirname(
+    os.path.abspath(__file__))), 'autocross')
+
+# Runs a command through the entry point and prints the names of the
+# imported modules
+_RUNNER = '''
+import sys
+sys.path.insert(0, sys.argv[1])
+import main
+main._main(sys.argv[2:])
+print(' '.join(sys.modules))
+'''
+
+
+class TestStartup(unittest.TestCase):
+    """Test cases for the modules each command imports
+
+    """
+    def _imported_modules(self, argv: list) -> set:
+        """Run a command in a new interpreter
+
+        :param argv: command line arguments
+        :return: names of the modules imported by the command
+        """
+        result = subprocess.run([sys.executable, '-c', _RUNNER,
+                                 _AUTOCROSS_DIR, *argv],
+                                capture_output=True, text=True, check=True)
+
+        return set(result.stdout.splitlines()[-1].split())
+
+    def test_analyze_imports(self):
+        """Test case for analyze not importing other commands
+
+        :return: None
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            grid = np.linspace(0, 20, 21)
+            func = casadi.interpolant('cost', 'bspline', [grid], list(grid))
+            cost_file = os.path.join(directory, '0.cost')
+            schedule_file = os.path.join(directory, 'schedule.fixed')
+            fileio.write_cost_file(cost_file, func, (0, 20))
+            fileio.write_schedule(schedule_file,
+                                  crossing_schedule.Schedule([0], [1]))
+
+            modules = self._imported_modules([
+                'analyze', '--cost_filepaths', cost_file,
+                '--wait_filepaths', cost_file, '--', schedule_file])
+
+        self.assertIn('analyze', modules)
+        self.assertNotIn('matplotlib', modules)
+        self.assertNotIn('plot', modules)
+        self.assertNotIn('calculate', modules)
+        self.assertNotIn('dacite', modules)
+
+    def test_generate_cost_files_requires_surrogate(self):
+        """Test case for rejecting cost files without surrogate costs
+
+        :return: None
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            result = subprocess.run(
+                [sys.executable, '-c', _RUNNER, _AUTOCROSS_DIR, 'generate',
+                 directory, '--cost_files'],
+                capture_output=True, text=True, check=False)
+
+            self.assertEqual(2, result.returncode)
+            self.assertIn('--surrogate', result.stderr)
+            self.assertEqual([], os.listdir(directory))
+
+    def test_multiplier_sweep_rejects_range(self):
+        """Test case for rejecting a sweep range with the multiplier sweep
+
+        :return: None
+        """
+        result = subprocess.run(
+            [sys.executable, '-c', _RUNNER, _AUTOCROSS_DIR, 'schedule',
+             'sweep', '--sweep_method', 'multiplier', '--sweep_min', '10'],
+            capture_output=True, text=True, check=False)
+
+        self.assertEqual(2, result.returncode)
+        self.assertIn('--sweep_method multiplier', result.stderr)
+
+    def test_serve_rejects_instrumentation(self):
+        """Test case for rejecting a traced server
+
+        :return: None
+        """
+        for flag in ('--profile', '--trace_memory'):
+            result = subprocess.run(
+                [sys.executable, '-c', _RUNNER, _AUTOCROSS_DIR, flag,
+                 'serve'], capture_output=True, text=True, check=False)
+
+            self.assertEqual(2, result.returncode)
+            self.assertIn('serve cannot run with', result.stderr)
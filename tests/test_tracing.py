@@ -0,0 +1,93 @@
+"""Test cases for tracing module
+
+"""
+# Standard library imports
+import contextlib
+import io
+import json
+import os
+import tempfile
+import unittest
+
+# Local application imports
+from autocross import cmd_dispatch
+from autocross import tracing
+
+
+class TestTracing(unittest.TestCase):
+    """Test cases for recording and exporting spans
+
+    """
+    def test_span_inactive(self):
+        """Test case for spans outside of a tracer
+
+        :return: None
+        """
+        with tracing.span('outside'):
+            self.assertFalse(tracing.is_active())
+
+    def test_nested_spans(self):
+        """Test case for recording nested spans
+
+        :return: None
+        """
+        with tracing.Tracer() as tracer:
+            with tracing.span('outer'):
+                with tracing.span('inner', 'solve', size=3):
+                    pass
+
+        inner, outer = tracer.events
+        self.assertEqual(('inner', 'solve', {'size': 3}),
+                         (inner['name'], inner['cat'], inner['args']))
+        self.assertEqual('outer', outer['name'])
+        self.assertLessEqual(outer['ts'], inner['ts'])
+        self.assertGreaterEqual(outer['ts'] + outer['dur'],
+                                inner['ts'] + inner['dur'])
+        self.assertFalse(tracing.is_active())
+
+    def test_trace_memory(self):
+        """Test case for recording memory with spans
+
+        :return: None
+        """
+        with contextlib.redirect_stderr(io.StringIO()) as stderr:
+            with tracing.Tracer(trace_memory=True) as tracer:
+                with tracing.span('allocate'):
+                    data = [0] * 100000
+
+        self.assertEqual(100000, len(data))
+        counter, allocate = tracer.events
+        self.assertEqual('C', counter['ph'])
+        self.assertGreater(allocate['args']['peak_memory_kib'], 700)
+        self.assertIn('Largest allocation sites', stderr.getvalue())
+
+    def test_dispatch_trace_file(self):
+        """Test case for tracing a dispatched command to file
+
+        :return: None
+        """
+        dispatcher = cmd_dispatch.CmdDispatcher()
+
+        def handler(_):
+            with tracing.span('stage'):
+                return 3
+
+        dispatcher.register_command('test_cmd', handler)
+
+        with tempfile.TemporaryDirectory() as directory:
+            trace_file = os.path.join(directory, 'trace.json')
+
+            with contextlib.redirect_stderr(io.StringIO()):
+                exit_code = dispatcher.dispatch('test_cmd', None,
+                                                trace_file=trace_file,
+                                                profile=True)
+
+            with open(trace_file) as file:
+                trace = json.load(file)
+
+            self.assertTrue(os.path.isfile(os.path.join(directory,
+                                                        'trace.prof')))
+
+        self.assertEqual(3, exit_code)
+        self.assertEqual(['test_cmd', 'stage'],
+                         [event['name'] for event in trace['traceEvents']])